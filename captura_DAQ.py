@@ -9,7 +9,7 @@ PARTE B – Captura de señal con DAQ + Análisis estadístico
 
 Este script:
   1. Captura una señal del generador de señales biológicas usando la DAQ
-  2. La guarda en formato .txt para poder usarla después
+  2. La guarda en disco (binario WFDB .dat/.hea o .txt) para usarla después
   3. Calcula los mismos estadísticos de la Parte A
   4. Genera gráficas e histogramas
   5. Compara con los resultados de la Parte A (señal de PhysioNet)
@@ -24,13 +24,17 @@ Modified for lab practice
 =============================================================================
 """
 
-import nidaqmx
-from nidaqmx.constants import AcquisitionType
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy import stats
 from datetime import datetime
 
+from senales.adquisicion import (CapturaContinua, EscritorTexto,
+                                 FuenteNIDAQ, FuenteSimulada, separar_canales)
+from senales.comparacion import comparar_con_referencias, guardar_reporte
+from senales.formato import EscritorWFDB, guardar_wfdb
+from senales.graficas import graficar_senal, guardar_figura
+from senales.latidos import monitor_fc
+from senales.tablero import TableroEnVivo
+
 # =============================================================================
 # PASO 1 – CONFIGURACIÓN DE LA CAPTURA
 # =============================================================================
@@ -48,197 +52,364 @@ DISPOSITIVO = 'Dev4/ai0'  # ← CAMBIA ESTO según tu DAQ
                           # 2. Ve a "Devices and Interfaces"
                           # 3. Busca tu DAQ y anota el nombre (ej: Dev1, cDAQ1, etc)
                           # 4. Los canales son ai0, ai1, ai2... para entradas analógicas
+                          # Varios canales a la vez (ECG y presión, como 0743):
+                          #   'Dev4/ai0:1'  o  ['Dev4/ai0', 'Dev4/ai1']
+                          # o de varias tarjetas: ['Dev3/ai0', 'Dev4/ai0']
+                          # (solo en MODO 'continua'; ver FuenteNIDAQ)
+                          # Se leen juntos en cada bloque (sincronizados) y se
+                          # guardan intercalados en un solo archivo.
+NOMBRES = None            # nombre de cada canal en el archivo, p. ej. ['ECG', 'NIBP']
 
 # Rango de voltaje esperado (ajustar según tu señal)
 V_MIN = -5             # Voltaje mínimo [V]
 V_MAX =  5             # Voltaje máximo [V]
 
-total_muestras = int(FS * DURACION)
-print("="*60)
-print("  CAPTURA DE SEÑAL FISIOLÓGICA CON DAQ")
-print("="*60)
-print(f"  Dispositivo      : {DISPOSITIVO}")
-print(f"  Frecuencia       : {FS} Hz")
-print(f"  Duración         : {DURACION} s")
-print(f"  Total muestras   : {total_muestras}")
-print(f"  Rango            : {V_MIN} a {V_MAX} V")
-print("\nIniciando captura...")
-
+# Modo de captura:
+#   'finita'   → una sola lectura de DURACION segundos (como siempre)
+#   'continua' → lee bloques de MUESTRAS_BLOQUE sin parar y los va guardando
+#                en disco; termina a los DURACION segundos (None = hasta Ctrl+C)
+MODO            = 'finita'
+MUESTRAS_BLOQUE = 100        # 100 muestras = 0.1 s por bloque a 1000 Hz
+
+# Sin DAQ conectada: SIMULAR = True reproduce un archivo como si viniera de
+# la tarjeta (una captura .txt anterior o un registro WFDB como "0743")
+SIMULAR          = False
+ARCHIVO_SIMULADO = 'senal_capturada_20260219_112925.txt'
+VELOCIDAD        = 1.0       # 1 = tiempo real, 10 = 10 veces más rápido, 0 = sin esperar
+
+# Formato del archivo de salida:
+#   'wfdb' → senal_capturada_<fecha>.dat + .hea (binario, 16 bits, como 0743)
+#            ~10 veces más pequeño y se abre con abrir_registro() (memmap)
+#   'txt'  → texto con columnas tiempo | amplitud (formato anterior)
+FORMATO = 'wfdb'
+
+# Solo en modo continuo/simulado: detectar ondas R mientras se captura y
+# mostrar la frecuencia cardiaca de cada latido (senales.latidos)
+FC_EN_VIVO = False
+
+# Solo en modo continuo/simulado: tablero que se actualiza con cada bloque
+# (señal de los últimos segundos, histograma y estadísticos de toda la
+# captura) para ver en segundos si el generador está bien conectado.
+# Cierra la ventana o Ctrl+C para terminar antes (senales.tablero)
+EN_VIVO = False
+
+# Gráficas: False → solo se guardan los .png, sin abrir ventanas (corridas
+# largas o por lotes; plt.show() detiene el script hasta cerrar cada una)
+MOSTRAR_GRAFICAS = True
+
+# PASO 7: registros de la Parte A contra los que se compara la captura
+# (estadísticos, KS y Wasserstein de cada canal; ver senales.comparacion).
+# [] → no comparar. Para comparar muchas capturas a la vez:
+#   python -m senales comparacion "senal_capturada_*" -r 0743
+REFERENCIAS_PARTE_A = ['0743']
+SEGUNDOS_PARTE_A    = 10     # ventana de la referencia, como en la Parte A (None = completa)
 
 # =============================================================================
-# PASO 2 – CAPTURA CON LA DAQ
+# Lo que sigue corre solo al ejecutar el script (F5 en Spyder o
+# 'python captura_DAQ.py'); 'import captura_DAQ' desde otro código no lee
+# datos ni grafica ni abre la DAQ: solo define la configuración.
 # =============================================================================
-try:
-    with nidaqmx.Task() as task:
-        # Configurar canal con rango de voltaje
-        task.ai_channels.add_ai_voltage_chan(
-            DISPOSITIVO,
-            min_val=V_MIN,
-            max_val=V_MAX
+if __name__ == '__main__':
+
+    # Nombre de archivo con timestamp para no sobrescribir capturas anteriores
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    archivo_salida = f"senal_capturada_{timestamp}" + ('.txt' if FORMATO == 'txt' else '')
+
+    CANALES = separar_canales(DISPOSITIVO)
+    canales_txt = ', '.join(CANALES)        # para los títulos y la cabecera
+    total_muestras = int(FS * DURACION) if DURACION else 0
+    print("="*60)
+    print("  CAPTURA DE SEÑAL FISIOLÓGICA CON DAQ")
+    print("="*60)
+    print(f"  Canales          : {canales_txt}")
+    print(f"  Frecuencia       : {FS} Hz")
+    print(f"  Duración         : {DURACION} s")
+    print(f"  Total muestras   : {total_muestras}")
+    print(f"  Modo             : {MODO}{' (simulado)' if SIMULAR else ''}")
+    print(f"  Rango            : {V_MIN} a {V_MAX} V")
+    print("\nIniciando captura...")
+
+
+    # ==========================================================================
+    # PASO 2 – CAPTURA CON LA DAQ
+    # ==========================================================================
+    # En modo continuo (o simulado) la señal se lee por bloques: cada bloque se
+    # guarda en disco desde un hilo en segundo plano mientras la captura sigue.
+    # Al final, 'datos' son las últimas muestras que quedan en el buffer
+    # circular (toda la captura si cabe en él), una fila por canal.
+    if MODO == 'continua' or SIMULAR:
+        if SIMULAR:
+            if ARCHIVO_SIMULADO.endswith('.txt'):   # si no, es un registro WFDB
+                fuente = FuenteSimulada.desde_txt(ARCHIVO_SIMULADO, velocidad=VELOCIDAD)
+            else:
+                # tantos canales del registro como canales configurados
+                fuente = FuenteSimulada.desde_wfdb(ARCHIVO_SIMULADO,
+                                                   canales=range(len(CANALES)),
+                                                   velocidad=VELOCIDAD)
+            FS = fuente.fs
+        else:
+            fuente = FuenteNIDAQ(CANALES, FS, V_MIN, V_MAX)
+
+        if FORMATO == 'txt':
+            escritor = EscritorTexto(archivo_salida, FS, fuente.nombre, DURACION,
+                                     n_canales=fuente.n_canales,
+                                     marca_tiempo=timestamp)
+        else:
+            escritor = EscritorWFDB(archivo_salida, FS, v_min=V_MIN, v_max=V_MAX,
+                                    n_canales=fuente.n_canales, nombres=NOMBRES,
+                                    dispositivo=fuente.nombre,
+                                    marca_tiempo=timestamp)
+        avisos = []                  # funciones que reciben cada bloque
+        if FC_EN_VIVO:
+            avisos.append(monitor_fc(FS))
+        if EN_VIVO:
+            tablero = TableroEnVivo(FS, fuente.n_canales, NOMBRES or CANALES,
+                                    rango=(V_MIN, V_MAX))
+            avisos.append(tablero)
+        captura = CapturaContinua(fuente, escritor, MUESTRAS_BLOQUE,
+                                  n_bloques=max(1, int(60 * FS) // MUESTRAS_BLOQUE),
+                                  al_bloque=avisos)
+        print("  (Ctrl+C para terminar la captura)")
+        if EN_VIVO:
+            tablero.ejecutar(captura, DURACION)   # la captura corre en otro hilo
+            tablero.guardar(f"grafica_en_vivo_{timestamp}.png")
+        else:
+            captura.ejecutar(DURACION)
+        datos = captura.ultimos()
+        DURACION = datos.shape[1] / FS
+        print(f"✓ Captura completada: {captura.n_leidas} muestras")
+
+    else:
+        import nidaqmx
+        from nidaqmx.constants import AcquisitionType
+
+        try:
+            with nidaqmx.Task() as task:
+                # Configurar canal(es) con rango de voltaje
+                task.ai_channels.add_ai_voltage_chan(
+                    ','.join(CANALES),
+                    min_val=V_MIN,
+                    max_val=V_MAX
+                )
+
+                # Configurar reloj de muestreo
+                task.timing.cfg_samp_clk_timing(
+                    FS,
+                    sample_mode=AcquisitionType.FINITE,
+                    samps_per_chan=total_muestras
+                )
+
+                # Capturar todas las muestras (con varios canales, una
+                # lista por canal)
+                datos = task.read(number_of_samples_per_channel=total_muestras)
+
+            print("✓ Captura completada exitosamente")
+
+        except Exception as e:
+            print(f"\n✗ ERROR en la captura: {e}")
+            print("\nPosibles soluciones:")
+            print("  1. Verifica que la DAQ esté conectada")
+            print("  2. Revisa el nombre del dispositivo en NI MAX")
+            print("  3. Comprueba que el canal existe (ai0, ai1, etc.)")
+            print("  4. Asegúrate de tener los drivers instalados")
+            raise
+
+
+    # ==========================================================================
+    # PASO 3 – GUARDAR LA SEÑAL EN DISCO
+    # ==========================================================================
+    # (en modo continuo el hilo escritor ya la guardó bloque por bloque)
+    datos = np.atleast_2d(np.asarray(datos, dtype=np.float64))
+    t = np.arange(datos.shape[1]) / FS
+
+    if MODO == 'finita' and not SIMULAR and FORMATO != 'txt':
+        # Binario WFDB: el tiempo no se guarda (t = n / Fs) y cada muestra ocupa
+        # 2 bytes; Fs, dispositivo, rango y fecha quedan en la cabecera .hea
+        guardar_wfdb(archivo_salida, datos, FS, v_min=V_MIN, v_max=V_MAX,
+                     nombres=NOMBRES, dispositivo=canales_txt,
+                     marca_tiempo=timestamp)
+
+    elif MODO == 'finita' and not SIMULAR:
+        # Guardar en columnas: tiempo [s] | amplitud [V] (una por canal)
+        datos_guardar = np.column_stack((t, datos.T))
+        columnas = ['Amplitud[V]'] if len(datos) == 1 else \
+            [f'Amplitud{i}[V]' for i in range(len(datos))]
+
+        np.savetxt(
+            archivo_salida,
+            datos_guardar,
+            fmt='%.6f',           # 6 decimales de precisión
+            delimiter='\t',       # separado por tabulación
+            header=f'Captura DAQ - {timestamp}\nFs={FS} Hz, Duracion={DURACION} s, Dispositivo={canales_txt}\nTiempo[s]\t' + '\t'.join(columnas),
+            comments='# '
         )
-        
-        # Configurar reloj de muestreo
-        task.timing.cfg_samp_clk_timing(
-            FS,
-            sample_mode=AcquisitionType.FINITE,
-            samps_per_chan=total_muestras
-        )
-        
-        # Capturar todas las muestras
-        senal = task.read(number_of_samples_per_channel=total_muestras)
-    
-    print("✓ Captura completada exitosamente")
-    
-except Exception as e:
-    print(f"\n✗ ERROR en la captura: {e}")
-    print("\nPosibles soluciones:")
-    print("  1. Verifica que la DAQ esté conectada")
-    print("  2. Revisa el nombre del dispositivo en NI MAX")
-    print("  3. Comprueba que el canal existe (ai0, ai1, etc.)")
-    print("  4. Asegúrate de tener los drivers instalados")
-    raise
-
-
-# =============================================================================
-# PASO 3 – GUARDAR LA SEÑAL EN ARCHIVO .TXT
-# =============================================================================
-# Crear nombre de archivo con timestamp para no sobrescribir capturas anteriores
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-archivo_txt = f"senal_capturada_{timestamp}.txt"
-
-# Guardar con formato de 2 columnas: tiempo [s] | amplitud [V]
-t = np.arange(len(senal)) / FS
-datos_guardar = np.column_stack((t, senal))
-
-np.savetxt(
-    archivo_txt,
-    datos_guardar,
-    fmt='%.6f',           # 6 decimales de precisión
-    delimiter='\t',       # separado por tabulación
-    header=f'Captura DAQ - {timestamp}\nFs={FS} Hz, Duracion={DURACION} s, Dispositivo={DISPOSITIVO}\nTiempo[s]\tAmplitud[V]',
-    comments='# '
-)
-
-print(f"✓ Señal guardada en: {archivo_txt}")
-
-
-# =============================================================================
-# PASO 4 – CONVERTIR A NUMPY ARRAY Y VERIFICAR
-# =============================================================================
-senal = np.array(senal)  # asegurar que sea numpy array
 
-print(f"\n  Muestras capturadas : {len(senal)}")
-print(f"  Valor mínimo        : {senal.min():.4f} V")
-print(f"  Valor máximo        : {senal.max():.4f} V")
-
-
-# =============================================================================
-# PASO 5 – ESTADÍSTICOS CON FUNCIONES PREDEFINIDAS
-# =============================================================================
-# Usamos NumPy/SciPy directamente (ya hiciste "desde cero" en la Parte A)
-
-mu  = np.mean(senal)
-s   = np.std(senal,  ddof=1)
-v   = np.var(senal,  ddof=1)
-cv  = (s / abs(mu)) * 100 if mu != 0 else np.inf
-g1  = stats.skew(senal)
-g2  = stats.kurtosis(senal)
-
-print("\n" + "="*60)
-print(f"  ESTADÍSTICOS – SEÑAL CAPTURADA ({DURACION} s)")
-print("="*60)
-print(f"  Media            : {mu:>12.6f} V")
-print(f"  Desv. estándar   : {s:>12.6f} V")
-print(f"  Varianza         : {v:>12.6f} V²")
-print(f"  Coef. variación  : {cv:>12.4f} %")
-print(f"  Asimetría        : {g1:>12.6f}")
-print(f"  Curtosis         : {g2:>12.6f}")
-
-
-# =============================================================================
-# PASO 6 – GRÁFICAS
-# =============================================================================
-
-# ── Gráfica 1: Señal en el tiempo ───────────────────────────────────────────
-fig1, ax1 = plt.subplots(figsize=(13, 5))
-fig1.suptitle(f"Señal capturada con DAQ  |  {DISPOSITIVO}  |  Fs={FS} Hz",
-              fontsize=13, fontweight='bold')
-
-ax1.plot(t, senal, color='#C62828', lw=0.8, label='Señal capturada')
-ax1.axhline(mu,      color='black',   ls='--', lw=1.4,
-            label=f'Media = {mu:.5f} V')
-ax1.axhline(mu + s,  color='#2E7D32', ls=':',  lw=1.2,
-            label=f'μ+σ = {mu+s:.4f}')
-ax1.axhline(mu - s,  color='#2E7D32', ls=':',  lw=1.2,
-            label=f'μ-σ = {mu-s:.4f}')
-ax1.set_xlabel("Tiempo (s)", fontsize=11)
-ax1.set_ylabel("Amplitud (V)", fontsize=11)
-ax1.set_xlim(0, DURACION)
-ax1.legend(fontsize=9, loc='upper right')
-ax1.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig(f"grafica_senal_capturada_{timestamp}.png", dpi=150, bbox_inches='tight')
-plt.show()
-
-# ── Gráfica 2: Histograma + curva normal ────────────────────────────────────
-fig2, ax2 = plt.subplots(figsize=(9, 5))
-fig2.suptitle("Histograma - Señal capturada", fontsize=13, fontweight='bold')
-
-conteos, bordes = np.histogram(senal, bins=60, density=True)
-centros = (bordes[:-1] + bordes[1:]) / 2
-ancho   = bordes[1] - bordes[0]
-
-ax2.bar(centros, conteos, width=ancho*0.9, color='#EF5350',
-        alpha=0.85, label='Datos capturados')
-
-# Curva normal teórica
-x_ref = np.linspace(senal.min(), senal.max(), 500)
-ax2.plot(x_ref, stats.norm.pdf(x_ref, mu, s), 'k-', lw=2,
-         label='Normal teórica')
-ax2.axvline(mu, color='navy', ls='--', lw=1.5,
-            label=f'Media = {mu:.3f}')
-
-ax2.set_xlabel("Amplitud (V)", fontsize=11)
-ax2.set_ylabel("Densidad de probabilidad", fontsize=11)
-ax2.set_title(f"Asimetría={g1:.3f}  |  Curtosis={g2:.3f}", fontsize=10)
-ax2.legend(fontsize=9)
-ax2.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig(f"grafica_histograma_capturado_{timestamp}.png", dpi=150, bbox_inches='tight')
-plt.show()
-
-# ── Gráfica 3: Boxplot ───────────────────────────────────────────────────────
-fig3, ax3 = plt.subplots(figsize=(5, 6))
-fig3.suptitle("Box-plot – Señal capturada", fontsize=13, fontweight='bold')
-
-ax3.boxplot(senal, patch_artist=True,
-            boxprops=dict(facecolor='#FFCDD2'),
-            medianprops=dict(color='red', lw=2),
-            whiskerprops=dict(lw=1.2),
-            flierprops=dict(marker='.', markersize=3, alpha=0.4))
-ax3.set_ylabel("Amplitud (V)", fontsize=11)
-ax3.grid(True, alpha=0.3, axis='y')
-
-plt.tight_layout()
-plt.savefig(f"grafica_boxplot_capturado_{timestamp}.png", dpi=150, bbox_inches='tight')
-plt.show()
-
-print("\n✓ Todas las gráficas generadas y guardadas")
-
-
-# =============================================================================
-# PASO 7 – COMPARACIÓN CON PARTE A (OPCIONAL)
-# =============================================================================
-print("\n" + "="*60)
-print("  COMPARACIÓN CON PARTE A")
-print("="*60)
-print("\nAhora compara estos estadísticos con los de la señal 0743")
-print("de PhysioNet que usaste en la Parte A.")
-print("\nPreguntas para el análisis:")
-print("  • ¿Los valores son similares o muy diferentes?")
-print("  • ¿Por qué crees que hay diferencias?")
-print("    (señal sintética vs real, tipo de señal, duración, etc.)")
-print("  • ¿La asimetría y curtosis indican distribuciones parecidas?")
-print("="*60)
\ No newline at end of file
+    print(f"✓ Señal guardada en: {archivo_salida}" + ('' if FORMATO == 'txt' else ' (.dat/.hea)'))
+
+
+    # ==========================================================================
+    # PASO 4 – CONVERTIR A NUMPY ARRAY Y VERIFICAR
+    # ==========================================================================
+    # datos: una fila por canal (n_canales × n_muestras), aunque haya uno solo
+    datos = np.atleast_2d(np.asarray(datos, dtype=np.float64))
+    senal = datos[0]                 # primer canal (el de siempre)
+    n_canales = datos.shape[0]
+    nombres = NOMBRES or CANALES
+
+    print(f"\n  Muestras capturadas : {datos.shape[1]} × {n_canales} canal(es)")
+    for k in range(n_canales):
+        print(f"  {nombres[k]:<12}: mín={datos[k].min():.4f} V  "
+              f"máx={datos[k].max():.4f} V")
+
+
+    # ==========================================================================
+    # PASO 5 – ESTADÍSTICOS CON FUNCIONES PREDEFINIDAS
+    # ==========================================================================
+    # Usamos NumPy/SciPy directamente (ya hiciste "desde cero" en la Parte A).
+    # axis=1 → cada función recorre las muestras de todos los canales a la
+    # vez y devuelve un valor por canal (sin bucle for por canal)
+    from scipy import stats          # SciPy solo se carga al correr el script
+
+    mu  = np.mean(datos, axis=1)
+    s   = np.std(datos, axis=1, ddof=1)
+    v   = np.var(datos, axis=1, ddof=1)
+    with np.errstate(divide='ignore'):
+        cv  = np.where(mu != 0, s / np.abs(mu) * 100, np.inf)
+    g1  = stats.skew(datos, axis=1)
+    g2  = stats.kurtosis(datos, axis=1)
+
+    print("\n" + "="*60)
+    print(f"  ESTADÍSTICOS – SEÑAL CAPTURADA ({DURACION} s)")
+    print("="*60)
+    for k in range(n_canales):
+        if n_canales > 1:
+            print(f"  ── {nombres[k]}")
+        print(f"  Media            : {mu[k]:>12.6f} V")
+        print(f"  Desv. estándar   : {s[k]:>12.6f} V")
+        print(f"  Varianza         : {v[k]:>12.6f} V²")
+        print(f"  Coef. variación  : {cv[k]:>12.4f} %")
+        print(f"  Asimetría        : {g1[k]:>12.6f}")
+        print(f"  Curtosis         : {g2[k]:>12.6f}")
+
+    # En modo continuo los momentos de TODA la captura se fueron actualizando
+    # bloque por bloque en el hilo escritor (sin guardar la señal en memoria)
+    if MODO == 'continua' or SIMULAR:
+        print(f"\n  Captura completa ({captura.n_guardadas} muestras, por bloques):")
+        for k, e in enumerate(captura.estadisticos()):
+            print(f"    {nombres[k]:<12} media={e['media']:.6f} V  "
+                  f"s={e['desv_estandar']:.6f} V  asimetría={e['asimetria']:.6f}  "
+                  f"curtosis={e['curtosis']:.6f}")
+
+
+    # ==========================================================================
+    # PASO 6 – GRÁFICAS
+    # ==========================================================================
+    # Una fila (tiempo) o una columna (histograma, boxplot) por canal
+    import matplotlib.pyplot as plt   # solo se carga para graficar
+
+
+    # ── Gráfica 1: Señal en el tiempo ─────────────────────────────────────────
+    fig1, ejes1 = plt.subplots(n_canales, 1, figsize=(13, 2 + 3 * n_canales),
+                               sharex=True, squeeze=False)
+    fig1.suptitle(f"Señal capturada con DAQ  |  {canales_txt}  |  Fs={FS} Hz",
+                  fontsize=13, fontweight='bold')
+
+    for k, ax1 in enumerate(ejes1[:, 0]):
+        graficar_senal(ax1, datos[k], FS, color='#C62828', lw=0.8,   # mín/máx por píxel
+                       label=nombres[k])
+        ax1.axhline(mu[k],         color='black',   ls='--', lw=1.4,
+                    label=f'Media = {mu[k]:.5f} V')
+        ax1.axhline(mu[k] + s[k],  color='#2E7D32', ls=':',  lw=1.2,
+                    label=f'μ+σ = {mu[k]+s[k]:.4f}')
+        ax1.axhline(mu[k] - s[k],  color='#2E7D32', ls=':',  lw=1.2,
+                    label=f'μ-σ = {mu[k]-s[k]:.4f}')
+        ax1.set_ylabel("Amplitud (V)", fontsize=11)
+        ax1.legend(fontsize=9, loc='upper right')
+        ax1.grid(True, alpha=0.3)
+    ax1.set_xlabel("Tiempo (s)", fontsize=11)
+    ax1.set_xlim(0, DURACION)
+
+    plt.tight_layout()
+    guardar_figura(fig1, f"grafica_senal_capturada_{timestamp}.png", mostrar=MOSTRAR_GRAFICAS)
+
+    # ── Gráfica 2: Histograma + curva normal ──────────────────────────────────
+    fig2, ejes2 = plt.subplots(1, n_canales, figsize=(9 * n_canales, 5),
+                               squeeze=False)
+    fig2.suptitle("Histograma - Señal capturada", fontsize=13, fontweight='bold')
+
+    for k, ax2 in enumerate(ejes2[0]):
+        conteos, bordes = np.histogram(datos[k], bins=60, density=True)
+        centros = (bordes[:-1] + bordes[1:]) / 2
+        ancho   = bordes[1] - bordes[0]
+
+        ax2.bar(centros, conteos, width=ancho*0.9, color='#EF5350',
+                alpha=0.85, label='Datos capturados')
+
+        # Curva normal teórica
+        x_ref = np.linspace(datos[k].min(), datos[k].max(), 500)
+        ax2.plot(x_ref, stats.norm.pdf(x_ref, mu[k], s[k]), 'k-', lw=2,
+                 label='Normal teórica')
+        ax2.axvline(mu[k], color='navy', ls='--', lw=1.5,
+                    label=f'Media = {mu[k]:.3f}')
+
+        ax2.set_xlabel("Amplitud (V)", fontsize=11)
+        ax2.set_ylabel("Densidad de probabilidad", fontsize=11)
+        ax2.set_title(f"{nombres[k] + '  |  ' if n_canales > 1 else ''}"
+                      f"Asimetría={g1[k]:.3f}  |  Curtosis={g2[k]:.3f}", fontsize=10)
+        ax2.legend(fontsize=9)
+        ax2.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    guardar_figura(fig2, f"grafica_histograma_capturado_{timestamp}.png", mostrar=MOSTRAR_GRAFICAS)
+
+    # ── Gráfica 3: Boxplot ────────────────────────────────────────────────────
+    fig3, ejes3 = plt.subplots(1, n_canales, figsize=(5 * n_canales, 6),
+                               squeeze=False)
+    fig3.suptitle("Box-plot – Señal capturada", fontsize=13, fontweight='bold')
+
+    for k, ax3 in enumerate(ejes3[0]):
+        ax3.boxplot(datos[k], patch_artist=True,
+                    boxprops=dict(facecolor='#FFCDD2'),
+                    medianprops=dict(color='red', lw=2),
+                    whiskerprops=dict(lw=1.2),
+                    flierprops=dict(marker='.', markersize=3, alpha=0.4))
+        if n_canales > 1:
+            ax3.set_title(nombres[k], fontsize=11)
+        ax3.set_ylabel("Amplitud (V)", fontsize=11)
+        ax3.grid(True, alpha=0.3, axis='y')
+
+    plt.tight_layout()
+    guardar_figura(fig3, f"grafica_boxplot_capturado_{timestamp}.png", mostrar=MOSTRAR_GRAFICAS)
+
+    print("\n✓ Todas las gráficas generadas y guardadas")
+
+
+    # ==========================================================================
+    # PASO 7 – COMPARACIÓN CON PARTE A (OPCIONAL)
+    # ==========================================================================
+    # La captura (V) y 0743 (mV, mmHg) tienen unidades distintas: KS y
+    # Wasserstein comparan la forma de las distribuciones en escala z,
+    # (x - media) / s, igual que la asimetría y la curtosis
+    print("\n" + "="*60)
+    print("  COMPARACIÓN CON PARTE A")
+    print("="*60)
+    if REFERENCIAS_PARTE_A:
+        try:
+            filas = comparar_con_referencias(archivo_salida, REFERENCIAS_PARTE_A,
+                                             segundos_referencia=SEGUNDOS_PARTE_A)
+        except OSError as e:            # 0743 no está en la carpeta
+            print(f"  No se pudo comparar: {e}")
+        else:
+            archivo_reporte = f"comparacion_parteA_{timestamp}.tsv"
+            guardar_reporte(filas, archivo_reporte)
+            print(f"✓ Tabla completa en: {archivo_reporte}")
+            print("  ks = máx. diferencia entre las distribuciones acumuladas (0 a 1)")
+            print("  w  = distancia de Wasserstein, en desviaciones estándar")
+    print("\nCompara estos estadísticos con los de la señal 0743")
+    print("de PhysioNet que usaste en la Parte A.")
+    print("\nPreguntas para el análisis:")
+    print("  • ¿Los valores son similares o muy diferentes?")
+    print("  • ¿Por qué crees que hay diferencias?")
+    print("    (señal sintética vs real, tipo de señal, duración, etc.)")
+    print("  • ¿La asimetría y curtosis indican distribuciones parecidas?")
+    print("="*60)
\ No newline at end of file
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+PRÁCTICA DE LABORATORIO – ANÁLISIS ESTADÍSTICO DE SEÑALES
+Universidad Militar Nueva Granada | Procesamiento Digital de Señales
+
+Paquete `senales`: funciones reutilizables que usan los scripts de la guía
+(sin_funciones.py, con_funciones.py, captura_DAQ.py).
+
+Módulos:
+  lectura     → lectura perezosa (memory-map) de registros WFDB de PhysioNet
+  momentos    → media, varianza, asimetría y curtosis en una sola pasada
+  histograma  → histograma por bloques (mismas reglas de histograma_manual)
+  ventanas    → los mismos estadísticos por ventanas deslizantes en O(N)
+  lote        → estadísticos de muchos registros en paralelo
+                (python -m senales.lote "datos/*.hea")
+  adquisicion → captura continua (DAQ o simulada) con buffer circular
+  formato     → capturas en binario WFDB (.dat/.hea) en vez de .txt
+  texto       → lectura rápida de senal_capturada_*.txt y conversión a WFDB
+  ruido       → ruido gaussiano, impulso y artefacto + SNR, por lotes
+  barrido     → barrido Monte Carlo de SNR en paralelo y reproducible
+                (python -m senales.barrido 0743 --snr 0 10 20 --paso 60)
+  espectro    → PSD de Welch con planes guardados y SNR por bandas
+  filtros     → pasa-altas, Hampel/mediana y pasa-bajas, por bloques o de una vez
+  latidos     → detector de ondas R (Pan-Tompkins) por bloques: RR y FC
+  vfc         → SDNN, RMSSD, pNN50 y LF/HF por ventanas y para muchos registros
+                (python -m senales.vfc "datos/*.hea" --ventana 300)
+  presion     → sistólica, diastólica y media latido a latido (NIBP)
+  graficas    → gráficas sin pantalla (Agg) con envolvente mín/máx por píxel
+                (python -m senales.graficas "datos/*.hea" -o graficas)
+  rendimiento → tiempo, memoria y exactitud: sin_funciones vs con_funciones
+                (python -m senales.rendimiento 0743 -o rendimiento.tsv)
+  tablero     → estadísticos, histograma y señal en vivo durante la captura
+  calidad     → calidad (SQI) por ventanas: saturación, tramos planos, curtosis
+                (python -m senales.calidad 0743 -o calidad.tsv)
+  cache       → caché de estadísticos y gráficas por contenido (LRU en disco)
+  comparacion → capturas de la DAQ (Parte B) contra registros de referencia:
+                estadísticos, KS y Wasserstein en una tabla
+                (python -m senales.comparacion "senal_capturada_*" -r 0743)
+
+Desde otro código, las funciones principales se importan del paquete:
+
+    from senales import abrir_registro, momentos_por_bloques
+
+y cada módulo se carga recién cuando se usa algo suyo (importar senales no
+carga SciPy, matplotlib ni nidaqmx; esos se importan dentro de las
+funciones que los necesitan). Desde la terminal:
+
+    python -m senales estadisticos 0743 --segundos 10
+    python -m senales -h
+=============================================================================
+"""
+
+import importlib
+
+# nombre público → módulo que lo define (se importa al primer uso)
+_PUBLICO = {
+    'abrir_registro'       : 'lectura',
+    'abrir_registros'      : 'lectura',
+    'buscar_registros'     : 'lectura',
+    'leer_cabecera'        : 'lectura',
+    'RegistroWFDB'         : 'lectura',
+    'Momentos'             : 'momentos',
+    'momentos_una_pasada'  : 'momentos',
+    'momentos_numpy'       : 'momentos',
+    'momentos_por_bloques' : 'momentos',
+    'MomentosCanales'      : 'momentos',
+    'Histograma'           : 'histograma',
+    'histograma_por_bloques': 'histograma',
+    'estadisticos_ventanas': 'ventanas',
+    'procesar_lote'        : 'lote',
+    'CapturaContinua'      : 'adquisicion',
+    'FuenteNIDAQ'          : 'adquisicion',
+    'FuenteSimulada'       : 'adquisicion',
+    'EscritorTexto'        : 'adquisicion',
+    'separar_canales'      : 'adquisicion',
+    'EscritorWFDB'         : 'formato',
+    'guardar_wfdb'         : 'formato',
+    'leer_captura_txt'     : 'texto',
+    'generar_ruido'        : 'ruido',
+    'contaminar'           : 'ruido',
+    'snr_db'               : 'ruido',
+    'ejecutar_barrido'     : 'barrido',
+    'welch'                : 'espectro',
+    'plan_welch'           : 'espectro',
+    'snr_espectral'        : 'espectro',
+    'snr_bandas'           : 'espectro',
+    'BancoFiltros'         : 'filtros',
+    'banco_para'           : 'filtros',
+    'filtrar_por_bloques'  : 'filtros',
+    'DetectorR'            : 'latidos',
+    'detectar_r'           : 'latidos',
+    'vfc_ventanas'         : 'vfc',
+    'latidos_presion'      : 'presion',
+    'graficar_senal'       : 'graficas',
+    'guardar_figura'       : 'graficas',
+    'TableroEnVivo'        : 'tablero',
+    'calidad_registro'     : 'calidad',
+    'segmentos_buenos'     : 'calidad',
+    'CacheResultados'      : 'cache',
+    'huella'               : 'cache',
+    'comparar_con_referencias': 'comparacion',
+}
+
+_MODULOS = {'lectura', 'momentos', 'histograma', 'ventanas', 'lote',
+            'adquisicion', 'formato', 'texto', 'ruido', 'barrido', 'espectro',
+            'filtros', 'latidos', 'vfc', 'presion', 'graficas', 'rendimiento',
+            'tablero', 'calidad', 'cache', 'comparacion'}
+
+__all__ = sorted(_PUBLICO)
+
+
+def __getattr__(nombre):
+    if nombre in _PUBLICO:
+        valor = getattr(importlib.import_module('.' + _PUBLICO[nombre], __name__),
+                        nombre)
+    elif nombre in _MODULOS:
+        valor = importlib.import_module('.' + nombre, __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    globals()[nombre] = valor           # la próxima vez no pasa por aquí
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PUBLICO) | _MODULOS)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+LÍNEA DE COMANDOS DEL PAQUETE
+
+    python -m senales estadisticos 0743 --segundos 10        (Parte A)
+    python -m senales estadisticos 0743 --graficas graficas  (+ .png)
+    python -m senales captura Dev4/ai0 --segundos 10          (Parte B)
+    python -m senales captura Dev4/ai0:1 --nombres ECG NIBP   (dos canales)
+    python -m senales captura --simular 0743 --segundos 10 --velocidad 0
+    python -m senales captura Dev4/ai0 --segundos 0 --en-vivo  (tablero)
+    python -m senales lote "datos/*.hea" -o resultados.tsv
+    python -m senales comparacion "senal_capturada_*" -r 0743 -o comparacion.tsv
+    python -m senales barrido | vfc | graficas | rendimiento | texto | calidad | cache | filtros ...
+
+Cada comando importa solo su módulo: 'estadisticos' lee y calcula con
+NumPy sin cargar SciPy ni matplotlib (salvo con --graficas), y 'captura'
+carga nidaqmx solo si no se simula.
+=============================================================================
+"""
+
+import argparse
+import importlib
+import os
+import sys
+from datetime import datetime
+
+
+# comando → (módulo con main(argv), descripción)
+DELEGADOS = {
+    'lote'       : ('lote', 'estadísticos de muchos registros en paralelo'),
+    'barrido'    : ('barrido', 'barrido Monte Carlo de SNR'),
+    'vfc'        : ('vfc', 'variabilidad de la frecuencia cardiaca'),
+    'graficas'   : ('graficas', 'gráficas .png de muchos registros'),
+    'rendimiento': ('rendimiento', 'desde cero vs NumPy/SciPy'),
+    'texto'      : ('texto', 'capturas .txt → WFDB'),
+    'calidad'    : ('calidad', 'ventanas malas: saturación, tramos planos'),
+    'cache'      : ('cache', 'caché de resultados: tamaño y vaciado'),
+    'comparacion': ('comparacion', 'capturas (Parte B) vs referencias (Parte A)'),
+    'filtros'    : ('filtros', 'mejora de SNR y muestras/s del banco de filtros'),
+}
+
+
+def estadisticos(args):
+    from .lectura import abrir_registro
+    from .momentos import momentos_por_bloques
+
+    for ruta in args.registros:
+        registro = abrir_registro(ruta)
+        fs = registro.fs
+        inicio = int(round(args.inicio * fs))
+        fin = None if args.segundos is None else inicio + int(round(args.segundos * fs))
+        n = (registro.n_muestras if fin is None else min(fin, registro.n_muestras)) - inicio
+        print(f"\n  {registro.nombre} — {n} muestras = {n / fs:g} s  (Fs={fs:g} Hz)")
+        for k, info in enumerate(registro.senales):
+            e = momentos_por_bloques(registro.canal(k), inicio, fin) \
+                .estadisticos(args.ddof_forma)
+            u = info['unidades']
+            print(f"    {info['descripcion']:<5} media={e['media']:.6f} {u}  "
+                  f"s={e['desv_estandar']:.6f}  CV={e['coef_variacion']:.4f} %  "
+                  f"asimetría={e['asimetria']:.6f}  curtosis={e['curtosis']:.6f}")
+        if args.graficas:
+            from .graficas import figura_registro
+            os.makedirs(args.graficas, exist_ok=True)
+            png = figura_registro(registro.ruta, registro.cabecera, args.graficas,
+                                  args.segundos, args.inicio)
+            print(f"    → {png}")
+    return 0
+
+
+def captura(args):
+    from .adquisicion import (CapturaContinua, EscritorTexto, FuenteNIDAQ,
+                              FuenteSimulada, separar_canales)
+    from .formato import EscritorWFDB
+
+    canales = separar_canales(args.canales)
+    if args.simular:
+        if args.simular.endswith('.txt'):
+            fuente = FuenteSimulada.desde_txt(args.simular, velocidad=args.velocidad)
+        else:
+            fuente = FuenteSimulada.desde_wfdb(args.simular,
+                                               canales=range(len(canales)),
+                                               velocidad=args.velocidad)
+    else:
+        fuente = FuenteNIDAQ(canales, args.fs, args.v_min, args.v_max)
+
+    marca = datetime.now().strftime("%Y%m%d_%H%M%S")
+    salida = args.salida or f"senal_capturada_{marca}"
+    if args.formato == 'txt':
+        escritor = EscritorTexto(salida if salida.endswith('.txt') else salida + '.txt',
+                                 fuente.fs, fuente.nombre, args.segundos,
+                                 n_canales=fuente.n_canales, marca_tiempo=marca)
+    else:
+        escritor = EscritorWFDB(salida, fuente.fs, fuente.n_canales,
+                                v_min=args.v_min, v_max=args.v_max,
+                                dispositivo=fuente.nombre, marca_tiempo=marca,
+                                nombres=args.nombres)
+    tablero = None
+    if args.en_vivo:
+        from .tablero import TableroEnVivo
+        tablero = TableroEnVivo(fuente.fs, fuente.n_canales,
+                                args.nombres or canales, (args.v_min, args.v_max),
+                                ddof_forma=args.ddof_forma)
+    c = CapturaContinua(fuente, escritor, args.muestras_bloque,
+                        n_bloques=max(1, int(60 * fuente.fs) // args.muestras_bloque),
+                        al_bloque=tablero)
+    print(f"Capturando de {fuente.nombre} a {fuente.fs:g} Hz (Ctrl+C para terminar)")
+    if tablero is None:
+        c.ejecutar(args.segundos)
+    else:
+        tablero.ejecutar(c, args.segundos)
+        tablero.guardar(os.path.splitext(escritor.ruta)[0] + '_en_vivo.png')
+    print(f"✓ {c.n_leidas} muestras × {fuente.n_canales} canal(es) → {escritor.ruta}")
+    nombres = args.nombres or canales
+    for k, e in enumerate(c.estadisticos(args.ddof_forma)):
+        print(f"  {nombres[k]:<10} media={e['media']:.6f} V  s={e['desv_estandar']:.6f} V  "
+              f"asimetría={e['asimetria']:.6f}  curtosis={e['curtosis']:.6f}")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in DELEGADOS:
+        modulo = importlib.import_module(f'.{DELEGADOS[argv[0]][0]}', __package__)
+        return modulo.main(argv[1:])
+
+    p = argparse.ArgumentParser(
+        prog='python -m senales',
+        description='Análisis estadístico de señales (guía de laboratorio).',
+        epilog='Otros comandos (cada uno con su propio -h): ' + ', '.join(
+            f'{c} ({d})' for c, (_, d) in DELEGADOS.items()))
+    sub = p.add_subparsers(dest='comando', metavar='comando')
+
+    e = sub.add_parser('estadisticos', help='estadísticos de la Parte A')
+    e.add_argument('registros', nargs='+', help='registros WFDB (p. ej. 0743)')
+    e.add_argument('--segundos', type=float, default=None,
+                   help='longitud de la ventana (por defecto, registro completo)')
+    e.add_argument('--inicio', type=float, default=0,
+                   help='inicio de la ventana en segundos')
+    e.add_argument('--ddof-forma', type=int, default=1, choices=(0, 1),
+                   help='1 = fórmulas de sin_funciones, 0 = convención de SciPy')
+    e.add_argument('--graficas', metavar='CARPETA', default=None,
+                   help='guardar también la gráfica de cada registro (.png)')
+    e.set_defaults(funcion=estadisticos)
+
+    c = sub.add_parser('captura', help='captura con la DAQ (o simulada)')
+    c.add_argument('canales', nargs='*', default=['Dev4/ai0'],
+                   help="canales físicos: Dev4/ai0, Dev4/ai0:1 o varios "
+                        "(Dev3/ai0 Dev4/ai0), sincronizados en un solo archivo")
+    c.add_argument('--nombres', nargs='+', default=None,
+                   help='nombre de cada canal (p. ej. ECG NIBP)')
+    c.add_argument('--fs', type=float, default=1000)
+    c.add_argument('--segundos', type=float, default=10,
+                   help='duración (0 = hasta Ctrl+C)')
+    c.add_argument('--v-min', type=float, default=-5)
+    c.add_argument('--v-max', type=float, default=5)
+    c.add_argument('--muestras-bloque', type=int, default=100)
+    c.add_argument('--formato', choices=('wfdb', 'txt'), default='wfdb')
+    c.add_argument('-o', '--salida', default=None,
+                   help='archivo de salida (por defecto, senal_capturada_<fecha>)')
+    c.add_argument('--simular', metavar='ARCHIVO', default=None,
+                   help='reproducir una captura .txt o un registro WFDB en vez de la DAQ')
+    c.add_argument('--velocidad', type=float, default=1.0,
+                   help='solo al simular: 1 = tiempo real, 0 = sin esperar')
+    c.add_argument('--ddof-forma', type=int, default=0, choices=(0, 1))
+    c.add_argument('--en-vivo', action='store_true',
+                   help='tablero con estadísticos, histograma y señal durante la captura')
+    c.set_defaults(funcion=captura)
+
+    args = p.parse_args(argv)
+    if args.comando is None:
+        p.print_help()
+        return 1
+    if args.comando == 'captura' and not args.segundos:
+        args.segundos = None
+    return args.funcion(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+ADQUISICIÓN CONTINUA – buffer circular + hilo que escribe en disco
+
+captura_DAQ.py usaba AcquisitionType.FINITE y un solo
+task.read(number_of_samples_per_channel=total_muestras) que devuelve una
+lista de Python: la captura queda limitada a DURACION y toda la señal en
+memoria.
+
+En modo continuo:
+  1. La fuente (DAQ o simulada) entrega bloques de tamaño fijo que se
+     escriben directamente en un buffer circular de NumPy reservado al
+     inicio (no se crean listas nuevas en cada lectura).
+  2. Un hilo en segundo plano toma cada bloque, lo guarda en disco y
+     actualiza los momentos (media, varianza, asimetría, curtosis) de toda
+     la captura, mientras la lectura sigue.
+  3. La captura termina al llegar a la duración pedida, al acabarse la
+     fuente simulada o con Ctrl+C.
+
+Fuentes disponibles (todas tienen fs, n_canales, nombre, leer_en()):
+  FuenteNIDAQ     → tarjeta NI-DAQ real, uno o varios canales y
+                    dispositivos sincronizados (importa nidaqmx solo al
+                    usarla)
+  FuenteSimulada  → reproduce un array, una captura .txt o un registro
+                    WFDB (0743) en tiempo real o acelerado; sirve para
+                    probar sin hardware.
+=============================================================================
+"""
+
+import queue
+import re
+import threading
+import time
+
+import numpy as np
+
+from .momentos import MomentosCanales
+
+
+# =============================================================================
+# FUENTES
+# =============================================================================
+
+class FuenteSimulada:
+    """
+    FUENTE SIMULADA – entrega las muestras de 'datos' como si fueran de la DAQ.
+
+    datos     : array (n_muestras,) o (n_canales, n_muestras)
+    velocidad : 1 = tiempo real, 10 = diez veces más rápido, 0 = sin esperar
+    repetir   : True → al llegar al final vuelve a empezar (captura infinita)
+    """
+
+    def __init__(self, datos, fs, velocidad=1.0, repetir=False,
+                 nombre='simulada'):
+        datos = np.asarray(datos, dtype=np.float64)
+        self.datos     = datos.reshape(1, -1) if datos.ndim == 1 else datos
+        self.fs        = fs
+        self.n_canales = self.datos.shape[0]
+        self.velocidad = velocidad
+        self.repetir   = repetir
+        self.nombre    = nombre
+        self._pos      = 0
+        self._entregadas = 0
+        self._t0       = None
+
+    def iniciar(self):
+        self._t0 = time.perf_counter()
+
+    def detener(self):
+        pass
+
+    def leer_en(self, destino):
+        """
+        Llena destino (n_canales × B) con las siguientes B muestras.
+        Devuelve cuántas muestras escribió (menos de B al final de los datos).
+        """
+        if self._t0 is None:
+            self.iniciar()
+        B = destino.shape[1]
+        n_total = self.datos.shape[1]
+        escritas = 0
+        while escritas < B:
+            if self._pos >= n_total:
+                if not self.repetir:
+                    break
+                self._pos = 0
+            k = min(B - escritas, n_total - self._pos)
+            destino[:, escritas:escritas + k] = self.datos[:, self._pos:self._pos + k]
+            self._pos += k
+            escritas += k
+
+        # Ritmo de tiempo real: el bloque "llega" cuando la DAQ lo habría
+        # terminado de muestrear
+        self._entregadas += escritas
+        if self.velocidad and escritas:
+            espera = (self._t0 + self._entregadas / (self.fs * self.velocidad)
+                      - time.perf_counter())
+            if espera > 0:
+                time.sleep(espera)
+        return escritas
+
+    @classmethod
+    def desde_txt(cls, ruta, **opciones):
+        """Reproduce una captura senal_capturada_*.txt (columnas tiempo | amplitud)."""
+        from .texto import leer_captura_txt
+        senal, meta = leer_captura_txt(ruta)
+        opciones.setdefault('nombre', f'simulada:{ruta}')
+        return cls(senal, meta['fs'] or 1000, **opciones)
+
+    @classmethod
+    def desde_wfdb(cls, ruta, canales=None, **opciones):
+        """Reproduce canales de un registro WFDB (por defecto, todos)."""
+        from .lectura import abrir_registro
+        registro = abrir_registro(ruta)
+        canales = range(registro.n_senales) if canales is None else canales
+        datos = np.vstack([registro.canal(c)[:] for c in canales])
+        opciones.setdefault('nombre', f'simulada:{registro.nombre}')
+        return cls(datos, registro.fs, **opciones)
+
+
+def separar_canales(canales):
+    """
+    Lista de canales físicos a partir de 'Dev1/ai0', 'Dev1/ai0:2',
+    'Dev1/ai0, Dev2/ai0' o una lista de esos textos (los rangos se expanden:
+    'Dev1/ai0:2' → Dev1/ai0, Dev1/ai1, Dev1/ai2).
+    """
+    partes = [canales] if isinstance(canales, str) else list(canales)
+    lista = []
+    for parte in partes:
+        for c in str(parte).split(','):
+            c = c.strip()
+            if not c:
+                continue
+            m = re.fullmatch(r'(.*?)(\d+):(\d+)', c)
+            if m:
+                base, a, b = m.group(1), int(m.group(2)), int(m.group(3))
+                paso = 1 if b >= a else -1
+                lista += [f'{base}{k}' for k in range(a, b + paso, paso)]
+            else:
+                lista.append(c)
+    if not lista:
+        raise ValueError("No se indicó ningún canal")
+    return lista
+
+
+class FuenteNIDAQ:
+    """
+    FUENTE NI-DAQ en modo continuo (AcquisitionType.CONTINUOUS).
+
+    canales: uno ('Dev4/ai0') o varios ('Dev4/ai0:1', ['Dev4/ai0',
+    'Dev4/ai1'], ['Dev3/ai0', 'Dev4/ai0']). Todos se leen juntos, en una
+    sola llamada por bloque, y llegan como filas de un mismo bloque
+    (n_canales × B) en el orden dado: quedan sincronizados muestra a
+    muestra y el escritor los guarda intercalados en un solo archivo.
+
+    Los canales de un mismo dispositivo van en una sola tarea. Con varios
+    dispositivos hay una tarea por dispositivo; la primera es la maestra
+    y las demás usan su reloj de muestreo y su disparo de inicio
+    (/Dev/ai/SampleClock y /Dev/ai/StartTrigger, que deben poder rutearse
+    entre las tarjetas: mismo chasis cDAQ/PXI o cable RTSI).
+
+    Lee con AnalogMultiChannelReader.read_many_sample(), que escribe en el
+    array destino sin crear listas de Python.
+    """
+
+    def __init__(self, canales, fs, v_min=-5, v_max=5, buffer_s=10):
+        self.canales     = separar_canales(canales)
+        self.n_canales   = len(self.canales)
+        self.dispositivo = ', '.join(self.canales)
+        self.nombre      = self.dispositivo
+        self.fs          = fs
+        self.v_min       = np.broadcast_to(v_min, self.n_canales).astype(float)
+        self.v_max       = np.broadcast_to(v_max, self.n_canales).astype(float)
+        self.buffer_s    = buffer_s
+        # dispositivo → posiciones (filas del bloque) de sus canales
+        self.grupos = {}
+        for i, c in enumerate(self.canales):
+            self.grupos.setdefault(c.lstrip('/').split('/')[0], []).append(i)
+        self._tareas     = []            # (tarea, lector, filas)
+
+    def iniciar(self):
+        import nidaqmx
+        from nidaqmx.constants import AcquisitionType
+        from nidaqmx.stream_readers import AnalogMultiChannelReader
+
+        maestro = None
+        try:
+            for dispositivo, filas in self.grupos.items():
+                tarea = nidaqmx.Task()
+                self._tareas.append((tarea, None, filas))
+                for i in filas:
+                    tarea.ai_channels.add_ai_voltage_chan(
+                        self.canales[i], min_val=self.v_min[i],
+                        max_val=self.v_max[i])
+                # samps_per_chan en modo continuo = tamaño del buffer del driver
+                reloj = {} if maestro is None else \
+                    {'source': f'/{maestro}/ai/SampleClock'}
+                tarea.timing.cfg_samp_clk_timing(
+                    self.fs, sample_mode=AcquisitionType.CONTINUOUS,
+                    samps_per_chan=int(self.fs * self.buffer_s), **reloj)
+                if maestro is None:
+                    maestro = dispositivo
+                else:
+                    tarea.triggers.start_trigger.cfg_dig_edge_start_trig(
+                        f'/{maestro}/ai/StartTrigger')
+                self._tareas[-1] = (tarea, AnalogMultiChannelReader(tarea.in_stream),
+                                    np.asarray(filas))
+            # las esclavas quedan esperando el disparo; la maestra arranca todo
+            for tarea, _, _ in self._tareas[::-1]:
+                tarea.start()
+        except Exception:
+            self.detener()
+            raise
+
+    def leer_en(self, destino):
+        if not self._tareas:
+            self.iniciar()
+        B = destino.shape[1]
+        for tarea, lector, filas in self._tareas:
+            # read_many_sample necesita un array contiguo: se escribe directo
+            # en el bloque si las filas de la tarea son consecutivas y el
+            # bloque es la casilla completa; si no, en un array aparte
+            directo = filas[-1] - filas[0] + 1 == len(filas) and \
+                destino.flags.c_contiguous
+            salida = destino[filas[0]:filas[-1] + 1] if directo \
+                else np.empty((len(filas), B))
+            lector.read_many_sample(salida, number_of_samples_per_channel=B,
+                                    timeout=10.0)
+            if not directo:
+                destino[filas] = salida
+        return B
+
+    def detener(self):
+        for tarea, _, _ in self._tareas:
+            try:
+                tarea.stop()
+            finally:
+                tarea.close()
+        self._tareas = []
+
+
+# =============================================================================
+# ESCRITOR DE TEXTO (mismo formato que np.savetxt de captura_DAQ.py)
+# =============================================================================
+
+class EscritorTexto:
+    """
+    Escribe los bloques en el formato de senal_capturada_*.txt:
+    encabezado '# ', columna de tiempo y una columna por canal.
+    """
+
+    def __init__(self, ruta, fs, dispositivo='', duracion=None, n_canales=1,
+                 marca_tiempo=''):
+        self.ruta = ruta
+        self.fs   = fs
+        self.n    = 0
+        self._f   = open(ruta, 'w', encoding='utf-8')
+        columnas = ['Tiempo[s]'] + (['Amplitud[V]'] if n_canales == 1 else
+                                    [f'Amplitud{i}[V]' for i in range(n_canales)])
+        dur = 'continua' if duracion is None else f'{duracion:g}'
+        self._f.write(f'# Captura DAQ - {marca_tiempo}\n'
+                      f'# Fs={fs:g} Hz, Duracion={dur} s, Dispositivo={dispositivo}\n'
+                      f'# ' + '\t'.join(columnas) + '\n')
+
+    def escribir(self, bloque):
+        """bloque: (n_canales × B)."""
+        t = (self.n + np.arange(bloque.shape[1])) / self.fs
+        np.savetxt(self._f, np.column_stack((t, bloque.T)), fmt='%.6f',
+                   delimiter='\t')
+        self.n += bloque.shape[1]
+
+    def cerrar(self):
+        self._f.close()
+
+
+# =============================================================================
+# CAPTURA CONTINUA
+# =============================================================================
+
+class CapturaContinua:
+    """
+    CAPTURA CONTINUA con buffer circular y escritura en segundo plano.
+
+        captura = CapturaContinua(fuente, escritor, muestras_bloque=100)
+        captura.ejecutar(duracion=60)        # o sin duración: hasta Ctrl+C
+        captura.estadisticos()               # toda la captura, uno por canal
+        captura.ultimos(5000)                # últimas muestras (n_canales × n)
+
+    El buffer tiene 'n_bloques' casillas de (n_canales × muestras_bloque).
+    Un semáforo cuenta las casillas libres: la lectura nunca pisa un bloque
+    que el hilo escritor todavía no guardó.
+
+    al_bloque(bloque, captura) se llama en el hilo escritor después de
+    guardar cada bloque (sirve para gráficas en vivo o alertas); puede ser
+    una lista de funciones. detener() termina la captura desde otro hilo.
+    Si el escritor o al_bloque fallan, la captura se detiene y ejecutar()
+    lanza ese primer error.
+    """
+
+    def __init__(self, fuente, escritor=None, muestras_bloque=100,
+                 n_bloques=600, al_bloque=None):
+        self.fuente    = fuente
+        self.escritor  = escritor
+        self.B         = int(muestras_bloque)
+        self.n_bloques = int(n_bloques)
+        self.al_bloque = [] if al_bloque is None else \
+            list(al_bloque) if isinstance(al_bloque, (list, tuple)) else [al_bloque]
+        self.buffer    = np.zeros((self.n_bloques, fuente.n_canales, self.B))
+        self.largos    = np.zeros(self.n_bloques, dtype=np.int64)
+        self.momentos  = MomentosCanales(fuente.n_canales)
+        self.n_leidas  = 0       # muestras leídas de la fuente
+        self.n_guardadas = 0     # muestras ya procesadas por el hilo escritor
+        self.error     = None
+        self._libres   = threading.Semaphore(self.n_bloques)
+        self._cola     = queue.Queue()
+        self._leidos   = 0       # bloques leídos
+        self._parar    = threading.Event()
+        self._en_curso = False   # la lectura puede estar llenando una casilla
+
+    def _hilo_escritor(self):
+        while True:
+            casilla = self._cola.get()
+            if casilla is None:
+                break
+            try:
+                if self.error is not None:     # ya falló: solo se liberan casillas
+                    continue
+                bloque = self.buffer[casilla, :, :self.largos[casilla]]
+                if self.escritor is not None:
+                    self.escritor.escribir(bloque)
+                self.momentos.agregar_bloque(bloque)    # todos los canales juntos
+                self.n_guardadas += bloque.shape[1]
+                for funcion in self.al_bloque:
+                    funcion(bloque, self)
+            except Exception as e:     # se reporta al final, no se pierde en el hilo
+                self.error = e         # solo el primero: los demás son consecuencia
+                self._parar.set()      # la lectura no sigue sin guardar nada
+            finally:
+                self._libres.release()
+
+    def ejecutar(self, duracion=None):
+        """Lee bloques hasta 'duracion' segundos (None = hasta Ctrl+C o fin de fuente)."""
+        limite = None if duracion is None else int(round(duracion * self.fuente.fs))
+        hilo = threading.Thread(target=self._hilo_escritor, daemon=True)
+        hilo.start()
+        self.fuente.iniciar()
+        self._en_curso = True
+        try:
+            while (limite is None or self.n_leidas < limite) \
+                    and not self._parar.is_set():
+                self._libres.acquire()
+                casilla = self._leidos % self.n_bloques
+                destino = self.buffer[casilla]
+                if limite is not None and limite - self.n_leidas < self.B:
+                    destino = destino[:, :limite - self.n_leidas]
+                n = self.fuente.leer_en(destino)
+                if n == 0:
+                    self._libres.release()
+                    break
+                self.largos[casilla] = n
+                self._leidos += 1
+                self.n_leidas += n
+                self._cola.put(casilla)
+                if n < destino.shape[1]:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._en_curso = False
+            self.fuente.detener()
+            self._cola.put(None)
+            hilo.join()
+            if self.escritor is not None:
+                self.escritor.cerrar()
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def detener(self):
+        """Pide terminar la captura (p. ej. desde el hilo de las gráficas)."""
+        self._parar.set()
+
+    def ultimos(self, n=None):
+        """
+        Últimas n muestras que siguen en el buffer circular (n_canales × n).
+
+        Sin cerrojo: durante la captura, la casilla que la lectura puede
+        estar llenando no se copia, y los bloques que la lectura pisó
+        mientras se copiaba se descartan, así que la ventana nunca sale
+        mezclada (a lo sumo n_bloques - 1 bloques). Terminada la captura
+        se devuelven todas las casillas.
+        """
+        en_curso = self._en_curso
+        leidos = self._leidos
+        vivas = self.n_bloques - 1 if en_curso else self.n_bloques
+        bloques = range(max(0, leidos - vivas), leidos)
+        copias = [self.buffer[j % self.n_bloques, :, :self.largos[j % self.n_bloques]].copy()
+                  for j in bloques]
+        if en_curso:
+            # la lectura llena ahora el bloque _leidos, en la casilla del
+            # bloque _leidos - n_bloques: ese y los anteriores ya no sirven
+            primero = self._leidos - self.n_bloques + 1
+            copias = [c for j, c in zip(bloques, copias) if j >= primero]
+        if not copias:
+            return np.zeros((self.fuente.n_canales, 0))
+        x = np.concatenate(copias, axis=1)
+        return x if n is None else x[:, -n:]
+
+    def estadisticos(self, ddof_forma=0):
+        """Estadísticos de toda la captura, un diccionario por canal."""
+        return self.momentos.estadisticos(ddof_forma)
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+BARRIDO MONTE CARLO DE SNR (Parte C ampliada)
+
+La Parte C contaminó UNA ventana de 10 s con UNA realización de cada
+ruido. Aquí se recorre una malla completa:
+
+    registro × ventana (inicio) × tipo de ruido × SNR objetivo
+
+y en cada celda se generan n realizaciones con senales.ruido. De cada
+celda queda una fila con la SNR lograda (media, desviación, mínimo y
+máximo) y los parámetros del ruido (σ, amplitud, número de impulsos),
+en vez de guardar las señales.
+
+Uso (desde la carpeta del proyecto):
+
+    python -m senales.barrido 0743 --snr 0 5 10 20 --realizaciones 1000 \\
+        --paso 60 --semilla 2026 -o barrido.tsv --resumen barrido_parteC.txt
+
+Reproducibilidad: cada celda recibe su propio flujo aleatorio,
+SeedSequence(semilla).spawn(n_celdas)[i], según su posición en la malla.
+Por eso el resultado es el mismo con 1 o con 16 procesos y sin importar
+el orden en que terminen.
+
+Igual que en senales.lote, a los procesos solo se les manda la ruta y la
+cabecera del registro; cada uno lee su ventana con memmap.
+=============================================================================
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
+
+from .calidad import PERFILES, limites_adc, ventana_buena
+from .lectura import RegistroWFDB, abrir_registros, buscar_registros
+from .lote import formato_celda
+from .ruido import TIPOS, generar_ruido, potencia_senal, snr_db
+
+
+COLUMNAS = ('registro', 'canal', 'inicio_s', 'segundos', 'tipo',
+            'snr_objetivo', 'realizaciones', 'p_senal', 'sigma', 'amplitud',
+            'n_impulsos', 'snr_media', 'snr_desv', 'snr_min', 'snr_max')
+
+ELEMENTOS_LOTE = 1 << 22      # muestras por matriz R × N (~32 MB en float64)
+
+TITULOS = {
+    'gaussiano': 'RUIDO GAUSSIANO',
+    'impulso'  : 'RUIDO DE IMPULSO',
+    'artefacto': 'RUIDO TIPO ARTEFACTO',
+}
+
+DESCRIPCIONES = {
+    'gaussiano': 'Ruido blanco con distribución normal',
+    'impulso'  : 'Picos esporádicos de alta amplitud',
+    'artefacto': 'Deriva de línea base + componente sinusoidal',
+}
+
+
+def inicios_ventanas(duracion_s, segundos, paso_s=None, inicio_s=0):
+    """Inicios de las ventanas: una sola (paso_s=None) o cada paso_s segundos."""
+    if paso_s is None:
+        return [float(inicio_s)]
+    return [float(t) for t in np.arange(inicio_s, duracion_s - segundos + 1e-9,
+                                        paso_s)]
+
+
+def _simular_celda(senal, fs, tipo, snr, realizaciones, semilla, exacto,
+                   parametros):
+    """
+    Las realizaciones de una celda, en matrices de a ELEMENTOS_LOTE
+    muestras. Cada matriz usa un hijo de la semilla de la celda, así que
+    el resultado no depende de cómo se reparta el trabajo.
+    """
+    N = senal.size
+    por_lote = max(1, ELEMENTOS_LOTE // N)
+    n_lotes = -(-realizaciones // por_lote)
+    snr_logrado = []
+    n_impulsos = []
+    for k, hijo in enumerate(semilla.spawn(n_lotes)):
+        R = min(por_lote, realizaciones - k * por_lote)
+        ruido, _ = generar_ruido(senal, tipo, snr, R, fs,
+                                 np.random.default_rng(hijo), exacto,
+                                 **parametros)
+        snr_logrado.append(snr_db(senal, ruido))
+        if tipo == 'impulso':
+            n_impulsos.append(np.count_nonzero(ruido, axis=1))
+    snr_logrado = np.concatenate(snr_logrado)
+
+    p_ruido = potencia_senal(senal) / 10 ** (snr / 10)
+    fila = {
+        'tipo': tipo, 'snr_objetivo': float(snr),
+        'realizaciones': realizaciones,
+        'p_senal': float(potencia_senal(senal)),
+        'sigma': float(np.sqrt(p_ruido)) if tipo == 'gaussiano' else '',
+        'amplitud': '', 'n_impulsos': '',
+        'snr_media': float(snr_logrado.mean()),
+        'snr_desv': float(snr_logrado.std()),
+        'snr_min': float(snr_logrado.min()),
+        'snr_max': float(snr_logrado.max()),
+    }
+    if tipo == 'impulso':
+        prob = parametros.get('probabilidad', 0.02)
+        fila['amplitud'] = float(np.sqrt(p_ruido / prob))
+        fila['n_impulsos'] = float(np.concatenate(n_impulsos).mean())
+    elif tipo == 'artefacto':
+        # amplitud de la senoidal pura de la misma potencia
+        fila['amplitud'] = float(np.sqrt(2 * p_ruido))
+    return fila
+
+
+def simular_ventana(ruta, cabecera, canal, inicio_s, segundos, celdas,
+                    realizaciones, exacto=False, parametros=None,
+                    solo_buenas=False):
+    """
+    Todas las celdas (indice, tipo, snr, semilla) de una ventana de un
+    registro. Es la función que corre dentro de cada proceso: la ventana
+    se lee una sola vez y se contamina con todos los tipos y SNR.
+    Devuelve una lista de (indice, fila); vacía si solo_buenas y la
+    ventana está saturada, plana o no pasa las reglas del canal
+    (senales.calidad).
+    """
+    registro = RegistroWFDB(ruta, cabecera)
+    fs = registro.fs
+    inicio = int(round(inicio_s * fs))
+    fin = inicio + int(round(segundos * fs))
+    if solo_buenas:
+        info = registro.senales[registro.indice(canal)]
+        vista = registro.canal(canal)
+        if not ventana_buena(vista.digital[inicio:fin], fs, limites_adc(info),
+                             vista.ganancia, vista.base,
+                             PERFILES.get(info['descripcion'].upper())):
+            return []
+    senal = np.asarray(registro.leer(canal, inicio, fin))
+    parametros = parametros or {}
+    salida = []
+    for indice, tipo, snr, semilla in celdas:
+        fila = {'registro': ruta, 'canal': registro.senales[
+                    registro.indice(canal)]['descripcion'],
+                'inicio_s': inicio_s, 'segundos': senal.size / fs}
+        fila.update(_simular_celda(senal, fs, tipo, snr, realizaciones,
+                                   semilla, exacto, parametros.get(tipo, {})))
+        salida.append((indice, fila))
+    return salida
+
+
+def ejecutar_barrido(origen, snrs, tipos=TIPOS, canal='ECG', segundos=10,
+                     inicio_s=0, paso_s=None, realizaciones=100, semilla=0,
+                     exacto=False, parametros=None, trabajadores=None,
+                     cache=True, solo_buenas=False, mostrar=print):
+    """
+    EJECUTAR BARRIDO – reparte las ventanas entre procesos.
+
+    origen    : registros (carpeta, glob o lista; ver lectura.buscar_registros)
+    snrs      : lista de SNR objetivo en dB
+    paso_s    : None → una ventana en inicio_s; si no, ventanas cada paso_s
+                segundos a lo largo de cada registro
+    parametros: {'impulso': {'probabilidad': 0.02},
+                 'artefacto': {'frecuencia': 0.3, 'deriva': 0.0}}
+    solo_buenas: saltar las ventanas malas (senales.calidad); las demás
+                conservan su semilla, así que sus filas no cambian.
+    Devuelve la tabla como lista de filas (dict), en el orden de la malla.
+    """
+    registros = abrir_registros(origen, cache=cache)
+    trabajos = []
+    indice = 0
+    celdas_total = []
+    for r in registros:
+        duracion = r.n_muestras / r.fs
+        for t0 in inicios_ventanas(duracion, segundos, paso_s, inicio_s):
+            celdas = [(indice + k, tipo, snr)
+                      for k, (tipo, snr) in enumerate(product(tipos, snrs))]
+            indice += len(celdas)
+            trabajos.append((r, t0, celdas))
+            celdas_total.extend(celdas)
+
+    semillas = np.random.SeedSequence(semilla).spawn(len(celdas_total))
+    mostrar(f"{len(registros)} registros, {len(trabajos)} ventanas, "
+            f"{len(celdas_total)} celdas × {realizaciones} realizaciones")
+
+    filas = [None] * len(celdas_total)
+    t_inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        tareas = {pool.submit(simular_ventana, r.ruta, r.cabecera, canal, t0,
+                              segundos,
+                              [(i, tipo, snr, semillas[i])
+                               for i, tipo, snr in celdas],
+                              realizaciones, exacto, parametros,
+                              solo_buenas): (r, t0)
+                  for r, t0, celdas in trabajos}
+        for k, tarea in enumerate(as_completed(tareas), 1):
+            r, t0 = tareas[tarea]
+            resultado = tarea.result()
+            for i, fila in resultado:
+                filas[i] = fila
+            mostrar(f"  [{k}/{len(trabajos)}] {r.nombre} @ {t0:g} s"
+                    + ('' if resultado else '  (ventana mala, se salta)'))
+    mostrar(f"  {time.perf_counter() - t_inicio:.1f} s")
+    return [f for f in filas if f is not None]
+
+
+# =============================================================================
+# SALIDA
+# =============================================================================
+
+def guardar_tabla(filas, ruta):
+    """Tabla compacta separada por tabulaciones (una fila por celda)."""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('# ' + '\t'.join(COLUMNAS) + '\n')
+        f.write(''.join('\t'.join(formato_celda(fila[c]) for c in COLUMNAS) + '\n'
+                        for fila in filas))
+
+
+def escribir_resumen(filas, ruta, fs=None, semilla=None, parametros=None):
+    """
+    Resumen con el mismo formato de parteC_resultados_snr_*.txt: una
+    sección por tipo de ruido y, en cada una, los parámetros y la SNR
+    lograda (promedio sobre ventanas y realizaciones) de cada SNR objetivo.
+    parametros: los mismos de ejecutar_barrido() (probabilidad del
+    impulso y frecuencia del artefacto).
+    """
+    parametros = parametros or {}
+    sep = "=" * 60
+    sub = "-" * 60
+    segundos = filas[0]['segundos'] if filas else 0
+    n_ventanas = len({(f['registro'], f['inicio_s']) for f in filas})
+    lineas = [sep, "  RESULTADOS PARTE C - BARRIDO MONTE CARLO DE SNR", sep, "",
+              f"Fecha y hora: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+              f"Duración de la señal: {segundos:.1f} s"]
+    if fs is not None:
+        lineas.append(f"Frecuencia de muestreo: {fs:g} Hz")
+    lineas.append(f"Ventanas: {n_ventanas}")
+    if semilla is not None:
+        lineas.append(f"Semilla: {semilla}")
+
+    tipos = list(dict.fromkeys(f['tipo'] for f in filas))
+    for n, tipo in enumerate(tipos, 1):
+        lineas += ["", sub, f"{n}. {TITULOS[tipo]}", sub,
+                   f"Descripción: {DESCRIPCIONES[tipo]}"]
+        if tipo == 'impulso':
+            prob = parametros.get('impulso', {}).get('probabilidad', 0.02)
+            lineas.append(f"Probabilidad: {prob * 100:.1f}%")
+        elif tipo == 'artefacto':
+            frec = parametros.get('artefacto', {}).get('frecuencia', 0.3)
+            lineas.append(f"Frecuencia: {frec:g} Hz")
+        de_tipo = [f for f in filas if f['tipo'] == tipo]
+        for snr in dict.fromkeys(f['snr_objetivo'] for f in de_tipo):
+            celda = [f for f in de_tipo if f['snr_objetivo'] == snr]
+            total = sum(f['realizaciones'] for f in celda)
+            media = sum(f['snr_media'] * f['realizaciones'] for f in celda) / total
+            # desviación conjunta (entre y dentro de las celdas)
+            m2 = sum(f['realizaciones'] * (f['snr_desv'] ** 2
+                                           + (f['snr_media'] - media) ** 2)
+                     for f in celda) / total
+            lineas.append("")
+            lineas.append(f"SNR objetivo: {snr:g} dB  ({total} realizaciones)")
+            if tipo == 'gaussiano':
+                lineas.append(f"Sigma (σ): {np.mean([f['sigma'] for f in celda]):.6f}")
+            else:
+                lineas.append(f"Amplitud: {np.mean([f['amplitud'] for f in celda]):.6f}")
+            if tipo == 'impulso':
+                lineas.append("Número de impulsos: "
+                              f"{np.mean([f['n_impulsos'] for f in celda]):.1f}")
+            lineas.append(f"SNR: {media:.2f} ± {np.sqrt(m2):.2f} dB  "
+                          f"(mín {min(f['snr_min'] for f in celda):.2f}, "
+                          f"máx {max(f['snr_max'] for f in celda):.2f})")
+    lineas += ["", sep]
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lineas) + '\n')
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.barrido',
+        description='Barrido Monte Carlo de SNR (tipo de ruido × SNR × ventana × registro).')
+    p.add_argument('registros', nargs='+',
+                   help='registros, carpetas o patrones glob (p. ej. "datos/*.hea")')
+    p.add_argument('--snr', type=float, nargs='+', default=[20.0],
+                   help='SNR objetivo en dB')
+    p.add_argument('--tipos', nargs='+', default=list(TIPOS), choices=TIPOS)
+    p.add_argument('--canal', default='ECG')
+    p.add_argument('--segundos', type=float, default=10)
+    p.add_argument('--inicio', type=float, default=0,
+                   help='inicio de la primera ventana en segundos')
+    p.add_argument('--paso', type=float, default=None,
+                   help='separación entre ventanas (por defecto, una sola)')
+    p.add_argument('-n', '--realizaciones', type=int, default=100)
+    p.add_argument('--semilla', type=int, default=0)
+    p.add_argument('--exacto', action='store_true',
+                   help='escalar cada realización a la SNR exacta')
+    p.add_argument('--probabilidad', type=float, default=0.02,
+                   help='fracción de muestras con impulso')
+    p.add_argument('--frecuencia', type=float, default=0.3,
+                   help='frecuencia del artefacto en Hz')
+    p.add_argument('--deriva', type=float, default=0.0,
+                   help='deriva lineal del artefacto (fracción de su amplitud)')
+    p.add_argument('-j', '--trabajadores', type=int, default=None,
+                   help='número de procesos (por defecto, uno por núcleo)')
+    p.add_argument('--solo-buenas', action='store_true',
+                   help='saltar las ventanas malas (ver senales.calidad)')
+    p.add_argument('-o', '--salida', default='barrido_snr.tsv')
+    p.add_argument('--resumen', default=None,
+                   help='archivo de resumen con formato parteC_resultados_snr')
+    args = p.parse_args(argv)
+
+    origen = [h for r in args.registros for h in buscar_registros(r)]
+    parametros = {'impulso': {'probabilidad': args.probabilidad},
+                  'artefacto': {'frecuencia': args.frecuencia,
+                                'deriva': args.deriva}}
+    filas = ejecutar_barrido(origen, args.snr, args.tipos, args.canal,
+                             args.segundos, args.inicio, args.paso,
+                             args.realizaciones, args.semilla, args.exacto,
+                             parametros, args.trabajadores,
+                             solo_buenas=args.solo_buenas)
+    guardar_tabla(filas, args.salida)
+    print(f"Tabla: {args.salida}")
+    if args.resumen:
+        fs = RegistroWFDB(origen[0]).fs if origen else None
+        escribir_resumen(filas, args.resumen, fs, args.semilla, parametros)
+        print(f"Resumen: {args.resumen}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
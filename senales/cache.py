@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+CACHÉ DE RESULTADOS EN DISCO – por contenido, con límite de tamaño (LRU)
+
+Cada corrida de sin_funciones.py / con_funciones.py vuelve a calcular los
+estadísticos y a dibujar grafica1_senales_*.png, grafica2_histogramas_*.png
+y grafica3_boxplots.png aunque nada haya cambiado. Con la caché, cada
+resultado se guarda con una LLAVE que depende de lo que entra al cálculo:
+
+    llave = hash( muestras del recorte + parámetros )
+
+  muestras    los bytes del array (memmap o VistaCanal: los enteros del
+              .dat y la ganancia/baseline), leídos por bloques
+  parámetros  ventana, bins, ddof, ... y la implementación: de una función
+              se usa su código fuente y de un script (ruta a un archivo)
+              su contenido, así que editar el código invalida lo anterior
+
+Si la llave ya está en la caché se devuelve lo guardado (números, arrays,
+diccionarios) o se copia el archivo (.png); si no, se calcula y se guarda.
+La llave no depende del nombre del archivo ni de la fecha: el mismo
+recorte de otra copia de 0743 se reconoce igual.
+
+Los resultados quedan en ~/.cache/senales/resultados (variable de entorno
+SENALES_CACHE). Cuando pasan de limite_mb (SENALES_CACHE_MB, 512 por
+defecto) se borran los usados hace más tiempo (cada lectura actualiza la
+fecha del archivo) hasta quedar en el 90 %.
+
+    from senales.cache import CacheResultados, huella
+    cache = CacheResultados()
+    est = cache.calcular(huella(ecg, momentos_una_pasada), momentos_una_pasada,
+                         ecg.tolist())
+
+    python -m senales.cache            (tamaño y número de resultados)
+    python -m senales.cache --vaciar
+=============================================================================
+"""
+
+import argparse
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import sys
+
+import numpy as np
+
+from .lectura import RUTA_CACHE
+from .momentos import TAM_BLOQUE
+
+
+VERSION = 2           # se incrementa si cambia la forma de calcular la llave
+LIMITE_MB = float(os.environ.get('SENALES_CACHE_MB', 512))
+CARPETA_RESULTADOS = 'resultados'
+
+
+# =============================================================================
+# LLAVE (HUELLA) DEL CONTENIDO
+# =============================================================================
+
+def _agregar(h, parte, tam_bloque=TAM_BLOQUE * 16):
+    """Agrega una parte (datos, archivo, función o valor) al hash."""
+    if hasattr(parte, 'digital'):                 # VistaCanal: enteros del .dat
+        h.update(repr((parte.ganancia, parte.base)).encode())
+        parte = parte.digital
+    if isinstance(parte, (list, tuple)):
+        if not parte or not all(isinstance(p, (int, float, complex, np.number))
+                                for p in parte):
+            for p in parte:                       # arrays, memmaps, ... uno a uno
+                _agregar(h, p, tam_bloque)
+            return
+        parte = np.asarray(parte)                 # lista de números
+    if isinstance(parte, np.ndarray):
+        x = parte
+        h.update(f'{x.dtype.str}{x.shape}'.encode())
+        filas = max(1, tam_bloque // max(1, int(np.prod(x.shape[1:]))))
+        for i in range(0, len(x), filas):
+            h.update(np.ascontiguousarray(x[i:i + filas]).data)
+    elif isinstance(parte, (str, os.PathLike)) and os.path.isfile(parte):
+        with open(parte, 'rb') as f:              # script o archivo de datos
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+    elif callable(parte):
+        try:
+            fuente = inspect.getsource(parte)
+        except (OSError, TypeError):              # funciones de C (np.mean, ...)
+            fuente = ''
+        h.update(f'{getattr(parte, "__module__", "")}.'
+                 f'{getattr(parte, "__qualname__", repr(parte))}\n{fuente}'.encode())
+    elif isinstance(parte, dict):
+        for k in sorted(parte):
+            h.update(repr(k).encode())
+            _agregar(h, parte[k], tam_bloque)
+    else:
+        h.update(repr(parte).encode())
+    h.update(b'\x00')
+
+
+def huella(*partes, **parametros):
+    """
+    Llave (hex) del contenido de 'partes' y de los parámetros con nombre.
+
+    Cada parte puede ser un array / memmap / VistaCanal (se usan sus
+    muestras), una ruta a un archivo existente (su contenido), una función
+    (su código fuente) o cualquier otro valor (su repr).
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f'senales-cache-v{VERSION}'.encode())
+    for parte in partes:
+        _agregar(h, parte)
+    for nombre in sorted(parametros):
+        h.update(nombre.encode() + b'=')
+        _agregar(h, parametros[nombre])
+    return h.hexdigest()
+
+
+# =============================================================================
+# CACHÉ
+# =============================================================================
+
+class CacheResultados:
+    """
+    CACHÉ EN DISCO direccionada por contenido, con desalojo LRU por tamaño.
+
+        cache = CacheResultados()                 # activa=False → no guarda nada
+        valor = cache.calcular(llave, funcion, *args)
+        if not cache.copiar(llave, 'grafica.png'):
+            ...dibujar y guardar 'grafica.png'...
+            cache.guardar_archivo(llave, 'grafica.png')
+
+    aciertos y fallos cuentan las consultas de esta sesión.
+    """
+
+    def __init__(self, directorio=None, limite_mb=LIMITE_MB, activa=True):
+        self.directorio = directorio or os.path.join(RUTA_CACHE, CARPETA_RESULTADOS)
+        self.limite = int(limite_mb * 2**20)
+        self.activa = activa
+        self.aciertos = 0
+        self.fallos = 0
+        self._total = None            # bytes en la caché (se calcula al primer uso)
+
+    def ruta(self, llave, extension='.pkl'):
+        return os.path.join(self.directorio, llave[:2], llave + extension)
+
+    def _usar(self, ruta):
+        """Acierto: la fecha del archivo pasa a ahora (orden LRU)."""
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        self.aciertos += 1
+
+    def _escribir(self, ruta, escribir):
+        """Escritura atómica (temporal + replace) y control del tamaño."""
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        escribir(temporal)
+        os.replace(temporal, ruta)
+        if self._total is None:
+            self._total = self.tamano()
+        else:
+            self._total += os.path.getsize(ruta)
+        if self._total > self.limite:
+            self.recortar()
+
+    # -------------------------------------------------------------------------
+    # Valores (números, arrays, diccionarios)
+    # -------------------------------------------------------------------------
+    def leer(self, llave, defecto=None):
+        if not self.activa:
+            return defecto
+        ruta = self.ruta(llave)
+        try:
+            with open(ruta, 'rb') as f:
+                valor = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.fallos += 1
+            return defecto
+        self._usar(ruta)
+        return valor
+
+    def guardar(self, llave, valor):
+        if not self.activa:
+            return valor
+
+        def escribir(temporal):
+            with open(temporal, 'wb') as f:
+                pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._escribir(self.ruta(llave), escribir)
+        return valor
+
+    def calcular(self, llave, funcion, *args, **kwargs):
+        """funcion(*args, **kwargs), o lo guardado con esa llave."""
+        falta = object()
+        valor = self.leer(llave, falta)
+        if valor is falta:
+            valor = self.guardar(llave, funcion(*args, **kwargs))
+        return valor
+
+    # -------------------------------------------------------------------------
+    # Archivos (gráficas .png, tablas)
+    # -------------------------------------------------------------------------
+    def copiar(self, llave, destino):
+        """Si la llave está, copia el archivo guardado a 'destino' → True."""
+        if not self.activa:
+            return False
+        ruta = self.ruta(llave, os.path.splitext(destino)[1])
+        try:
+            shutil.copyfile(ruta, destino)
+        except OSError:
+            self.fallos += 1
+            return False
+        self._usar(ruta)
+        return True
+
+    def guardar_archivo(self, llave, origen):
+        """Guarda una copia de 'origen' con la llave (misma extensión)."""
+        if self.activa:
+            self._escribir(self.ruta(llave, os.path.splitext(origen)[1]),
+                           lambda temporal: shutil.copyfile(origen, temporal))
+        return origen
+
+    # -------------------------------------------------------------------------
+    # Tamaño y desalojo
+    # -------------------------------------------------------------------------
+    def _archivos(self):
+        """[(fecha de último uso, bytes, ruta)] de todo lo guardado."""
+        salida = []
+        if not os.path.isdir(self.directorio):
+            return salida
+        for sub in os.scandir(self.directorio):
+            if not sub.is_dir():
+                continue
+            for a in os.scandir(sub.path):
+                if a.name.endswith('.tmp'):
+                    continue
+                try:
+                    st = a.stat()
+                except OSError:               # otro proceso lo acaba de borrar
+                    continue
+                salida.append((st.st_mtime, st.st_size, a.path))
+        return salida
+
+    def tamano(self):
+        return sum(b for _, b, _ in self._archivos())
+
+    def recortar(self, fraccion=0.9):
+        """Borra los menos usados hasta quedar en fraccion × límite. Devuelve cuántos."""
+        archivos = sorted(self._archivos())
+        total = sum(b for _, b, _ in archivos)
+        borrados = 0
+        for _, b, ruta in archivos:
+            if total <= fraccion * self.limite:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            total -= b
+            borrados += 1
+        self._total = total
+        return borrados
+
+    def vaciar(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        self._total = 0
+
+    def __repr__(self):
+        return (f"CacheResultados({self.directorio!r}, límite={self.limite / 2**20:g} MB"
+                f"{'' if self.activa else ', inactiva'})")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.cache',
+        description='Caché de resultados (estadísticos y gráficas) en disco.')
+    p.add_argument('--vaciar', action='store_true', help='borrar todo lo guardado')
+    p.add_argument('--limite-mb', type=float, default=LIMITE_MB,
+                   help='recortar la caché a este tamaño (LRU)')
+    args = p.parse_args(argv)
+
+    cache = CacheResultados(limite_mb=args.limite_mb)
+    if args.vaciar:
+        cache.vaciar()
+    elif cache.tamano() > cache.limite:
+        print(f"  {cache.recortar()} resultados borrados (LRU)")
+    archivos = cache._archivos()
+    print(f"  {cache.directorio}")
+    print(f"  {len(archivos)} resultados, "
+          f"{sum(b for _, b, _ in archivos) / 2**20:.2f} MB de {args.limite_mb:g} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+CALIDAD DE LA SEÑAL (SQI) Y SEGMENTOS MALOS – registro completo por ventanas
+
+En la Parte A la asimetría y la curtosis solo se describen ("el ECG tiene
+curtosis muy alta por los picos R"). Esos mismos números, calculados por
+ventanas, sirven para marcar los tramos que no se pueden usar. Para cada
+ventana de 'ventana_s' segundos (sin solapamiento) y cada canal:
+
+    saturacion  fracción de muestras en los límites del conversor
+                (ADC de adc_res bits: ±(2^(adc_res-1) - 1); el valor
+                -2^(adc_res-1) es además la marca WFDB de "sin dato")
+    plano       fracción de la ventana cubierta por tramos constantes de
+                más de plano_s segundos (electrodo suelto, equipo en pausa)
+    curtosis    curtosis de la ventana (convención de SciPy); un ECG limpio
+                tiene picos R y curtosis alta (> 2), el ruido o la línea
+                base sola quedan cerca de 0 (kSQI, Li y Clifford 2008)
+    media       media de la ventana en unidades físicas (para rangos
+                fisiológicos, p. ej. presión media entre 20 y 300 mmHg)
+
+Una ventana es 'buena' si pasa todas las reglas del canal (ver PERFILES).
+
+Todo se calcula sobre los valores DIGITALES del .dat (el memmap, sin
+convertir): la saturación es un límite del conversor y la curtosis no
+cambia con ganancia ni baseline. Se lee por bloques de ventanas enteras:
+
+  - saturación: conteo por fila de una matriz (ventanas × W);
+  - tramos planos: inicios de tramo con np.diff, los tramos largos se
+    guardan (son pocos) y su cobertura de cada ventana sale de una suma
+    acumulada, sin recorrer muestra por muestra;
+  - curtosis y media: senales.ventanas (sumas acumuladas, O(N)).
+
+La máscara la usan otras etapas para saltarse lo malo:
+
+    python -m senales.calidad 0743 -o calidad.tsv
+    python -m senales.lote "datos/*.hea" --solo-buenas
+    python -m senales.barrido 0743 --paso 60 --solo-buenas
+=============================================================================
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from .lectura import OFFSET_FORMATO, abrir_registro
+from .momentos import TAM_BLOQUE
+from .ventanas import _Desplazada, estadisticos_ventanas, guardar_tabla
+
+
+COLUMNAS = ('inicio', 't', 'saturacion', 'plano', 'curtosis', 'media', 'buena')
+
+VENTANA_S = 10.0
+
+# Reglas por tipo de canal (descripción en el .hea); los demás canales
+# solo se revisan por saturación y tramos planos
+PERFILES = {
+    'ECG' : {'curtosis_min': 2.0},
+    'NIBP': {'rango_media': (20.0, 300.0)},
+}
+
+UMBRALES = {
+    'plano_s'       : 0.25,     # tramo constante más largo que esto = plano
+    'max_saturacion': 0.001,    # fracción de muestras saturadas permitida
+    'max_plano'     : 0.1,      # fracción de la ventana plana permitida
+}
+
+
+def limites_adc(info):
+    """
+    Límites DIGITALES (mín, máx) del conversor de un canal del .hea, en
+    las unidades del memmap. Ojo: en '16 0 -25930 -10151 0 ECG' los
+    números -25930 y -10151 son el valor inicial y el checksum, no los
+    límites; los límites salen de adc_res (16 bits → ±32767).
+    """
+    bits = info['adc_res'] or {'80': 8, '32': 32}.get(info['formato'], 16)
+    tope = 2 ** (bits - 1) - 1
+    offset = OFFSET_FORMATO.get(info['formato'], 0)       # formatos sin signo
+    return info['adc_zero'] - tope + offset, info['adc_zero'] + tope + offset
+
+
+def _tramos_planos(x, n, minimo, tolerancia, tam_bloque):
+    """
+    Tramos de x[0:n] con muestras consecutivas iguales (|Δx| ≤ tolerancia)
+    de al menos 'minimo' muestras. Devuelve (inicios, largos).
+    """
+    inicios, largos = [], []
+    abierto = None                   # inicio del tramo que sigue abierto
+    previa = None
+    for a in range(0, n, tam_bloque):
+        b = np.asarray(x[a:min(a + tam_bloque, n)], dtype=np.float64)
+        ext = b if previa is None else np.concatenate(([previa], b))
+        cambio = np.abs(np.diff(ext)) > tolerancia
+        nuevos = np.flatnonzero(cambio) + a         # muestra donde empieza un tramo
+        if previa is None:                          # (ext no tiene la previa)
+            nuevos = np.concatenate(([0], nuevos + 1))
+        todos = nuevos if abierto is None else np.concatenate(([abierto], nuevos))
+        largo = np.diff(todos)
+        largos_ok = largo >= minimo
+        inicios.append(todos[:-1][largos_ok])
+        largos.append(largo[largos_ok])
+        abierto = int(todos[-1])
+        previa = b[-1]
+    if abierto is not None and n - abierto >= minimo:
+        inicios.append([abierto])
+        largos.append([n - abierto])
+    if not inicios:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return (np.concatenate(inicios).astype(np.int64),
+            np.concatenate(largos).astype(np.int64))
+
+
+def _cobertura(inicios, largos, W, n_ventanas):
+    """Muestras de cada ventana [j·W, (j+1)·W) cubiertas por los tramos."""
+    bordes = np.arange(n_ventanas + 1, dtype=np.int64) * W
+    if inicios.size == 0:
+        return np.zeros(n_ventanas, dtype=np.int64)
+    previos = np.concatenate(([0], np.cumsum(largos)))     # antes del tramo k
+    k = np.searchsorted(inicios, bordes, side='right') - 1
+    kk = np.maximum(k, 0)
+    F = np.where(k >= 0, previos[kk] + np.clip(bordes - inicios[kk], 0, largos[kk]), 0)
+    return np.diff(F)
+
+
+def calidad_canal(x, fs, ventana_s=VENTANA_S, limites=None, ganancia=1.0,
+                  base=0.0, inicio=0, fin=None, tolerancia=0.0,
+                  curtosis_min=None, curtosis_max=None, rango_media=None,
+                  tam_bloque=TAM_BLOQUE, **umbrales):
+    """
+    SQI POR VENTANAS de x[inicio:fin] (array, memmap o VistaCanal).
+
+    limites          : (mín, máx) del conversor en las unidades de x
+                       (None = sin revisión de saturación)
+    ganancia, base   : para pasar la media a unidades físicas,
+                       (media - base) / ganancia
+    tolerancia       : |Δx| máximo para considerar dos muestras iguales
+                       (0 con valores digitales; algo de ruido con voltajes)
+    curtosis_min/max, rango_media : reglas del canal (ver PERFILES)
+    umbrales         : plano_s, max_saturacion, max_plano (ver UMBRALES)
+
+    Devuelve un diccionario de columnas (ver COLUMNAS), una fila por
+    ventana; la cola de menos de una ventana no se evalúa.
+    """
+    u = dict(UMBRALES, **umbrales)
+    W = int(round(ventana_s * fs))
+    tabla = estadisticos_ventanas(x, fs, ventana_s, ventana_s, inicio, fin,
+                                  ddof_forma=0, tam_bloque=tam_bloque)
+    n_v = tabla['inicio'].size
+    vista = _Desplazada(x, inicio)
+    paso = max(1, tam_bloque // W) * W            # bloques de ventanas enteras
+
+    saturadas = np.zeros(n_v, dtype=np.int64)
+    if limites is not None:
+        for a in range(0, n_v * W, paso):
+            b = np.asarray(vista[a:min(a + paso, n_v * W)]).reshape(-1, W)
+            saturadas[a // W:a // W + b.shape[0]] = \
+                np.count_nonzero((b <= limites[0]) | (b >= limites[1]), axis=1)
+
+    s, L = _tramos_planos(vista, n_v * W, max(2, int(round(u['plano_s'] * fs))),
+                          tolerancia, paso)
+    plano = _cobertura(s, L, W, n_v) / W
+
+    with np.errstate(invalid='ignore'):
+        saturacion = saturadas / W
+        media = (tabla['media'] - base) / ganancia
+        curtosis = tabla['curtosis']
+        buena = (saturacion <= u['max_saturacion']) & (plano <= u['max_plano']) \
+            & np.isfinite(curtosis)
+        if curtosis_min is not None:
+            buena &= curtosis >= curtosis_min
+        if curtosis_max is not None:
+            buena &= curtosis <= curtosis_max
+        if rango_media is not None:
+            buena &= (media >= rango_media[0]) & (media <= rango_media[1])
+    return {'inicio': tabla['inicio'], 't': tabla['t'], 'saturacion': saturacion,
+            'plano': plano, 'curtosis': curtosis, 'media': media, 'buena': buena}
+
+
+def calidad_registro(registro, canales=None, ventana_s=VENTANA_S, inicio=0,
+                     fin=None, perfiles=PERFILES, **umbrales):
+    """
+    SQI de los canales de un RegistroWFDB (todos si canales = None), sobre
+    los valores digitales del memmap. Devuelve {canal: tabla} y la
+    máscara conjunta en la clave 'buena' (la ventana es buena si lo es en
+    todos los canales revisados).
+    """
+    canales = range(registro.n_senales) if canales is None else canales
+    resultado = {}
+    for c in canales:
+        i = registro.indice(c)
+        info = registro.senales[i]
+        vista = registro.canal(i)
+        reglas = perfiles.get(info['descripcion'].upper(), {})
+        resultado[info['descripcion']] = calidad_canal(
+            vista.digital, registro.fs, ventana_s, limites_adc(info),
+            vista.ganancia, vista.base, inicio, fin, **dict(reglas, **umbrales))
+    tablas = list(resultado.values())
+    resultado['buena'] = np.logical_and.reduce([t['buena'] for t in tablas]) \
+        if tablas else np.empty(0, dtype=bool)
+    return resultado
+
+
+def segmentos_buenos(inicios, buena, W):
+    """
+    Une ventanas buenas consecutivas: lista de (a, b) en muestras,
+    [a, b) sin ninguna ventana mala adentro.
+    """
+    inicios = np.asarray(inicios, dtype=np.int64)
+    buena = np.asarray(buena, dtype=bool)
+    if not buena.any():
+        return []
+    b = np.concatenate(([False], buena, [False])).astype(np.int8)
+    d = np.diff(b)
+    a, z = np.flatnonzero(d == 1), np.flatnonzero(d == -1)
+    return [(int(inicios[i]), int(inicios[j - 1] + W)) for i, j in zip(a, z)]
+
+
+def ventana_buena(x, fs, limites=None, ganancia=1.0, base=0.0, perfil=None,
+                  **umbrales):
+    """¿x (una ventana ya leída) pasa todas las reglas? Una sola ventana."""
+    t = calidad_canal(x, fs, len(x) / fs, limites, ganancia, base,
+                      **dict(perfil or {}, **umbrales))
+    return bool(t['buena'].size and t['buena'][0])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.calidad',
+        description='Calidad (SQI) por ventanas y segmentos malos de registros WFDB.')
+    p.add_argument('registros', nargs='+', help='registros WFDB (p. ej. 0743)')
+    p.add_argument('-o', '--salida', default=None,
+                   help='tabla por ventana (.tsv o .npz); con varios registros '
+                        'se agrega el nombre del registro')
+    p.add_argument('--ventana', type=float, default=VENTANA_S,
+                   help='longitud de cada ventana en segundos')
+    p.add_argument('--plano', type=float, default=UMBRALES['plano_s'],
+                   help='segundos constantes para considerar un tramo plano')
+    args = p.parse_args(argv)
+
+    for ruta in args.registros:
+        registro = abrir_registro(ruta)
+        r = calidad_registro(registro, ventana_s=args.ventana, plano_s=args.plano)
+        canales = [c for c in r if c != 'buena']
+        W = int(round(args.ventana * registro.fs))
+        buena = r['buena']
+        print(f"\n  {registro.nombre} — {buena.size} ventanas de {args.ventana:g} s, "
+              f"{int(buena.sum())} buenas ({100 * buena.mean() if buena.size else 0:.1f} %)")
+        for c in canales:
+            t = r[c]
+            print(f"    {c:<5} malas={int((~t['buena']).sum()):4d}  "
+                  f"saturadas={int((t['saturacion'] > 0).sum()):4d}  "
+                  f"planas={int((t['plano'] > 0).sum()):4d}  "
+                  f"curtosis mediana={np.nanmedian(t['curtosis']):.2f}")
+        # los tramos malos son los "buenos" de la máscara negada
+        for a, b in segmentos_buenos(r[canales[0]]['inicio'], ~buena, W):
+            print(f"    ✗ {a / registro.fs:8.1f} – {b / registro.fs:8.1f} s")
+        if args.salida:
+            tabla = {'inicio': r[canales[0]]['inicio'], 't': r[canales[0]]['t']}
+            for c in canales:
+                tabla.update({f'{c}_{k}': r[c][k] for k in COLUMNAS[2:]})
+            tabla['buena'] = buena
+            salida = args.salida if len(args.registros) == 1 else \
+                '_'.join((os.path.splitext(args.salida)[0], registro.nombre)) + \
+                os.path.splitext(args.salida)[1]
+            guardar_tabla(tabla, salida)
+            print(f"    → {salida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+COMPARACIÓN PARTE A vs PARTE B – capturas de la DAQ contra registros WFDB
+
+El PASO 7 de captura_DAQ.py pedía comparar a mano los estadísticos de la
+captura con los de 0743. Aquí se hace por lotes: N capturas (.txt o
+WFDB) contra M registros de referencia, canal contra canal, y sale UNA
+tabla separada por tabulaciones con una fila por par:
+
+    captura, canal   referencia, canal   estadísticos de la Parte A de
+    cada uno (media, s, CV, asimetría, curtosis)   ks   wasserstein
+
+Distancias entre las distribuciones (histogramas) de los dos canales:
+
+    ks           máx |F_c(x) - F_r(x)|  (estadístico de Kolmogorov-Smirnov)
+    wasserstein  ∫ |F_c(x) - F_r(x)| dx (distancia de Wasserstein-1)
+
+La captura está en V y 0743 en mV / mmHg, así que por defecto cada señal
+se compara en ESCALA z = (x - media) / s: las distancias miden la FORMA de
+la distribución (lo que también miden asimetría y curtosis) y wasserstein
+queda en desviaciones estándar. Con rango=(a, b) se comparan los valores
+tal cual, todos con los mismos bordes.
+
+Cada canal se resume UNA sola vez (resumen_canal: momentos por bloques y
+la distribución acumulada F en N_BINS + 1 puntos fijos) y las distancias
+de todos los pares salen de restar esos vectores, sin volver a leer las
+muestras. Con 40 capturas y una referencia, 0743 se lee una vez y no 40;
+además los resúmenes quedan en la caché de resultados (senales.cache),
+así que en la siguiente corrida la referencia ya no se vuelve a leer.
+
+La resolución es la de los bins: con 2000 bins en ±8 s, el error de ks es
+a lo sumo la masa de un bin y el de wasserstein ~0.008 s. Las muestras
+más allá de ±8 s cuentan para ks pero no para wasserstein.
+
+    python -m senales.comparacion "senal_capturada_*" -r 0743 -o comparacion.tsv
+    python -m senales.comparacion captura.txt -r 0743 --segundos-referencia 10
+=============================================================================
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+import numpy as np
+
+from .cache import CacheResultados, huella
+from .histograma import histograma_por_bloques
+from .lectura import abrir_registro, buscar_registros
+from .lote import formato_celda
+from .momentos import momentos_por_bloques
+from .texto import leer_captura_txt
+
+
+ESTADISTICOS = ('media', 'desv_estandar', 'coef_variacion', 'asimetria',
+                'curtosis')
+COLUMNAS = (('captura', 'canal_captura', 'referencia', 'canal_referencia',
+             'n_captura', 'n_referencia')
+            + tuple(f'{e}_{lado}' for e in ESTADISTICOS
+                    for lado in ('captura', 'referencia'))
+            + ('ks', 'wasserstein', 'escala'))
+
+N_BINS = 2000
+RANGO_Z = 8.0         # bordes en media ± RANGO_Z · s (escala z)
+
+
+# =============================================================================
+# CANALES DE CAPTURAS Y REGISTROS
+# =============================================================================
+
+def buscar_archivos(origen):
+    """
+    Rutas de capturas .txt y de registros WFDB (.hea) en 'origen': una
+    ruta, un patrón glob ("senal_capturada_*" encuentra .txt y .dat/.hea),
+    una carpeta o una lista de ellas.
+    """
+    items = [origen] if isinstance(origen, (str, os.PathLike)) else origen
+    rutas = []
+    for item in map(os.fspath, items):
+        if os.path.isdir(item):
+            item = os.path.join(item, '*')
+        if not glob.has_magic(item):
+            rutas.append(item if item.endswith('.txt')
+                         else buscar_registros([item])[0])
+            continue
+        for r in sorted(glob.glob(item)):
+            if r.endswith('.txt'):
+                rutas.append(r)
+            elif r.endswith(('.hea', '.dat')):
+                rutas.extend(buscar_registros([r]))
+    return list(dict.fromkeys(rutas))
+
+
+def canales(origen, nombres=None, inicio_s=0, segundos=None):
+    """
+    Genera un diccionario por canal de cada archivo de 'origen':
+      {'archivo', 'canal', 'unidades', 'fs', 'x', 'inicio', 'fin'}
+    x es la VistaCanal del registro (o la fila de la captura .txt) y
+    [inicio, fin) la ventana en muestras. nombres filtra los canales.
+    """
+    for ruta in buscar_archivos(origen):
+        if ruta.endswith('.txt'):
+            datos, meta = leer_captura_txt(ruta)
+            fs = meta['fs']
+            columnas = meta['columnas'][1:]
+            filas = [(x, columnas[k].split('[')[0] if k < len(columnas)
+                      else meta['dispositivo'] or f'canal{k}', 'V')
+                     for k, x in enumerate(datos)]
+            archivo = ruta
+        else:
+            registro = abrir_registro(ruta)
+            fs = registro.fs
+            filas = [(registro.canal(k), info['descripcion'], info['unidades'])
+                     for k, info in enumerate(registro.senales)]
+            archivo = os.path.splitext(ruta)[0]
+        inicio = int(round(inicio_s * fs))
+        fin = None if segundos is None else inicio + int(round(segundos * fs))
+        for x, nombre, unidades in filas:
+            if nombres is None or nombre in nombres:
+                yield {'archivo': archivo, 'canal': nombre, 'unidades': unidades,
+                       'fs': fs, 'x': x, 'inicio': inicio, 'fin': fin}
+
+
+# =============================================================================
+# RESUMEN DE UN CANAL Y DISTANCIAS
+# =============================================================================
+
+def resumen_canal(x, inicio=0, fin=None, ddof_forma=1, n_bins=N_BINS,
+                  rango=None):
+    """
+    RESUMEN de x[inicio:fin] para comparar: {'estadisticos', 'cdf'}.
+
+    cdf[k] = fracción de muestras por debajo del borde k de los n_bins
+    (n_bins + 1 valores). Con rango = None los bordes son media ± RANGO_Z·s
+    de la propia señal (escala z); con rango = (a, b), fijos.
+    """
+    e = momentos_por_bloques(x, inicio, fin).estadisticos(ddof_forma)
+    if rango is None:
+        s = e['desv_estandar'] if e['desv_estandar'] > 0 else 1.0
+        rango = (e['media'] - RANGO_Z * s, e['media'] + RANGO_Z * s)
+    h = histograma_por_bloques(x, n_bins, rango, inicio, fin)
+    acumulado = np.concatenate(([h.debajo], h.debajo + np.cumsum(h.conteos)))
+    return {'estadisticos': e, 'cdf': acumulado / max(h.n, 1)}
+
+
+def distancias(cdf, cdf_ref, ancho):
+    """
+    KS y Wasserstein-1 de cada fila de cdf (m × n_bins+1) contra cdf_ref
+    (n_bins+1), con bins de 'ancho' (la integral, por trapecios).
+    """
+    d = np.abs(np.atleast_2d(cdf) - cdf_ref)
+    return d.max(axis=1), (d[:, 1:] + d[:, :-1]).sum(axis=1) * (ancho / 2)
+
+
+def _resumir(c, cache, ddof_forma, n_bins, rango):
+    """resumen_canal() de un canal de canales(), o el guardado en la caché."""
+    x, inicio, fin = c['x'], c['inicio'], c['fin']
+    muestras = (x.digital[inicio:fin], x.ganancia, x.base) \
+        if hasattr(x, 'digital') else (x[inicio:fin],)
+    llave = huella(*muestras, resumen_canal, ddof_forma=ddof_forma,
+                   n_bins=n_bins, rango=rango, rango_z=RANGO_Z)
+    return cache.calcular(llave, resumen_canal, x, inicio, fin, ddof_forma,
+                          n_bins, rango)
+
+
+# =============================================================================
+# REPORTE
+# =============================================================================
+
+def comparar_con_referencias(capturas, referencias, canales_captura=None,
+                             canales_referencia=None, segundos_referencia=None,
+                             inicio_referencia=0, ddof_forma=1, n_bins=N_BINS,
+                             rango=None, cache=True, mostrar=print):
+    """
+    COMPARAR – cada canal de cada captura contra cada canal de cada
+    referencia. Devuelve una lista de filas (dict, ver COLUMNAS).
+
+    capturas, referencias: rutas, patrones o listas (ver buscar_archivos).
+    segundos_referencia / inicio_referencia: ventana de las referencias
+    (None = registro completo); las capturas se usan completas.
+    cache: False → no leer ni guardar resúmenes en senales.cache.
+    """
+    cache = CacheResultados(activa=cache)
+    escala = 'z' if rango is None else f'{rango[0]:g}..{rango[1]:g}'
+    ancho = (2 * RANGO_Z if rango is None else rango[1] - rango[0]) / n_bins
+
+    refs = list(canales(referencias, canales_referencia, inicio_referencia,
+                        segundos_referencia))
+    caps = list(canales(capturas, canales_captura))
+    if not refs or not caps:
+        mostrar(f"  {len(caps)} canales de captura, {len(refs)} de referencia: "
+                f"no hay nada que comparar")
+        return []
+    for c in refs + caps:                # cada canal se resume una sola vez
+        c.update(_resumir(c, cache, ddof_forma, n_bins, rango))
+    mostrar(f"  {len(caps)} canales de captura × {len(refs)} de referencia")
+
+    cdf = np.array([c['cdf'] for c in caps])
+    ks, w = zip(*(distancias(cdf, r['cdf'], ancho) for r in refs))
+
+    filas = []
+    for i, c in enumerate(caps):
+        for j, r in enumerate(refs):
+            fila = {'captura': c['archivo'], 'canal_captura': c['canal'],
+                    'referencia': r['archivo'], 'canal_referencia': r['canal'],
+                    'n_captura': c['estadisticos']['n'],
+                    'n_referencia': r['estadisticos']['n'],
+                    'ks': float(ks[j][i]), 'wasserstein': float(w[j][i]),
+                    'escala': escala}
+            for e in ESTADISTICOS:
+                fila[f'{e}_captura'] = c['estadisticos'][e]
+                fila[f'{e}_referencia'] = r['estadisticos'][e]
+            filas.append(fila)
+            mostrar(f"  {os.path.basename(c['archivo'])}:{c['canal']:<8} vs "
+                    f"{os.path.basename(r['archivo'])}:{r['canal']:<5} "
+                    f"asimetría {fila['asimetria_captura']:8.4f} / "
+                    f"{fila['asimetria_referencia']:8.4f}  curtosis "
+                    f"{fila['curtosis_captura']:8.4f} / "
+                    f"{fila['curtosis_referencia']:8.4f}  "
+                    f"ks={fila['ks']:.4f}  w={fila['wasserstein']:.4f}")
+    return filas
+
+
+def guardar_reporte(filas, ruta_salida):
+    """Escribe el reporte (archivo nuevo, encabezado '# ' como en el lote)."""
+    with open(ruta_salida, 'w', encoding='utf-8') as f:
+        f.write('# ' + '\t'.join(COLUMNAS) + '\n')
+        f.write(''.join('\t'.join(formato_celda(fila[c]) for c in COLUMNAS) + '\n'
+                        for fila in filas))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.comparacion',
+        description='Capturas de la DAQ (Parte B) contra registros WFDB (Parte A).')
+    p.add_argument('capturas', nargs='+',
+                   help='capturas .txt o WFDB, carpetas o patrones glob '
+                        '(p. ej. "senal_capturada_*")')
+    p.add_argument('-r', '--referencias', nargs='+', default=['0743'],
+                   help='registros de referencia (por defecto, 0743)')
+    p.add_argument('-o', '--salida', default='comparacion.tsv')
+    p.add_argument('--canales-captura', nargs='+', default=None,
+                   help='solo estos canales de las capturas')
+    p.add_argument('--canales-referencia', nargs='+', default=None,
+                   help='solo estos canales de las referencias (p. ej. ECG)')
+    p.add_argument('--segundos-referencia', type=float, default=None,
+                   help='ventana de las referencias (por defecto, completas)')
+    p.add_argument('--inicio-referencia', type=float, default=0,
+                   help='inicio de la ventana de las referencias en segundos')
+    p.add_argument('--ddof-forma', type=int, default=1, choices=(0, 1),
+                   help='1 = fórmulas de sin_funciones, 0 = convención de SciPy')
+    p.add_argument('--bins', type=int, default=N_BINS,
+                   help='puntos de la distribución acumulada')
+    p.add_argument('--rango', type=float, nargs=2, default=None,
+                   metavar=('MIN', 'MAX'),
+                   help='comparar los valores tal cual entre MIN y MAX '
+                        '(por defecto, escala z)')
+    p.add_argument('--sin-cache', action='store_true',
+                   help='no usar la caché de resultados')
+    args = p.parse_args(argv)
+
+    filas = comparar_con_referencias(
+        args.capturas, args.referencias, args.canales_captura,
+        args.canales_referencia, args.segundos_referencia,
+        args.inicio_referencia, args.ddof_forma, args.bins,
+        args.rango and tuple(args.rango), cache=not args.sin_cache)
+    guardar_reporte(filas, args.salida)
+    print(f"Reporte: {os.path.abspath(args.salida)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
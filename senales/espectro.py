@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+SNR EN FRECUENCIA – PSD de Welch con planes reutilizables
+
+Para el ruido tipo artefacto la SNR se puede medir en frecuencia:
+se identifica la frecuencia del artefacto (el pico de la PSD en la banda
+baja, 0.3 Hz en la Parte C) y se compara la energía en esa banda contra
+la energía de la señal pura:
+
+    P_banda = Σ PSD(f) · Δf       para f en [f₀ - ancho, f₀ + ancho]
+    SNR     = 10 · log10( P_señal / P_banda )
+
+PSD de Welch: la señal se parte en segmentos de nperseg muestras con
+solapamiento, a cada uno se le quita la media y se multiplica por la
+ventana (Hann), y se promedian los |FFT|². Da lo mismo que
+scipy.signal.welch (density, onesided, detrend='constant').
+
+Plan: todo lo que depende solo de (n, fs, nperseg, solapamiento, ventana)
+—ventana, escala, frecuencias, número de segmentos— se calcula una vez y
+queda guardado (plan_welch usa lru_cache). Las ventanas y realizaciones
+siguientes solo hacen la FFT, y todas las filas de una matriz (varias
+ventanas o realizaciones) se transforman en una sola llamada.
+=============================================================================
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .momentos import TAM_BLOQUE
+
+
+ELEMENTOS_LOTE = 1 << 22      # muestras por lote de ventanas (~32 MB)
+
+COLUMNAS = ('inicio', 't', 'frecuencia', 'p_banda', 'p_senal', 'snr')
+
+
+class PlanWelch:
+    """
+    PLAN WELCH para señales de n muestras a fs Hz.
+
+        plan = plan_welch(10000, 1000)
+        P = plan.psd(x)          # x: (n,) o (R × n) → (F,) o (R × F)
+        plan.f                   # frecuencias de cada columna de P
+
+    nperseg = None → un solo segmento de n muestras (máxima resolución:
+    0.1 Hz para 10 s, suficiente para separar 0.3 Hz).
+    """
+
+    def __init__(self, n, fs, nperseg=None, solapamiento=None, ventana='hann'):
+        self.n = int(n)
+        self.fs = fs
+        self.nperseg = self.n if nperseg is None else min(int(nperseg), self.n)
+        self.solapamiento = self.nperseg // 2 if solapamiento is None \
+            else int(solapamiento)
+        if not 0 <= self.solapamiento < self.nperseg:
+            raise ValueError("El solapamiento debe estar entre 0 y nperseg - 1")
+        self.paso = self.nperseg - self.solapamiento
+        self.n_segmentos = (self.n - self.nperseg) // self.paso + 1
+
+        from scipy.signal import get_window
+        self.ventana = get_window(ventana, self.nperseg)
+        self.escala = 1.0 / (fs * np.sum(self.ventana ** 2))
+        self.f = np.fft.rfftfreq(self.nperseg, 1.0 / fs)
+        self.df = fs / self.nperseg
+        # un solo lado: todo menos DC (y Nyquist si nperseg es par) se duplica
+        self.factor = np.full(self.f.size, 2.0)
+        self.factor[0] = 1.0
+        if self.nperseg % 2 == 0:
+            self.factor[-1] = 1.0
+        self.factor *= self.escala
+
+    def psd(self, x):
+        """PSD de Welch de la(s) última(s) n muestras; la forma es (..., F)."""
+        x = np.asarray(x, dtype=np.float64)
+        if x.shape[-1] != self.n:
+            raise ValueError(f"El plan es para {self.n} muestras, no {x.shape[-1]}")
+        segmentos = sliding_window_view(x, self.nperseg, axis=-1)[..., ::self.paso, :]
+        segmentos = segmentos - segmentos.mean(axis=-1, keepdims=True)
+        X = np.fft.rfft(segmentos * self.ventana, axis=-1)
+        P = (X.real ** 2 + X.imag ** 2) * self.factor
+        return P.mean(axis=-2)
+
+    def banda(self, frecuencia, ancho=None):
+        """Banda [f₀ - ancho, f₀ + ancho]; por defecto ancho = 2 bins (lóbulo de Hann)."""
+        ancho = 2 * self.df if ancho is None else ancho
+        return frecuencia - ancho, frecuencia + ancho
+
+    def __repr__(self):
+        return (f"PlanWelch(n={self.n}, fs={self.fs:g}, nperseg={self.nperseg}, "
+                f"segmentos={self.n_segmentos}, Δf={self.df:g} Hz)")
+
+
+@lru_cache(maxsize=32)
+def plan_welch(n, fs, nperseg=None, solapamiento=None, ventana='hann'):
+    """PlanWelch guardado: la segunda llamada con los mismos datos no recalcula nada."""
+    return PlanWelch(n, fs, nperseg, solapamiento, ventana)
+
+
+def welch(x, fs, nperseg=None, solapamiento=None, ventana='hann'):
+    """(f, PSD) como scipy.signal.welch, usando el plan guardado."""
+    x = np.asarray(x, dtype=np.float64)
+    plan = plan_welch(x.shape[-1], fs, nperseg, solapamiento, ventana)
+    return plan.f, plan.psd(x)
+
+
+# =============================================================================
+# POTENCIA POR BANDAS Y SNR
+# =============================================================================
+
+def potencia_banda(f, P, banda):
+    """Σ P(f)·Δf para f en [f1, f2] (P puede ser R × F)."""
+    f1, f2 = banda
+    dentro = (f >= f1) & (f <= f2)
+    return P[..., dentro].sum(axis=-1) * (f[1] - f[0])
+
+
+def potencia_total(f, P):
+    """Σ P(f)·Δf en todo el espectro (≈ varianza de la señal)."""
+    return P.sum(axis=-1) * (f[1] - f[0])
+
+
+def frecuencia_pico(f, P, banda=(0.05, 2.0)):
+    """Frecuencia del máximo de la PSD dentro de 'banda' (una por fila)."""
+    f1, f2 = banda
+    dentro = np.flatnonzero((f >= f1) & (f <= f2))
+    return f[dentro[np.argmax(P[..., dentro], axis=-1)]]
+
+
+def _potencia_en_picos(f, P, picos, ancho):
+    """Potencia en [pico - ancho, pico + ancho] de cada fila (pico distinto por fila)."""
+    picos = np.asarray(picos, dtype=np.float64)
+    dentro = np.abs(f - picos[..., None]) <= ancho + 1e-12
+    return (P * dentro).sum(axis=-1) * (f[1] - f[0])
+
+
+def snr_espectral(limpia, contaminada, fs, frecuencia=None, ancho=None,
+                  busqueda=(0.05, 2.0), nperseg=None, solapamiento=None,
+                  ventana='hann'):
+    """
+    SNR EN FRECUENCIA de señales contaminadas con un artefacto.
+
+    limpia      : (N,) señal pura
+    contaminada : (N,) o (R × N), p. ej. ruido.contaminar(...)['contaminada']
+    frecuencia  : frecuencia del artefacto; None → el pico de la PSD de
+                  (contaminada - limpia) dentro de 'busqueda'
+    ancho       : medio ancho de la banda en Hz (por defecto, 2 bins)
+
+    La energía del artefacto es la de la banda en la PSD de
+    (contaminada - limpia), no la resta de las dos PSD: esa resta deja el
+    término cruzado señal–ruido, que dentro de la banda puede ser negativo
+    y dispara la SNR. Devuelve un diccionario con
+    'snr', 'frecuencia', 'p_senal' y 'p_banda' (arrays si hay R filas).
+    """
+    limpia = np.asarray(limpia, dtype=np.float64)
+    contaminada = np.asarray(contaminada, dtype=np.float64)
+    plan = plan_welch(limpia.shape[-1], fs, nperseg, solapamiento, ventana)
+    ancho = 2 * plan.df if ancho is None else ancho
+
+    P_limpia = plan.psd(limpia)
+    P_ruido = plan.psd(contaminada - limpia)
+    if frecuencia is None:
+        frecuencia = frecuencia_pico(plan.f, P_ruido, busqueda)
+    frecuencia = np.broadcast_to(frecuencia, P_ruido.shape[:-1])
+
+    p_senal = potencia_total(plan.f, P_limpia)
+    p_banda = _potencia_en_picos(plan.f, P_ruido, frecuencia, ancho)
+    with np.errstate(divide='ignore'):
+        snr = 10 * np.log10(p_senal / p_banda)
+    return {'snr': snr, 'frecuencia': frecuencia,
+            'p_senal': p_senal, 'p_banda': p_banda}
+
+
+def snr_bandas(x, fs, frecuencia=None, ancho=None, busqueda=(0.05, 2.0),
+               nperseg=None, solapamiento=None, ventana='hann'):
+    """
+    SNR sin señal de referencia: energía fuera de la banda del artefacto
+    contra la energía dentro de ella, de la PSD de x (N,) o (R × N).
+    Devuelve un diccionario como snr_espectral().
+    """
+    x = np.asarray(x, dtype=np.float64)
+    plan = plan_welch(x.shape[-1], fs, nperseg, solapamiento, ventana)
+    P = plan.psd(x)
+    return _snr_bandas_psd(plan, P, frecuencia, ancho, busqueda)
+
+
+def _snr_bandas_psd(plan, P, frecuencia, ancho, busqueda):
+    ancho = 2 * plan.df if ancho is None else ancho
+    if frecuencia is None:
+        frecuencia = frecuencia_pico(plan.f, P, busqueda)
+    frecuencia = np.broadcast_to(frecuencia, P.shape[:-1])
+    p_banda = _potencia_en_picos(plan.f, P, frecuencia, ancho)
+    p_senal = potencia_total(plan.f, P) - p_banda
+    with np.errstate(divide='ignore'):
+        snr = 10 * np.log10(p_senal / p_banda)
+    return {'snr': snr, 'frecuencia': frecuencia, 'p_senal': p_senal,
+            'p_banda': p_banda}
+
+
+# =============================================================================
+# VENTANAS DESLIZANTES SOBRE EL REGISTRO COMPLETO
+# =============================================================================
+
+def snr_espectral_ventanas(x, fs, ventana_s=10, salto_s=1, frecuencia=None,
+                           ancho=None, busqueda=(0.05, 2.0), inicio=0, fin=None,
+                           nperseg=None, solapamiento=None, ventana='hann',
+                           tam_bloque=TAM_BLOQUE):
+    """
+    SNR POR BANDAS de cada ventana de 'ventana_s' segundos que avanza de a
+    'salto_s' segundos sobre x[inicio:fin] (array, memmap o VistaCanal).
+
+    Todas las ventanas usan el mismo plan. Se leen de a lotes: un tramo
+    contiguo del registro se convierte en una matriz (ventanas × W) sin
+    copiar (sliding_window_view) y se calcula la PSD de todo el lote.
+
+    Devuelve un diccionario de columnas (ver COLUMNAS), como
+    ventanas.estadisticos_ventanas().
+    """
+    W = int(round(ventana_s * fs))
+    H = int(round(salto_s * fs))
+    if W < 1 or H < 1:
+        raise ValueError("La ventana y el salto deben ser de al menos 1 muestra")
+    fin = len(x) if fin is None else min(fin, len(x))
+    n_ventanas = (fin - inicio - W) // H + 1 if fin - inicio >= W else 0
+    plan = plan_welch(W, fs, nperseg, solapamiento, ventana)
+
+    tabla = {c: np.empty(n_ventanas) for c in COLUMNAS}
+    tabla['inicio'] = inicio + np.arange(n_ventanas, dtype=np.int64) * H
+    tabla['t'] = tabla['inicio'] / fs
+    por_lote = max(1, min(ELEMENTOS_LOTE // (plan.n_segmentos * plan.nperseg),
+                          max(1, tam_bloque // H)))
+    for j in range(0, n_ventanas, por_lote):
+        k = min(j + por_lote, n_ventanas)
+        a = inicio + j * H
+        tramo = np.asarray(x[a:a + (k - j - 1) * H + W], dtype=np.float64)
+        lote = sliding_window_view(tramo, W)[::H]
+        r = _snr_bandas_psd(plan, plan.psd(lote), frecuencia, ancho, busqueda)
+        tabla['frecuencia'][j:k] = r['frecuencia']
+        tabla['p_banda'][j:k] = r['p_banda']
+        tabla['p_senal'][j:k] = r['p_senal']
+        tabla['snr'][j:k] = r['snr']
+    return tabla
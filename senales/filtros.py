@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+BANCO DE FILTROS – un filtro para cada tipo de ruido de la Parte C
+
+    artefacto (0.3 Hz + deriva) → pasa-altas Butterworth (0.5 Hz)
+    impulso                     → filtro de Hampel o mediana móvil
+    gaussiano                   → pasa-bajas Butterworth (40 Hz)
+
+Cada filtro tiene dos formas:
+
+  filtrar(x)       → todo el array de una vez (fuera de línea). Los IIR
+                     usan sosfiltfilt (fase cero, sin retardo).
+  procesar(bloque) → por bloques, guardando el estado entre llamadas:
+                     los IIR con sosfilt y su estado zi, la mediana y
+                     Hampel con las últimas muestras del bloque anterior.
+                     Sirve para el registro completo (VistaCanal) o para
+                     los bloques de la DAQ en vivo (CapturaContinua).
+
+La mediana y Hampel por bloques dan exactamente lo mismo que filtrar()
+sobre todo el array (tienen un retardo de ancho//2 muestras, que
+terminar() entrega al final). Los IIR por bloques son causales: igual a
+sosfilt sobre todo el array, con el retardo de grupo del filtro.
+
+evaluar_banco() mide, para cada etapa, la SNR antes y después (con la
+señal limpia como referencia) y la velocidad en muestras/s de las dos
+formas. Para los tres ruidos de la Parte C, con banco_para(tipo):
+
+    python -m senales.filtros 0743 --snr 20 -o filtros.tsv
+=============================================================================
+"""
+
+import argparse
+import sys
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .lectura import abrir_registro
+from .lote import formato_celda
+from .momentos import TAM_BLOQUE
+from .ruido import TIPOS, contaminar, snr_db
+
+
+# =============================================================================
+# FILTROS IIR (secciones de segundo orden)
+# =============================================================================
+
+class FiltroSOS:
+    """
+    FILTRO IIR en secciones de segundo orden (sos de scipy.signal).
+
+    El estado zi se inicia con la primera muestra (como si la señal
+    hubiera estado quieta en ese valor) para no tener un transitorio
+    al arrancar.
+    """
+
+    def __init__(self, sos, nombre='iir'):
+        self.sos = np.asarray(sos, dtype=np.float64)
+        self.nombre = nombre
+        self.retardo = 0
+        self._zi = None
+
+    def reiniciar(self):
+        self._zi = None
+
+    def procesar(self, bloque):
+        from scipy.signal import sosfilt, sosfilt_zi
+
+        bloque = np.asarray(bloque, dtype=np.float64)
+        if bloque.shape[-1] == 0:
+            return bloque.copy()
+        if self._zi is None:
+            zi = sosfilt_zi(self.sos)                   # (secciones × 2)
+            self._zi = zi.reshape(zi.shape[:1] + (1,) * (bloque.ndim - 1)
+                                  + zi.shape[1:]) * bloque[..., :1][None]
+        y, self._zi = sosfilt(self.sos, bloque, axis=-1, zi=self._zi)
+        return y
+
+    def terminar(self):
+        return np.empty(0)
+
+    def filtrar(self, x):
+        from scipy.signal import sosfiltfilt
+        return sosfiltfilt(self.sos, np.asarray(x, dtype=np.float64), axis=-1)
+
+    def __repr__(self):
+        return f"FiltroSOS({self.nombre!r}, {len(self.sos)} secciones)"
+
+
+def pasa_altas(fs, fc=0.5, orden=2):
+    """Quita la deriva de línea base y el artefacto de 0.3 Hz."""
+    from scipy.signal import butter
+    return FiltroSOS(butter(orden, fc, 'highpass', fs=fs, output='sos'),
+                     f'pasa-altas {fc:g} Hz')
+
+
+def pasa_bajas(fs, fc=40.0, orden=4):
+    """Atenúa el ruido gaussiano por encima de la banda del ECG."""
+    from scipy.signal import butter
+    return FiltroSOS(butter(orden, fc, 'lowpass', fs=fs, output='sos'),
+                     f'pasa-bajas {fc:g} Hz')
+
+
+# =============================================================================
+# FILTROS DE VENTANA (mediana móvil y Hampel)
+# =============================================================================
+
+class _FiltroVentana(ABC):
+    """
+    Base de los filtros que miran una ventana centrada de 'ancho' muestras
+    (impar). Los bordes se completan repitiendo la primera y la última
+    muestra, igual por bloques que con todo el array.
+    """
+
+    def __init__(self, ancho, nombre):
+        self.ancho = int(ancho) | 1                     # siempre impar
+        self.mitad = self.ancho // 2
+        self.retardo = self.mitad
+        self.nombre = nombre
+        self.reiniciar()
+
+    def reiniciar(self):
+        self._pendiente = None
+        self._ultima = None
+
+    @abstractmethod
+    def _calcular(self, ventanas):
+        """Una salida por fila de 'ventanas' (... × ancho)."""
+
+    def _salida(self, p):
+        if p.shape[-1] < self.ancho:
+            self._pendiente = p
+            return p[..., :0]
+        y = self._calcular(sliding_window_view(p, self.ancho, axis=-1))
+        self._pendiente = p[..., p.shape[-1] - self.ancho + 1:]
+        return y
+
+    def procesar(self, bloque):
+        """
+        Devuelve las salidas que ya se pueden calcular (las últimas
+        'mitad' muestras esperan al bloque siguiente o a terminar()).
+        """
+        bloque = np.asarray(bloque, dtype=np.float64)
+        if bloque.shape[-1] == 0:
+            return bloque.copy()
+        if self._pendiente is None:
+            self._pendiente = np.repeat(bloque[..., :1], self.mitad, axis=-1)
+        self._ultima = bloque[..., -1:]
+        return self._salida(np.concatenate((self._pendiente, bloque), axis=-1))
+
+    def terminar(self):
+        """Últimas 'mitad' salidas (se completa con la última muestra)."""
+        if self._ultima is None:
+            return np.empty(0)
+        relleno = np.repeat(self._ultima, self.mitad, axis=-1)
+        y = self._salida(np.concatenate((self._pendiente, relleno), axis=-1))
+        self.reiniciar()
+        return y
+
+    def filtrar(self, x):
+        self.reiniciar()
+        y = self.procesar(x)
+        y = np.concatenate((y, self.terminar()), axis=-1)
+        return y
+
+
+class FiltroMediana(_FiltroVentana):
+    """MEDIANA MÓVIL de 'ancho' muestras: borra impulsos aislados."""
+
+    def __init__(self, ancho=5):
+        super().__init__(ancho, f'mediana {int(ancho) | 1}')
+
+    def _calcular(self, ventanas):
+        return np.median(ventanas, axis=-1)
+
+    def __repr__(self):
+        return f"FiltroMediana(ancho={self.ancho})"
+
+
+class FiltroHampel(_FiltroVentana):
+    """
+    FILTRO DE HAMPEL: una muestra se reemplaza por la mediana de su
+    ventana solo si se aleja de ella más de k desviaciones robustas
+
+        |xᵢ - med| > k · 1.4826 · MAD
+
+    Las muestras normales (incluidas las ondas R) quedan intactas.
+    """
+
+    def __init__(self, ancho=11, k=3.0):
+        super().__init__(ancho, f'hampel {int(ancho) | 1}')
+        self.k = k
+
+    def _calcular(self, ventanas):
+        med = np.median(ventanas, axis=-1)
+        mad = np.median(np.abs(ventanas - med[..., None]), axis=-1)
+        centro = ventanas[..., self.mitad]
+        atipico = np.abs(centro - med) > self.k * 1.4826 * mad
+        return np.where(atipico, med, centro)
+
+    def __repr__(self):
+        return f"FiltroHampel(ancho={self.ancho}, k={self.k:g})"
+
+
+# =============================================================================
+# BANCO (filtros en cascada)
+# =============================================================================
+
+class BancoFiltros:
+    """
+    BANCO DE FILTROS en cascada, entre la lectura y los estadísticos:
+
+        banco = BancoFiltros([FiltroHampel(11), pasa_altas(FS)])
+        ecg_f = banco.filtrar(ecg)                 # ventana en memoria
+        ecg_f = filtrar_por_bloques(ecg_completo, banco)  # registro completo
+
+    En vivo: banco.procesar(bloque) dentro de al_bloque de CapturaContinua.
+    """
+
+    def __init__(self, filtros):
+        self.filtros = list(filtros)
+
+    @property
+    def retardo(self):
+        return sum(f.retardo for f in self.filtros)
+
+    def reiniciar(self):
+        for f in self.filtros:
+            f.reiniciar()
+
+    def procesar(self, bloque):
+        y = np.asarray(bloque, dtype=np.float64)
+        for f in self.filtros:
+            y = f.procesar(y)
+        return y
+
+    def terminar(self):
+        """Vacía los retardos de los filtros de ventana, en orden."""
+        y = np.empty(0)
+        for f in self.filtros:
+            # lo que sale de la etapa anterior pasa por esta antes de vaciarla
+            partes = [p for p in (f.procesar(y) if y.size else y, f.terminar())
+                      if p.size]
+            y = np.concatenate(partes, axis=-1) if partes else np.empty(0)
+        return y
+
+    def filtrar(self, x):
+        y = np.asarray(x, dtype=np.float64)
+        for f in self.filtros:
+            y = f.filtrar(y)
+        return y
+
+    def __repr__(self):
+        return f"BancoFiltros({self.filtros!r})"
+
+
+def banco_para(tipo, fs):
+    """Banco recomendado para cada tipo de ruido de la Parte C."""
+    if tipo == 'artefacto':
+        return BancoFiltros([pasa_altas(fs)])
+    if tipo == 'impulso':
+        return BancoFiltros([FiltroHampel(ancho=int(0.011 * fs))])
+    if tipo == 'gaussiano':
+        return BancoFiltros([pasa_bajas(fs)])
+    raise ValueError(f"Tipo de ruido desconocido: {tipo!r}")
+
+
+def filtrar_por_bloques(x, banco, inicio=0, fin=None, tam_bloque=TAM_BLOQUE):
+    """
+    Filtra x[inicio:fin] (array, memmap o VistaCanal) de a tam_bloque
+    muestras con el estado de cada filtro. Devuelve el array filtrado.
+    """
+    fin = len(x) if fin is None else min(fin, len(x))
+    banco.reiniciar()
+    partes = [banco.procesar(x[i:min(i + tam_bloque, fin)])
+              for i in range(inicio, fin, tam_bloque)]
+    partes.append(banco.terminar())
+    return np.concatenate(partes) if partes else np.empty(0)
+
+
+# =============================================================================
+# EVALUACIÓN: MEJORA DE SNR Y VELOCIDAD
+# =============================================================================
+
+def evaluar_banco(limpia, contaminada, banco, tam_bloque=1000, repeticiones=3,
+                  retardo_max=100):
+    """
+    EVALUAR BANCO – SNR antes y después de filtrar y velocidad.
+
+    limpia, contaminada: (N,) misma longitud
+    tam_bloque          : tamaño de bloque de la forma por bloques (1000 =
+                          1 s a 1000 Hz, como los bloques de la DAQ)
+    retardo_max         : los IIR por bloques son causales; su SNR se mide
+                          después de compensar el retardo (en muestras)
+                          que mejor alinea la salida con la señal limpia
+    Devuelve un diccionario:
+      snr_entrada, snr_bloque, snr_flujo, mejora_bloque, mejora_flujo (dB)
+      retardo_flujo (muestras compensadas)
+      muestras_s_bloque, muestras_s_flujo (mejor de 'repeticiones')
+    """
+    limpia = np.asarray(limpia, dtype=np.float64)
+    contaminada = np.asarray(contaminada, dtype=np.float64)
+    N = contaminada.size
+
+    def cronometrar(funcion):
+        mejor = np.inf
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            y = funcion()
+            mejor = min(mejor, time.perf_counter() - t0)
+        return y, N / mejor
+
+    y_bloque, v_bloque = cronometrar(lambda: banco.filtrar(contaminada))
+    y_flujo, v_flujo = cronometrar(
+        lambda: filtrar_por_bloques(contaminada, banco, tam_bloque=tam_bloque))
+
+    snr_entrada = float(snr_db(limpia, contaminada - limpia))
+    snr_bloque = float(snr_db(limpia, y_bloque - limpia))
+    snr_flujo, retardo = _snr_con_retardo(limpia, y_flujo, retardo_max)
+    return {
+        'snr_entrada'      : snr_entrada,
+        'snr_bloque'       : snr_bloque,
+        'snr_flujo'        : snr_flujo,
+        'retardo_flujo'    : retardo,
+        'mejora_bloque'    : snr_bloque - snr_entrada,
+        'mejora_flujo'     : snr_flujo - snr_entrada,
+        'muestras_s_bloque': v_bloque,
+        'muestras_s_flujo' : v_flujo,
+    }
+
+
+def _snr_con_retardo(limpia, y, retardo_max):
+    """
+    SNR de una salida causal después de correrla el retardo (0 a
+    retardo_max muestras) que mejor la alinea con la señal limpia.
+    """
+    N = limpia.size
+    mejor = (-np.inf, 0)
+    for d in range(min(retardo_max, N - 1) + 1):
+        snr = float(snr_db(limpia[:N - d], y[d:] - limpia[:N - d]))
+        mejor = max(mejor, (snr, d))
+    return mejor
+
+
+COLUMNAS = ('registro', 'canal', 'tipo', 'snr_objetivo', 'banco',
+            'snr_entrada', 'snr_bloque', 'snr_flujo', 'retardo_flujo',
+            'mejora_bloque', 'mejora_flujo', 'muestras_s_bloque',
+            'muestras_s_flujo')
+
+
+def evaluar_parte_c(limpia, fs, snrs=(20.0,), tipos=TIPOS, semilla=0,
+                    tam_bloque=1000, repeticiones=3, mostrar=print):
+    """
+    Contamina 'limpia' con cada tipo de ruido y SNR (senales.ruido) y
+    evalúa banco_para(tipo). Devuelve una lista de filas (dict).
+    """
+    limpia = np.asarray(limpia, dtype=np.float64)
+    filas = []
+    for tipo in tipos:
+        for snr in snrs:
+            contaminada = contaminar(limpia, tipo, snr, 1, fs,
+                                     rng=semilla)['contaminada'][0]
+            banco = banco_para(tipo, fs)
+            r = evaluar_banco(limpia, contaminada, banco, tam_bloque,
+                              repeticiones)
+            filas.append(dict(tipo=tipo, snr_objetivo=float(snr),
+                              banco=' + '.join(f.nombre for f in banco.filtros),
+                              **r))
+            mostrar(f"  {tipo:<10} {snr:5g} dB  {filas[-1]['banco']:<18} "
+                    f"SNR {r['snr_entrada']:6.2f} → {r['snr_bloque']:6.2f} dB "
+                    f"(bloques {r['snr_flujo']:6.2f} dB, {r['retardo_flujo']} "
+                    f"muestras)  {r['muestras_s_bloque'] / 1e6:7.2f} / "
+                    f"{r['muestras_s_flujo'] / 1e6:7.2f} M muestras/s")
+    return filas
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.filtros',
+        description='Mejora de SNR y muestras/s del banco de filtros para '
+                    'cada ruido de la Parte C.')
+    p.add_argument('registro', nargs='?', default='0743')
+    p.add_argument('--canal', default='ECG')
+    p.add_argument('--segundos', type=float, default=10)
+    p.add_argument('--inicio', type=float, default=0,
+                   help='inicio de la ventana en segundos')
+    p.add_argument('--snr', type=float, nargs='+', default=[20.0],
+                   help='SNR objetivo en dB')
+    p.add_argument('--tipos', nargs='+', default=list(TIPOS), choices=TIPOS)
+    p.add_argument('--tam-bloque', type=int, default=1000,
+                   help='muestras por bloque de la forma por bloques')
+    p.add_argument('--repeticiones', type=int, default=3)
+    p.add_argument('--semilla', type=int, default=0)
+    p.add_argument('-o', '--salida', default=None,
+                   help='guardar también la tabla (.tsv)')
+    args = p.parse_args(argv)
+
+    registro = abrir_registro(args.registro)
+    fs = registro.fs
+    inicio = int(round(args.inicio * fs))
+    limpia = registro.leer(args.canal, inicio,
+                           inicio + int(round(args.segundos * fs)))
+    filas = evaluar_parte_c(limpia, fs, args.snr, args.tipos, args.semilla,
+                            args.tam_bloque, args.repeticiones)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write('# ' + '\t'.join(COLUMNAS) + '\n')
+            f.write(''.join('\t'.join(formato_celda(dict(
+                fila, registro=registro.ruta, canal=args.canal)[c])
+                for c in COLUMNAS) + '\n' for fila in filas))
+        print(f"Tabla: {args.salida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
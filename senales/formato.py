@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+FORMATO BINARIO DE CAPTURAS (par .dat / .hea de WFDB)
+
+captura_DAQ.py guardaba con np.savetxt(fmt='%.6f', delimiter='\\t') y una
+columna de tiempo que se puede calcular (t = n / Fs): ~200 KB para 10 s de
+un canal, y leerlo de vuelta obliga a interpretar texto.
+
+Aquí las capturas se guardan igual que los registros de PhysioNet:
+
+  captura.dat → enteros de 16 bits (formato 16), canales intercalados
+                muestra por muestra: 2 bytes por muestra y canal (20 KB
+                para 10 s de un canal)
+  captura.hea → cabecera WFDB: Fs, número de muestras, gain/baseline de
+                cada canal y, como comentarios '# Clave: valor', los
+                metadatos de la captura (dispositivo, rango, fecha)
+
+La ganancia se elige para que el rango de la DAQ (V_MIN a V_MAX) ocupe
+los 16 bits completos; con ±5 V el paso es de 0.15 mV, igual a la
+resolución de una DAQ de 16 bits.
+
+Como es WFDB, la captura se abre con senales.lectura.abrir_registro()
+(memory-map, conversión perezosa) igual que 0743.dat, y también con las
+herramientas de PhysioNet.
+=============================================================================
+"""
+
+import os
+
+import numpy as np
+
+from .lectura import leer_cabecera
+
+
+D_MIN = -32767      # -32768 queda reservado como "muestra inválida" en WFDB
+D_MAX =  32767
+
+
+def ganancia_para_rango(v_min, v_max):
+    """gain (adu/V) y baseline para que [v_min, v_max] ocupe los 16 bits."""
+    ganancia = (D_MAX - D_MIN) / (v_max - v_min)
+    base = int(round(-(v_max + v_min) / 2 * ganancia))
+    return ganancia, base
+
+
+class EscritorWFDB:
+    """
+    ESCRITOR WFDB – guarda bloques (n_canales × B) en ruta.dat a medida
+    que llegan y mantiene ruta.hea al día.
+
+        w = EscritorWFDB("senal_capturada_20260219", fs=1000,
+                         v_min=-5, v_max=5, dispositivo="Dev3/ai0")
+        w.escribir(bloque)       # cuantas veces se quiera
+        w.cerrar()               # escribe el número final de muestras
+
+    Si la captura se corta antes de cerrar(), la cabecera inicial (sin
+    número de muestras) sigue sirviendo: abrir_registro() lo deduce del
+    tamaño del .dat.
+
+    anexar=True continúa un registro existente (mismos canales y ganancia).
+    Tiene la misma interfaz que adquisicion.EscritorTexto.
+    """
+
+    def __init__(self, ruta, fs, n_canales=1, v_min=-5, v_max=5,
+                 dispositivo='', marca_tiempo='', nombres=None,
+                 unidades='V', anexar=False):
+        self.ruta = os.path.splitext(ruta)[0] if ruta.endswith(('.dat', '.hea')) \
+            else ruta
+        self.nombre = os.path.basename(self.ruta)
+        self.fs = fs
+        self.n_canales = n_canales
+        self.nombres = list(nombres) if nombres else \
+            (['senal'] if n_canales == 1 else [f'ai{i}' for i in range(n_canales)])
+        self.unidades = unidades
+        self.info = {'Captura DAQ': marca_tiempo, 'Dispositivo': dispositivo,
+                     'Rango': f'{v_min:g} a {v_max:g} {unidades}'}
+        self.ganancia, self.base = ganancia_para_rango(v_min, v_max)
+        self.n = 0
+        self.checksum = np.zeros(n_canales, dtype=np.int64)
+        self.inicial = np.zeros(n_canales, dtype=np.int64)
+
+        if anexar and os.path.exists(self.ruta + '.hea'):
+            self._continuar()
+            modo = 'ab'
+        else:
+            modo = 'wb'
+        self._f = open(self.ruta + '.dat', modo)
+        self._escribir_cabecera()
+
+    def _continuar(self):
+        cab = leer_cabecera(self.ruta + '.hea')
+        if cab['n_senales'] != self.n_canales:
+            raise ValueError(f"{self.ruta}.hea tiene {cab['n_senales']} canales, "
+                             f"no {self.n_canales}")
+        s0 = cab['senales'][0]
+        self.ganancia, self.base = s0['ganancia'], s0['base']
+        self.nombres = [s['descripcion'] for s in cab['senales']]
+        self.info.update(cab.get('info', {}))
+        self.n = os.path.getsize(self.ruta + '.dat') // (2 * self.n_canales)
+        self.checksum[:] = [s['checksum'] for s in cab['senales']]
+        self.inicial[:] = [s['valor_inicial'] for s in cab['senales']]
+
+    def digitalizar(self, bloque):
+        """Valores físicos → enteros de 16 bits (satura en los bordes del rango)."""
+        d = np.rint(np.asarray(bloque, dtype=np.float64) * self.ganancia + self.base)
+        return np.clip(d, D_MIN, D_MAX).astype('<i2')
+
+    def escribir(self, bloque):
+        """bloque: (n_canales × B) o (B,) si hay un solo canal."""
+        bloque = np.asarray(bloque).reshape(self.n_canales, -1)
+        if bloque.shape[1] == 0:
+            return
+        d = self.digitalizar(bloque)
+        if self.n == 0:
+            self.inicial[:] = d[:, 0]
+        self.checksum += d.sum(axis=1, dtype=np.int64)
+        # .T → una fila por instante: canales intercalados como en 0743.dat
+        self._f.write(np.ascontiguousarray(d.T).tobytes())
+        self._f.flush()
+        self.n += bloque.shape[1]
+
+    def _escribir_cabecera(self, n_muestras=None):
+        fs = f'{self.fs:g}'
+        lineas = [f'{self.nombre} {self.n_canales} {fs}'
+                  + ('' if n_muestras is None else f' {n_muestras}')]
+        for i, nombre in enumerate(self.nombres):
+            # checksum WFDB: suma de las muestras en 16 bits con signo
+            chk = int((self.checksum[i] + 32768) % 65536 - 32768)
+            lineas.append(f'{self.nombre}.dat 16 {self.ganancia:.10g}'
+                          f'({self.base})/{self.unidades} 16 0 '
+                          f'{int(self.inicial[i])} {chk} 0 {nombre}')
+        lineas += [f'# {k}: {v}' for k, v in self.info.items() if v != '']
+        temporal = self.ruta + '.hea.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lineas) + '\n')
+        os.replace(temporal, self.ruta + '.hea')
+
+    def cerrar(self):
+        self._f.close()
+        self._escribir_cabecera(self.n)
+
+
+def guardar_wfdb(ruta, datos, fs, **opciones):
+    """
+    Guarda de una vez una señal (n_muestras,) o (n_canales × n_muestras)
+    como par .dat/.hea. Las opciones son las de EscritorWFDB.
+    """
+    datos = np.asarray(datos, dtype=np.float64)
+    datos = datos.reshape(1, -1) if datos.ndim == 1 else datos
+    w = EscritorWFDB(ruta, fs, n_canales=datos.shape[0], **opciones)
+    w.escribir(datos)
+    w.cerrar()
+    return w.ruta
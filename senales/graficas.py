@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+GRÁFICAS SIN PANTALLA Y DIEZMADAS – para corridas largas o por lotes
+
+Dos cosas hacen lentas las gráficas de los scripts:
+
+  1. plt.show() después de cada plt.savefig(): con una ventana abierta el
+     script se detiene hasta que se cierra. guardar_figura() guarda el .png
+     y solo llama a show() si se pide y el backend es interactivo; si no,
+     cierra la figura (en un lote no se acumulan figuras en memoria).
+
+  2. ax.plot(t, ecg) dibuja TODAS las muestras: 933 000 por canal en el
+     registro completo, aunque el eje solo tiene ~1700 píxeles de ancho.
+     graficar_senal() dibuja la envolvente mín/máx por columna de píxeles:
+
+        columna j = muestras [j·k, (j+1)·k)     k = ⌈N / píxeles⌉
+        se dibujan su mínimo y su máximo, en el orden en que ocurren
+
+     La imagen es la misma (cada columna cubre de su mínimo a su máximo,
+     los picos R no se pierden) con 2 puntos por píxel en vez de k. La
+     envolvente se calcula por bloques, sirve para VistaCanal y memmap.
+
+Para muchos registros, una figura por registro en procesos paralelos
+(backend Agg, como senales.lote: a cada proceso solo van ruta y cabecera):
+
+    python -m senales.graficas "autonomic-aging/*.hea" -o graficas
+    python -m senales.graficas 0743 --segundos 60 --inicio 120
+=============================================================================
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .cache import CacheResultados, huella
+from .lectura import RegistroWFDB, abrir_registros, buscar_registros
+from .momentos import TAM_BLOQUE
+
+
+DPI = 150
+COLORES = ('#C62828', '#1565C0', '#2E7D32', '#6A1B9A')
+
+
+# =============================================================================
+# BACKEND
+# =============================================================================
+
+def _sin_pantalla():
+    """En Linux sin DISPLAY/WAYLAND_DISPLAY no hay dónde mostrar ventanas."""
+    return sys.platform.startswith('linux') and \
+        not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def pyplot(sin_pantalla=None):
+    """
+    matplotlib.pyplot con el backend adecuado.
+
+    sin_pantalla = True → Agg (solo archivos, nunca abre ventanas)
+    sin_pantalla = None → Agg si no hay pantalla; si no, el de siempre
+                          (Spyder, Qt, ...)
+    """
+    import matplotlib
+    if sin_pantalla or (sin_pantalla is None and _sin_pantalla()):
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def es_interactivo():
+    """¿El backend actual muestra ventanas? (Agg, pdf, svg... no)"""
+    import matplotlib
+    backend = matplotlib.get_backend().lower()
+    return backend not in ('agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template')
+
+
+def guardar_figura(fig, ruta, dpi=DPI, mostrar=True, cache=None, llave=None):
+    """
+    Guarda la figura y, solo si 'mostrar' y el backend es interactivo,
+    la muestra. En cualquier otro caso la cierra (libera su memoria).
+    Con cache (senales.cache.CacheResultados) y llave, el .png también
+    queda en la caché (ver figura_en_cache).
+    """
+    import matplotlib.pyplot as plt
+
+    fig.savefig(ruta, dpi=dpi, bbox_inches='tight')
+    if cache is not None and llave is not None:
+        cache.guardar_archivo(llave, ruta)
+    if mostrar and es_interactivo():
+        plt.show()
+    else:
+        plt.close(fig)
+    return ruta
+
+
+def figura_en_cache(cache, llave, ruta, mostrar=True):
+    """
+    True si el .png de esa llave se copió de la caché a 'ruta' y no hace
+    falta dibujar la figura. Si se va a mostrar en una ventana (mostrar y
+    backend interactivo) se dibuja siempre.
+    """
+    if cache is None or (mostrar and es_interactivo()):
+        return False
+    return cache.copiar(llave, ruta)
+
+
+# =============================================================================
+# ENVOLVENTE MÍN/MÁX
+# =============================================================================
+
+def decimar_minmax(x, n_pixeles, inicio=0, fin=None, tam_bloque=TAM_BLOQUE):
+    """
+    ENVOLVENTE MÍN/MÁX de x[inicio:fin] (array, memmap o VistaCanal) para
+    un eje de n_pixeles columnas.
+
+    Devuelve (i, y): índices de muestra (relativos a 'inicio') y valores,
+    dos por columna (mínimo y máximo en el orden en que ocurren). Si hay
+    menos de 2 muestras por columna se devuelven todas.
+    """
+    fin = len(x) if fin is None else min(fin, len(x))
+    N = max(fin - inicio, 0)
+    k = -(-N // max(int(n_pixeles), 1))               # muestras por columna
+    if k <= 2:
+        y = np.asarray(x[inicio:fin], dtype=np.float64)
+        return np.arange(N, dtype=np.int64), y
+
+    paso = max(tam_bloque // k, 1) * k                 # bloques de columnas enteras
+    indices, valores = [], []
+    for a in range(inicio, fin, paso):
+        b = min(a + paso, fin)
+        bloque = np.asarray(x[a:b], dtype=np.float64)
+        m = bloque.size // k
+        columnas = [bloque[:m * k].reshape(m, k)] if m else []
+        if bloque.size > m * k:                        # última columna incompleta
+            columnas.append(bloque[m * k:][None])
+        base = a - inicio
+        for c in columnas:
+            i_min = np.argmin(c, axis=1)
+            i_max = np.argmax(c, axis=1)
+            fila = np.arange(c.shape[0])
+            par = np.sort(np.stack((i_min, i_max), axis=1), axis=1)
+            indices.append((base + fila[:, None] * k + par).ravel())
+            valores.append(c[fila[:, None], par].ravel())
+            base += c.size
+    return np.concatenate(indices), np.concatenate(valores)
+
+
+def _pixeles_eje(ax, dpi=DPI):
+    """Ancho del eje en píxeles del .png guardado con 'dpi'."""
+    return max(int(ax.get_position().width * ax.figure.get_figwidth() * dpi), 1)
+
+
+def graficar_senal(ax, x, fs, t0=0.0, inicio=0, fin=None, n_pixeles=None,
+                   dpi=DPI, **estilo):
+    """
+    Reemplazo de ax.plot(t, x, **estilo) con la envolvente mín/máx.
+
+    x      : array, memmap o VistaCanal (se grafica x[inicio:fin])
+    t0     : tiempo de la muestra 'inicio' en segundos
+    n_pixeles = None → ancho del eje en la figura guardada con 'dpi'
+    """
+    n_pixeles = _pixeles_eje(ax, dpi) if n_pixeles is None else n_pixeles
+    i, y = decimar_minmax(x, n_pixeles, inicio, fin)
+    return ax.plot(t0 + i / fs, y, **estilo)
+
+
+# =============================================================================
+# MUCHOS REGISTROS
+# =============================================================================
+
+def figura_registro(ruta, cabecera=None, carpeta='.', segundos=None,
+                    inicio_s=0, ancho=13, alto_canal=3, dpi=DPI, reusar=True):
+    """
+    Una figura con todos los canales de un registro, guardada como
+    <carpeta>/<nombre>.png. Es la función que corre en cada proceso.
+
+    reusar = True → si ya se dibujó con las mismas muestras, parámetros y
+    código (senales.cache), se copia el .png en vez de dibujarlo.
+    """
+    registro = RegistroWFDB(ruta, cabecera)
+    fs = registro.fs
+    inicio = int(round(inicio_s * fs))
+    fin = registro.n_muestras if segundos is None \
+        else min(inicio + int(round(segundos * fs)), registro.n_muestras)
+    png = os.path.join(carpeta, registro.nombre + '.png')
+
+    cache = CacheResultados(activa=reusar)
+    llave = huella([registro.canal(k).digital[inicio:fin]
+                    for k in range(registro.n_senales)], registro.senales,
+                   figura_registro, graficar_senal, decimar_minmax,
+                   nombre=registro.nombre, fs=fs, inicio=inicio,
+                   ancho=ancho, alto_canal=alto_canal, dpi=dpi) if reusar else None
+    if cache.copiar(llave, png):
+        return png
+
+    plt = pyplot(sin_pantalla=True)
+
+    fig, ejes = plt.subplots(registro.n_senales, 1, sharex=True, squeeze=False,
+                             figsize=(ancho, alto_canal * registro.n_senales))
+    fig.suptitle(f"Señal {registro.nombre}  |  {(fin - inicio) / fs:.0f} s  "
+                 f"(Fs={fs:g} Hz)", fontsize=13, fontweight='bold')
+    for k, (ax, info) in enumerate(zip(ejes[:, 0], registro.senales)):
+        graficar_senal(ax, registro.canal(k), fs, inicio / fs, inicio, fin,
+                       dpi=dpi, color=COLORES[k % len(COLORES)], lw=0.8)
+        ax.set_ylabel(f"{info['descripcion']} ({info['unidades']})", fontsize=11)
+        ax.grid(True, alpha=0.3)
+    ejes[-1, 0].set_xlabel("Tiempo (s)", fontsize=11)
+    ejes[-1, 0].set_xlim(inicio / fs, fin / fs)
+    fig.tight_layout()
+    return guardar_figura(fig, png, dpi, mostrar=False, cache=cache, llave=llave)
+
+
+def graficar_lote(origen, carpeta='graficas', segundos=None, inicio_s=0,
+                  dpi=DPI, trabajadores=None, cache=True, mostrar=print):
+    """
+    Figuras de todos los registros de 'origen' (carpeta, glob o lista)
+    en paralelo. Devuelve la lista de .png generados.
+    """
+    registros = abrir_registros(origen, cache=cache)
+    os.makedirs(carpeta, exist_ok=True)
+    mostrar(f"{len(registros)} registros")
+    hechas = []
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        tareas = {pool.submit(figura_registro, r.ruta, r.cabecera, carpeta,
+                              segundos, inicio_s, dpi=dpi, reusar=cache): r
+                  for r in registros}
+        for k, tarea in enumerate(as_completed(tareas), 1):
+            r = tareas[tarea]
+            try:
+                hechas.append(tarea.result())
+            except Exception as e:      # un registro dañado no detiene el lote
+                mostrar(f"  ✗ {r.ruta}: {e}")
+                continue
+            mostrar(f"  [{k}/{len(registros)}] {r.nombre}")
+    return hechas
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.graficas',
+        description='Gráficas (.png, sin pantalla) de muchos registros WFDB.')
+    p.add_argument('registros', nargs='+',
+                   help='registros, carpetas o patrones glob (p. ej. "datos/*.hea")')
+    p.add_argument('-o', '--carpeta', default='graficas')
+    p.add_argument('--segundos', type=float, default=None,
+                   help='longitud de la ventana (por defecto, registro completo)')
+    p.add_argument('--inicio', type=float, default=0,
+                   help='inicio de la ventana en segundos')
+    p.add_argument('--dpi', type=int, default=DPI)
+    p.add_argument('-j', '--trabajadores', type=int, default=None)
+    p.add_argument('--sin-cache', action='store_true',
+                   help='no usar la caché de cabeceras ni la de gráficas '
+                        '(dibujar todo de nuevo)')
+    args = p.parse_args(argv)
+
+    origen = [h for r in args.registros for h in buscar_registros(r)]
+    graficar_lote(origen, args.carpeta, args.segundos, args.inicio, args.dpi,
+                  args.trabajadores, cache=not args.sin_cache)
+    print(f"Gráficas: {os.path.abspath(args.carpeta)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
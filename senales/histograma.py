@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+HISTOGRAMA POR BLOQUES (vectorizado)
+
+histograma_manual() de sin_funciones.py busca min(x) y max(x) con Python
+y después mete cada muestra en su bin con un bucle for. Aquí se hace lo
+mismo con NumPy, de a un bloque de muestras a la vez, y los conteos se
+van sumando. Así se puede sacar el histograma del registro completo
+(933 s) o de una captura de la DAQ sin tener todas las muestras en memoria.
+
+Las reglas son las mismas de histograma_manual():
+    ancho = (x_max - x_min) / n_bins
+    idx   = int((xᵢ - x_min) / ancho)
+    si idx == n_bins → idx = n_bins - 1   (el máximo cae justo en el borde)
+    frec_rel = conteo / N
+
+Los bordes pueden ser fijos (p. ej. el rango de la DAQ, -5 a 5 V) o
+automáticos: en ese caso se hace una primera pasada solo para el mínimo
+y el máximo.
+=============================================================================
+"""
+
+import numpy as np
+
+from .momentos import TAM_BLOQUE
+
+
+class Histograma:
+    """
+    HISTOGRAMA ACUMULABLE de n_bins entre x_min y x_max.
+
+        h = Histograma(60, -5, 5)
+        for bloque in bloques:
+            h.agregar(bloque)
+        centros, frec_rel = h.resultado()
+
+    Las muestras fuera de [x_min, x_max] no entran a ningún bin; se cuentan
+    aparte en 'debajo' y 'encima'.
+    """
+
+    def __init__(self, n_bins, x_min, x_max):
+        if not x_max > x_min:
+            raise ValueError("Se necesita x_max > x_min para el histograma")
+        self.n_bins  = int(n_bins)
+        self.x_min   = float(x_min)
+        self.x_max   = float(x_max)
+        self.ancho   = (self.x_max - self.x_min) / self.n_bins
+        self.conteos = np.zeros(self.n_bins, dtype=np.int64)
+        self.debajo  = 0
+        self.encima  = 0
+
+    @property
+    def n(self):
+        """Total de muestras vistas (incluidas las que quedaron fuera)."""
+        return int(self.conteos.sum()) + self.debajo + self.encima
+
+    def agregar(self, x):
+        """Suma los conteos de un bloque de muestras."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if x.size == 0:
+            return self
+        adentro = (x >= self.x_min) & (x <= self.x_max)
+        self.debajo += int(np.count_nonzero(x < self.x_min))
+        self.encima += int(np.count_nonzero(x > self.x_max))
+        # Mismo cálculo que int((xi - x_min) / ancho) del bucle for
+        idx = ((x[adentro] - self.x_min) / self.ancho).astype(np.int64)
+        idx[idx >= self.n_bins] = self.n_bins - 1
+        self.conteos += np.bincount(idx, minlength=self.n_bins)
+        return self
+
+    def combinar(self, otro):
+        """Histograma de la unión de dos bloques (deben tener los mismos bordes)."""
+        if (otro.n_bins, otro.x_min, otro.x_max) != \
+                (self.n_bins, self.x_min, self.x_max):
+            raise ValueError("Los histogramas tienen bordes distintos")
+        h = Histograma(self.n_bins, self.x_min, self.x_max)
+        h.conteos = self.conteos + otro.conteos
+        h.debajo  = self.debajo + otro.debajo
+        h.encima  = self.encima + otro.encima
+        return h
+
+    @property
+    def bordes(self):
+        return self.x_min + np.arange(self.n_bins + 1) * self.ancho
+
+    @property
+    def centros(self):
+        return self.x_min + (np.arange(self.n_bins) + 0.5) * self.ancho
+
+    def resultado(self):
+        """
+        (centros, frec_rel) con frec_rel = conteo / n, donde n incluye las
+        muestras fuera de [x_min, x_max] (debajo y encima). Con los bordes
+        automáticos no queda ninguna afuera: es igual que histograma_manual()
+        y frec_rel suma 1. Con bordes fijos suma 1 - (debajo + encima) / n.
+        """
+        n = self.n
+        return self.centros, self.conteos / n if n else self.conteos * 0.0
+
+    def densidad(self):
+        """(centros, densidad) como np.histogram(..., density=True)."""
+        total = self.conteos.sum()
+        return self.centros, self.conteos / (total * self.ancho) if total \
+            else self.conteos * 0.0
+
+
+def rango_por_bloques(x, inicio=0, fin=None, tam_bloque=TAM_BLOQUE):
+    """Mínimo y máximo de x[inicio:fin] leyendo por bloques (primera pasada)."""
+    fin = len(x) if fin is None else min(fin, len(x))
+    x_min, x_max = np.inf, -np.inf
+    for i in range(inicio, fin, tam_bloque):
+        b = np.asarray(x[i:min(i + tam_bloque, fin)])
+        x_min = min(x_min, float(b.min()))
+        x_max = max(x_max, float(b.max()))
+    return x_min, x_max
+
+
+def histograma_por_bloques(x, n_bins=60, rango=None, inicio=0, fin=None,
+                           tam_bloque=TAM_BLOQUE):
+    """
+    HISTOGRAMA de x[inicio:fin] (array, memmap o VistaCanal) por bloques.
+
+    rango = (x_min, x_max) fija los bordes; con rango = None se calculan
+    con una primera pasada, igual que min(x)/max(x) en histograma_manual().
+    Devuelve el objeto Histograma (ver .resultado() y .densidad()).
+    """
+    fin = len(x) if fin is None else min(fin, len(x))
+    if rango is None:
+        rango = rango_por_bloques(x, inicio, fin, tam_bloque)
+    h = Histograma(n_bins, *rango)
+    for i in range(inicio, fin, tam_bloque):
+        h.agregar(x[i:min(i + tam_bloque, fin)])
+    return h
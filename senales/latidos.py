@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+DETECCIÓN DE ONDAS R EN TIEMPO REAL (Pan-Tompkins por bloques)
+
+Etapas (Pan & Tompkins, 1985), todas con estado entre bloques:
+
+  1. pasa-banda 5–15 Hz      → deja el QRS, quita onda T y línea base
+  2. derivada de 5 puntos    → pendiente del QRS
+  3. cuadrado                → todo positivo, realza pendientes grandes
+  4. integración móvil 150 ms→ un "lomo" por cada QRS
+  5. umbrales adaptativos sobre los máximos de la integración:
+        SPKI ← 0.125·pico + 0.875·SPKI      (pico de QRS)
+        NPKI ← 0.125·pico + 0.875·NPKI      (pico de ruido)
+        umbral = NPKI + 0.25·(SPKI - NPKI)
+     con periodo refractario de 200 ms y búsqueda hacia atrás (con la
+     mitad del umbral) si pasan 1.66 RR promedio sin latido.
+
+Cada R se ubica en el máximo de |ECG| dentro de la ventana del QRS.
+
+Memoria constante: entre bloques solo se guardan los estados de los
+filtros, las últimas muestras que necesita la integración y la búsqueda
+del R, y el mejor pico de ruido desde el último latido. Un latido sale
+cuando termina su periodo refractario y llega el bloque que lo cierra:
+latencia ≈ 0.4 s + duración del bloque (columna 'latencia').
+
+    detector = DetectorR(fs)
+    for bloque in bloques:                 # registro o DAQ en vivo
+        lat = detector.procesar(bloque)    # {'muestra', 't', 'rr', 'fc', 'latencia'}
+    lat = detector.terminar()
+=============================================================================
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from .momentos import TAM_BLOQUE
+
+
+CAMPOS = ('muestra', 't', 'rr', 'fc', 'latencia')
+
+
+class DetectorR:
+    """
+    DETECTOR DE ONDAS R por bloques.
+
+    fs            : frecuencia de muestreo
+    aprendizaje_s : segundos iniciales para fijar los primeros umbrales
+    refractario_s : separación mínima entre dos latidos
+    integracion_s : ventana de la integración móvil
+    """
+
+    def __init__(self, fs, aprendizaje_s=2.0, refractario_s=0.2,
+                 integracion_s=0.15, banda=(5.0, 15.0)):
+        from scipy.signal import butter
+
+        self.fs = fs
+        self.sos = butter(2, banda, 'bandpass', fs=fs, output='sos')
+        self.W = max(1, int(round(integracion_s * fs)))
+        self.refractario = int(round(refractario_s * fs))
+        self.aprendizaje = int(round(aprendizaje_s * fs))
+        # el QRS en el ECG queda antes del máximo de la integración:
+        # ventana de integración + retardo del pasa-banda (~50 ms)
+        self.busqueda = self.W + int(round(0.05 * fs))
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.n = 0                          # muestras procesadas
+        self._zi = None
+        self._filtrada = np.zeros(4)        # 4 muestras previas (derivada)
+        self._cuadrados = np.zeros(self.W)  # W muestras previas (integración)
+        self._mwi = np.empty(0)             # 2 valores previos (máximos)
+        self._crudo = np.empty(0)           # muestras previas del ECG
+        self._iniciado = False
+        self._max_ap = 0.0
+        self._suma_ap = 0.0
+        self._esperando = []                # candidatos del aprendizaje
+        self.spki = self.npki = 0.0
+        self._pendiente = None              # (i_mwi, valor, i_r)
+        self._mejor_ruido = None
+        self._ultimo = None                 # (i_mwi, i_r) del último latido
+        self._rr = deque(maxlen=8)
+
+    # -------------------------------------------------------------------------
+    # Etapas 1–4 (vectorizadas por bloque)
+    # -------------------------------------------------------------------------
+    def _integrar(self, x):
+        from scipy.signal import sosfilt, sosfilt_zi
+
+        if self._zi is None:
+            self._zi = sosfilt_zi(self.sos) * x[0]
+        f, self._zi = sosfilt(self.sos, x, zi=self._zi)
+        f = np.concatenate((self._filtrada, f))
+        # y[n] = (2x[n] + x[n-1] - x[n-3] - 2x[n-4]) · fs/8
+        d = (2 * f[4:] + f[3:-1] - f[1:-3] - 2 * f[:-4]) * (self.fs / 8)
+        self._filtrada = f[-4:]
+        c = np.concatenate((self._cuadrados, d * d))
+        s = np.cumsum(c)
+        mwi = s[self.W:] - s[:len(d)]          # suma de las últimas W
+        self._cuadrados = c[-self.W:]
+        return mwi / self.W
+
+    def _candidatos(self, mwi, crudo, n0):
+        """Máximos locales de la integración: (i_mwi, valor, i_r)."""
+        m = np.concatenate((self._mwi, mwi))
+        base = n0 - len(self._mwi)
+        i = np.flatnonzero((m[1:-1] > m[:-2]) & (m[1:-1] >= m[2:])) + 1
+        self._mwi = m[-2:]
+        # ECG de donde sale la posición del R
+        x = np.concatenate((self._crudo, crudo))
+        base_x = n0 + len(crudo) - len(x)
+        self._crudo = x[-self.busqueda - 2:]
+        salida = []
+        for k in i:
+            a = max(0, base + k - self.busqueda - base_x)
+            b = base + k + 1 - base_x
+            ventana = x[a:b]
+            if ventana.size == 0:
+                continue
+            r = a + int(np.argmax(np.abs(ventana - np.median(ventana))))
+            salida.append((base + k, float(m[k]), base_x + r))
+        return salida
+
+    # -------------------------------------------------------------------------
+    # Etapa 5 (un paso por candidato, no por muestra)
+    # -------------------------------------------------------------------------
+    @property
+    def umbral(self):
+        return self.npki + 0.25 * (self.spki - self.npki)
+
+    def _emitir(self, latido, salida):
+        i_mwi, valor, i_r = latido
+        rr = np.nan
+        if self._ultimo is not None:
+            rr = i_r - self._ultimo[1]
+            self._rr.append(rr)
+        salida.append((i_r, self.n, rr))
+        self._ultimo = (i_mwi, i_r)
+        self._mejor_ruido = None
+
+    def _buscar_atras(self, ahora, salida):
+        """Si pasaron 1.66 RR sin latido, toma el mejor pico de ruido."""
+        if not self._rr or self._pendiente is not None or self._ultimo is None:
+            return
+        if ahora - self._ultimo[0] <= 1.66 * np.mean(self._rr):
+            return
+        c = self._mejor_ruido
+        if c is not None and c[1] > 0.5 * self.umbral:
+            self.spki = 0.25 * c[1] + 0.75 * self.spki
+            self._emitir(c, salida)
+
+    def _clasificar(self, candidato, salida):
+        i_mwi, valor, _ = candidato
+        p = self._pendiente
+        if p is not None and i_mwi - p[0] > self.refractario:
+            self._emitir(p, salida)
+            self._pendiente = p = None
+        self._buscar_atras(i_mwi, salida)
+
+        if valor > self.umbral:
+            if p is None or valor > p[1]:
+                if p is None and self._ultimo is not None and \
+                        i_mwi - self._ultimo[0] <= self.refractario:
+                    return                      # cola del latido anterior
+                self._pendiente = candidato
+            self.spki = 0.125 * valor + 0.875 * self.spki
+        else:
+            self.npki = 0.125 * valor + 0.875 * self.npki
+            if (self._ultimo is None or i_mwi - self._ultimo[0] > self.refractario) \
+                    and (self._mejor_ruido is None or valor > self._mejor_ruido[1]):
+                self._mejor_ruido = candidato
+
+    # -------------------------------------------------------------------------
+    # Interfaz
+    # -------------------------------------------------------------------------
+    def procesar(self, bloque):
+        """
+        Procesa un bloque de ECG y devuelve los latidos confirmados en él:
+        {'muestra', 't', 'rr' (s), 'fc' (lpm), 'latencia' (s)}.
+        """
+        x = np.asarray(bloque, dtype=np.float64).ravel()
+        salida = []
+        if x.size:
+            n0 = self.n
+            mwi = self._integrar(x)
+            candidatos = self._candidatos(mwi, x, n0)
+            self.n += x.size
+
+            if not self._iniciado:
+                self._max_ap = max(self._max_ap, float(mwi.max()))
+                self._suma_ap += float(mwi.sum())
+                self._esperando.extend(candidatos)
+                if self.n < self.aprendizaje:
+                    return self._resultado(salida)
+                self.spki = self._max_ap / 3
+                self.npki = self._suma_ap / self.n / 2
+                self._iniciado = True
+                candidatos, self._esperando = self._esperando, []
+
+            for c in candidatos:
+                self._clasificar(c, salida)
+            p = self._pendiente
+            if p is not None and self.n - 1 - p[0] > self.refractario:
+                self._emitir(p, salida)
+                self._pendiente = None
+            self._buscar_atras(self.n - 1, salida)
+        return self._resultado(salida)
+
+    def terminar(self):
+        """Entrega el último latido pendiente (fin del registro)."""
+        salida = []
+        if not self._iniciado and self._esperando:
+            self.spki = self._max_ap / 3
+            self.npki = self._suma_ap / max(self.n, 1) / 2
+            self._iniciado = True
+            for c in self._esperando:
+                self._clasificar(c, salida)
+            self._esperando = []
+        if self._pendiente is not None:
+            self._emitir(self._pendiente, salida)
+            self._pendiente = None
+        return self._resultado(salida)
+
+    def _resultado(self, salida):
+        muestra = np.array([s[0] for s in salida], dtype=np.int64)
+        emitido = np.array([s[1] for s in salida], dtype=np.int64)
+        rr = np.array([s[2] for s in salida], dtype=np.float64) / self.fs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fc = 60.0 / rr
+        return {'muestra': muestra, 't': muestra / self.fs, 'rr': rr, 'fc': fc,
+                'latencia': (emitido - muestra) / self.fs}
+
+
+def detectar_r(x, fs, inicio=0, fin=None, tam_bloque=TAM_BLOQUE, **opciones):
+    """
+    DETECTAR R en x[inicio:fin] (array, memmap o VistaCanal) por bloques.
+
+    Devuelve un diccionario con las columnas de CAMPOS (un latido por
+    posición; 'muestra' es relativa a 'inicio') y 'muestras_s', la
+    velocidad alcanzada.
+    """
+    fin = len(x) if fin is None else min(fin, len(x))
+    detector = DetectorR(fs, **opciones)
+    partes = []
+    t0 = time.perf_counter()
+    for i in range(inicio, fin, tam_bloque):
+        partes.append(detector.procesar(x[i:min(i + tam_bloque, fin)]))
+    partes.append(detector.terminar())
+    segundos = time.perf_counter() - t0
+    tabla = {c: np.concatenate([p[c] for p in partes]) for c in CAMPOS}
+    tabla['muestras_s'] = (fin - inicio) / segundos if segundos > 0 else np.inf
+    return tabla
+
+
+def monitor_fc(fs, canal=0, mostrar=print, **opciones):
+    """
+    Función al_bloque para CapturaContinua: detecta R en el canal dado
+    y muestra la frecuencia cardiaca de cada latido nuevo.
+    El detector queda en monitor_fc(...).detector.
+    """
+    detector = DetectorR(fs, **opciones)
+
+    def al_bloque(bloque, captura):
+        lat = detector.procesar(bloque[canal])
+        for t, fc in zip(lat['t'], lat['fc']):
+            if np.isfinite(fc):
+                mostrar(f"  ♥ t={t:8.2f} s   FC={fc:5.1f} lpm")
+
+    al_bloque.detector = detector
+    return al_bloque
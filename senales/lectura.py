@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+LECTURA PEREZOSA DE REGISTROS WFDB (PhysioNet)
+
+Antes los scripts hacían:
+
+    raw = np.fromfile("0743.dat", dtype=np.int16).reshape(-1, 2).astype(np.float64)
+
+Eso carga las 933820 muestras × 2 canales, las copia tres veces y convierte
+todo a unidades físicas aunque solo se analicen 10 segundos.
+
+Aquí el archivo .dat se abre con np.memmap (el sistema operativo lee del
+disco solo las páginas que se usan) y la conversión a unidades físicas
+
+    valor_físico = (valor_digital - baseline) / gain
+
+se hace únicamente sobre el pedazo que se pide. El formato, la ganancia y
+el baseline se leen del archivo .hea, no se escriben a mano.
+=============================================================================
+"""
+
+import glob
+import json
+import os
+
+import numpy as np
+
+
+# Formatos WFDB que se pueden mapear directamente en memoria.
+# (El formato 212 empaqueta 2 muestras en 3 bytes y no se puede mapear.)
+FORMATOS_DTYPE = {
+    '16': np.dtype('<i2'),   # enteros de 16 bits little-endian (0743.dat)
+    '61': np.dtype('>i2'),   # enteros de 16 bits big-endian
+    '80': np.dtype('u1'),    # 8 bits con offset 128
+    '160': np.dtype('<u2'),  # 16 bits con offset 32768
+    '32': np.dtype('<i4'),   # enteros de 32 bits little-endian
+}
+
+# Offset que hay que restar para obtener el valor digital con signo
+OFFSET_FORMATO = {'80': 128, '160': 32768}
+
+GANANCIA_DEFECTO = 200.0     # según la especificación WFDB si gain = 0
+
+# Caché en disco de cabeceras ya interpretadas (se puede cambiar con la
+# variable de entorno SENALES_CACHE)
+RUTA_CACHE = os.environ.get(
+    'SENALES_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'senales'))
+ARCHIVO_CACHE_CABECERAS = 'cabeceras.json'
+
+
+# =============================================================================
+# CABECERA (.hea)
+# =============================================================================
+
+def _leer_ganancia(campo):
+    """
+    Separa el campo 'gain(baseline)/unidades' de una línea de señal.
+    Ejemplo: '19288.4144(-22050)/mv' → (19288.4144, -22050, 'mv')
+    """
+    unidades = 'adu'
+    if '/' in campo:
+        campo, unidades = campo.split('/', 1)
+    base = None
+    if '(' in campo:
+        campo, resto = campo.split('(', 1)
+        base = int(resto.rstrip(')'))
+    ganancia = float(campo) if campo else 0.0
+    if ganancia == 0:
+        ganancia = GANANCIA_DEFECTO
+    return ganancia, base, unidades
+
+
+def leer_cabecera(ruta_hea):
+    """
+    LEER CABECERA – interpreta un archivo .hea de WFDB.
+
+    Línea de registro:  nombre  n_señales  fs  n_muestras
+    Línea por señal  :  archivo  formato  gain(base)/unid  adc_res  adc_zero
+                        valor_inicial  checksum  block_size  descripción
+
+    Devuelve un diccionario con los datos del registro y una lista
+    'senales' con un diccionario por canal. Los comentarios de la forma
+    '# Clave: valor' (p. ej. los que escribe senales.formato) quedan en
+    el diccionario 'info'.
+    """
+    with open(ruta_hea, 'r', encoding='utf-8', errors='replace') as f:
+        todas = [l.strip() for l in f if l.strip()]
+    lineas = [l for l in todas if not l.startswith('#')]
+    info = {}
+    for l in todas:
+        if l.startswith('#') and ':' in l:
+            clave, valor = l.lstrip('#').split(':', 1)
+            info[clave.strip()] = valor.strip()
+
+    campos = lineas[0].split()
+    nombre = campos[0].split('/')[0]
+    n_senales = int(campos[1])
+    fs = float(campos[2].split('/')[0]) if len(campos) > 2 else 250.0
+    if fs.is_integer():
+        fs = int(fs)             # 1000 en vez de 1000.0 para usarlo en recortes
+    n_muestras = int(campos[3]) if len(campos) > 3 else None
+
+    senales = []
+    for linea in lineas[1:1 + n_senales]:
+        c = linea.split()
+        formato = c[1].split('x')[0].split(':')[0]
+        desplazamiento = 0
+        if '+' in formato:
+            formato, desplazamiento = formato.split('+')
+            desplazamiento = int(desplazamiento)
+        ganancia, base, unidades = _leer_ganancia(c[2]) if len(c) > 2 \
+            else (GANANCIA_DEFECTO, None, 'mV')
+        adc_res  = int(c[3]) if len(c) > 3 else 0
+        adc_zero = int(c[4]) if len(c) > 4 else 0
+        senales.append({
+            'archivo'      : c[0],
+            'formato'      : formato,
+            'desplazamiento': desplazamiento,
+            'ganancia'     : ganancia,
+            'base'         : adc_zero if base is None else base,
+            'unidades'     : unidades,
+            'adc_res'      : adc_res,
+            'adc_zero'     : adc_zero,
+            'valor_inicial': int(c[5]) if len(c) > 5 else adc_zero,
+            'checksum'     : int(c[6]) if len(c) > 6 else 0,
+            'block_size'   : int(c[7]) if len(c) > 7 else 0,
+            'descripcion'  : ' '.join(c[8:]) if len(c) > 8 else f'canal{len(senales)}',
+        })
+
+    return {
+        'nombre'    : nombre,
+        'n_senales' : n_senales,
+        'fs'        : fs,
+        'n_muestras': n_muestras,
+        'senales'   : senales,
+        'info'      : info,
+    }
+
+
+# =============================================================================
+# VISTA DE UN CANAL
+# =============================================================================
+
+class VistaCanal:
+    """
+    Canal de un registro que se convierte a unidades físicas solo cuando
+    se recorta. Se usa igual que un array:
+
+        ecg_completo = registro.canal('ECG')     # no lee nada todavía
+        ecg = ecg_completo[:10000]               # convierte 10000 muestras
+
+    El resultado del recorte es un np.ndarray float64 normal.
+    """
+
+    def __init__(self, digital, ganancia, base, unidades='', nombre=''):
+        self.digital  = digital      # columna del memmap (sin copiar)
+        self.ganancia = ganancia
+        self.base     = base
+        self.unidades = unidades
+        self.nombre   = nombre
+
+    def __len__(self):
+        return self.digital.shape[0]
+
+    @property
+    def shape(self):
+        return (len(self),)
+
+    def __getitem__(self, indice):
+        d = np.asarray(self.digital[indice], dtype=np.float64)
+        d -= self.base
+        d /= self.ganancia
+        return d
+
+    def __array__(self, dtype=None, copy=None):
+        x = self[:]
+        return x if dtype is None else x.astype(dtype)
+
+    def __repr__(self):
+        return (f"VistaCanal({self.nombre!r}, {len(self)} muestras, "
+                f"{self.unidades})")
+
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+class RegistroWFDB:
+    """
+    Registro WFDB abierto con np.memmap.
+
+    Atributos: nombre, fs, n_muestras, n_senales, senales (info de la
+    cabecera) y nombres (descripción de cada canal, p. ej. 'ECG', 'NIBP').
+    """
+
+    def __init__(self, ruta, cabecera=None):
+        ruta = os.path.splitext(ruta)[0] if ruta.endswith(('.hea', '.dat')) \
+            else ruta
+        self.ruta     = ruta
+        self.cabecera = cabecera if cabecera is not None \
+            else leer_cabecera(ruta + '.hea')
+        self.nombre    = self.cabecera['nombre']
+        self.fs        = self.cabecera['fs']
+        self.n_senales = self.cabecera['n_senales']
+        self.senales   = self.cabecera['senales']
+        self.nombres   = [s['descripcion'] for s in self.senales]
+        self.info      = self.cabecera.get('info', {})
+        self._mapas    = {}
+        self.n_muestras = self.cabecera['n_muestras']
+        if self.n_muestras is None:
+            self.n_muestras = self._mapa(0).shape[0]
+
+    def _mapa(self, i):
+        """memmap (n_muestras × canales_del_archivo) del archivo del canal i."""
+        archivo = self.senales[i]['archivo']
+        if archivo not in self._mapas:
+            grupo = [s for s in self.senales if s['archivo'] == archivo]
+            formato = grupo[0]['formato']
+            if formato not in FORMATOS_DTYPE:
+                raise ValueError(f"Formato WFDB {formato} no soportado "
+                                 f"para lectura con memmap ({archivo})")
+            if any(s['formato'] != formato for s in grupo):
+                raise ValueError(f"Canales con formatos distintos en {archivo}")
+            dtype  = FORMATOS_DTYPE[formato]
+            ruta_dat = os.path.join(os.path.dirname(self.ruta), archivo)
+            offset = grupo[0]['desplazamiento']
+            n_col  = len(grupo)
+            n_filas = (os.path.getsize(ruta_dat) - offset) // (dtype.itemsize * n_col)
+            if self.cabecera['n_muestras']:
+                n_filas = min(n_filas, self.cabecera['n_muestras'])
+            self._mapas[archivo] = np.memmap(ruta_dat, dtype=dtype, mode='r',
+                                             offset=offset,
+                                             shape=(n_filas, n_col))
+        return self._mapas[archivo]
+
+    def indice(self, canal):
+        """Acepta el número del canal o su descripción ('ECG', 'NIBP')."""
+        if isinstance(canal, str):
+            return self.nombres.index(canal)
+        return int(canal)
+
+    def canal(self, canal):
+        """Devuelve una VistaCanal (conversión perezosa) del canal pedido."""
+        i = self.indice(canal)
+        info = self.senales[i]
+        archivo = info['archivo']
+        col = [s['archivo'] for s in self.senales[:i]].count(archivo)
+        digital = self._mapa(i)[:, col]
+        base = info['base'] + OFFSET_FORMATO.get(info['formato'], 0)
+        return VistaCanal(digital, info['ganancia'], base,
+                          info['unidades'], info['descripcion'])
+
+    def leer(self, canal, inicio=0, fin=None):
+        """Convierte a unidades físicas solo las muestras [inicio, fin)."""
+        return self.canal(canal)[inicio:fin]
+
+    def __repr__(self):
+        return (f"RegistroWFDB({self.nombre!r}, {self.n_senales} señales, "
+                f"fs={self.fs:g} Hz, {self.n_muestras} muestras)")
+
+
+def abrir_registro(ruta, cabecera=None):
+    """
+    ABRIR REGISTRO – abre '0743' (o '0743.hea') sin cargar el .dat.
+
+    Ejemplo:
+        registro = abrir_registro("0743")
+        ecg = registro.leer('ECG', 0, 10 * registro.fs)
+    """
+    return RegistroWFDB(ruta, cabecera)
+
+
+# =============================================================================
+# VARIOS REGISTROS + CACHÉ DE CABECERAS
+# =============================================================================
+# Para recorrer una base de datos completa (1121 sujetos) no vale la pena
+# volver a interpretar miles de .hea en cada corrida. Las cabeceras ya
+# leídas se guardan en un JSON con la ruta absoluta como llave, junto con
+# la fecha de modificación y el tamaño del archivo: si el .hea cambia, se
+# vuelve a leer.
+
+def _firma(ruta_hea):
+    st = os.stat(ruta_hea)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def cargar_cache_cabeceras(directorio=None):
+    """Lee el JSON de cabeceras (diccionario vacío si no existe o está dañado)."""
+    ruta = os.path.join(directorio or RUTA_CACHE, ARCHIVO_CACHE_CABECERAS)
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_cache_cabeceras(cache, directorio=None):
+    """Escribe el JSON de cabeceras de forma atómica (archivo temporal + replace)."""
+    directorio = directorio or RUTA_CACHE
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, ARCHIVO_CACHE_CABECERAS)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(temporal, ruta)
+
+
+def leer_cabeceras(rutas_hea, cache=True, directorio_cache=None):
+    """
+    LEER CABECERAS – interpreta varios .hea usando la caché en disco.
+
+    Solo se leen los archivos nuevos o modificados; la caché se escribe
+    una sola vez al final. Con cache=False se leen todos sin tocar el disco.
+    Devuelve una lista de cabeceras en el mismo orden que rutas_hea.
+    """
+    if not cache:
+        return [leer_cabecera(r) for r in rutas_hea]
+
+    datos = cargar_cache_cabeceras(directorio_cache)
+    cambio = False
+    cabeceras = []
+    for ruta in rutas_hea:
+        llave = os.path.abspath(ruta)
+        firma = _firma(ruta)
+        entrada = datos.get(llave)
+        if entrada is None or entrada['firma'] != firma:
+            entrada = {'firma': firma, 'cabecera': leer_cabecera(ruta)}
+            datos[llave] = entrada
+            cambio = True
+        cabeceras.append(entrada['cabecera'])
+
+    if cambio:
+        guardar_cache_cabeceras(datos, directorio_cache)
+    return cabeceras
+
+
+def buscar_registros(origen):
+    """
+    Convierte 'origen' en una lista de rutas .hea. Acepta:
+      - una carpeta          → todos los .hea que contiene
+      - un patrón glob       → p. ej. "datos/*.hea" o "datos/07*"
+      - una lista de rutas   → '0743', '0743.hea', ...
+    """
+    explicito = not isinstance(origen, (str, os.PathLike))
+    if explicito:
+        rutas = [os.fspath(r) for r in origen]
+    else:
+        origen = os.fspath(origen)
+        if os.path.isdir(origen):
+            origen = os.path.join(origen, '*.hea')
+        explicito = not glob.has_magic(origen)
+        rutas = [origen] if explicito else sorted(glob.glob(origen))
+
+    hea = [os.path.splitext(r)[0] + '.hea' if r.endswith(('.hea', '.dat'))
+           else r + '.hea' for r in rutas]
+    if not explicito:
+        hea = [h for h in hea if os.path.exists(h)]
+    return list(dict.fromkeys(hea))
+
+
+def abrir_registros(origen, cache=True, directorio_cache=None):
+    """
+    ABRIR REGISTROS – abre N registros de una sola vez.
+
+    Ejemplo:
+        for registro in abrir_registros("autonomic-aging/"):
+            ecg = registro.canal('ECG')[:10 * registro.fs]
+
+    Ningún .dat se lee aquí: cada registro entrega vistas perezosas de sus
+    canales. Las cabeceras salen de la caché cuando no han cambiado.
+    """
+    rutas = buscar_registros(origen)
+    cabeceras = leer_cabeceras(rutas, cache, directorio_cache)
+    return [RegistroWFDB(r, c) for r, c in zip(rutas, cabeceras)]
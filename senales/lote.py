@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+PROCESAMIENTO POR LOTES – estadísticos de la Parte A para muchos registros
+
+Uso (desde la carpeta del proyecto):
+
+    python -m senales.lote "autonomic-aging/*.hea" -o resultados.tsv
+    python -m senales.lote 0743 --segundos 10 --trabajadores 4
+
+Cada registro se procesa en un proceso distinto (ProcessPoolExecutor).
+A los procesos NO se les mandan arrays: solo la ruta del registro y su
+cabecera ya interpretada. Cada proceso abre el .dat con np.memmap, así que
+los datos pasan por la caché de páginas del sistema operativo y no por
+pickle.
+
+La salida es un archivo de texto separado por tabulaciones con una fila
+por registro y canal. Cada fila se escribe apenas termina su registro;
+si la corrida se interrumpe, al volver a lanzarla se saltan los registros
+que ya están en el archivo (reanudación).
+=============================================================================
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .calidad import VENTANA_S, calidad_registro, segmentos_buenos
+from .lectura import RegistroWFDB, abrir_registros, buscar_registros
+from .momentos import combinar_momentos, momentos_por_bloques
+
+
+COLUMNAS = ('registro', 'canal', 'unidades', 'fs', 'inicio', 'n',
+            'media', 'desv_estandar', 'varianza', 'coef_variacion',
+            'asimetria', 'curtosis', 'minimo', 'maximo')
+
+
+def estadisticos_registro(ruta, cabecera=None, segundos=None, inicio_s=0,
+                          ddof_forma=1, solo_buenas=False):
+    """
+    Estadísticos de la Parte A de todos los canales de un registro.
+
+    segundos = None → registro completo; si no, la ventana
+    [inicio_s, inicio_s + segundos). Devuelve una lista de filas (dict).
+    Esta función es la que corre dentro de cada proceso del lote.
+
+    solo_buenas = True → solo las ventanas que senales.calidad marca como
+    buenas en TODOS los canales ('n' cuenta solo esas muestras).
+    """
+    registro = RegistroWFDB(ruta, cabecera)
+    fs = registro.fs
+    inicio = int(round(inicio_s * fs))
+    fin = None if segundos is None else inicio + int(round(segundos * fs))
+
+    tramos = [(inicio, fin)]
+    if solo_buenas:
+        ventana_s = VENTANA_S if segundos is None else min(VENTANA_S, segundos)
+        calidad = calidad_registro(registro, ventana_s=ventana_s, inicio=inicio,
+                                   fin=fin)
+        tabla = calidad[registro.nombres[0]]
+        tramos = segmentos_buenos(tabla['inicio'], calidad['buena'],
+                                  int(round(ventana_s * fs)))
+
+    filas = []
+    for i, info in enumerate(registro.senales):
+        canal = registro.canal(i)
+        m = combinar_momentos(momentos_por_bloques(canal, a, b) for a, b in tramos)
+        fila = {'registro': ruta, 'canal': info['descripcion'],
+                'unidades': info['unidades'], 'fs': fs, 'inicio': inicio}
+        fila.update(m.estadisticos(ddof_forma))
+        filas.append(fila)
+    return filas
+
+
+# =============================================================================
+# ARCHIVO DE RESULTADOS (con reanudación)
+# =============================================================================
+
+def registros_terminados(ruta_salida, canales=None):
+    """
+    Lee un archivo de resultados existente y devuelve el conjunto de
+    registros que ya tienen filas.
+
+    Si la corrida anterior se interrumpió a mitad de una escritura, la
+    última línea puede estar cortada y el último registro incompleto. Con
+    'canales' (diccionario registro → número de canales) las filas de los
+    registros incompletos se borran del archivo para volver a calcularlos.
+    """
+    if not os.path.exists(ruta_salida):
+        return set()
+
+    with open(ruta_salida, 'r', encoding='utf-8', newline='') as f:
+        lineas = f.read().split('\n')
+    # lo que sigue al último '\n' es una línea cortada (o '' si no hay)
+    lineas = lineas[:-1]
+
+    filas = {}
+    for linea in lineas:
+        campos = linea.split('\t')
+        if linea.startswith('#') or len(campos) != len(COLUMNAS):
+            continue
+        filas[campos[0]] = filas.get(campos[0], 0) + 1
+
+    canales = canales or {}
+    incompletos = {r for r, k in filas.items() if k < canales.get(r, k)}
+    validas = [l for l in lineas
+               if l.startswith('#') or (len(l.split('\t')) == len(COLUMNAS)
+                                        and l.split('\t', 1)[0] not in incompletos)]
+    if len(validas) != len(lineas) or incompletos:
+        with open(ruta_salida, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(l + '\n' for l in validas)
+    else:
+        # solo se quita la línea cortada del final (si la había)
+        with open(ruta_salida, 'r+', encoding='utf-8', newline='') as f:
+            f.truncate(sum(len(l.encode('utf-8')) + 1 for l in lineas))
+    return set(filas) - incompletos
+
+
+def formato_celda(valor):
+    """Texto de una celda de las tablas .tsv (floats con 10 cifras)."""
+    if isinstance(valor, float):
+        return f"{valor:.10g}"
+    return str(valor)
+
+
+def escribir_filas(f, filas):
+    """Agrega filas al archivo y las fuerza al disco (sobreviven a un fallo)."""
+    f.write(''.join('\t'.join(formato_celda(fila[c]) for c in COLUMNAS) + '\n'
+                    for fila in filas))
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def procesar_lote(origen, ruta_salida, segundos=None, inicio_s=0,
+                  ddof_forma=1, trabajadores=None, cache=True,
+                  reanudar=True, solo_buenas=False, mostrar=print):
+    """
+    PROCESAR LOTE – reparte los registros de 'origen' entre procesos.
+
+    origen: carpeta, patrón glob o lista de registros (ver
+    lectura.buscar_registros). Devuelve el número de registros procesados
+    en esta corrida.
+    """
+    registros = abrir_registros(origen, cache=cache)
+    hechos = registros_terminados(
+        ruta_salida, {r.ruta: r.n_senales for r in registros}) \
+        if reanudar else set()
+    pendientes = [r for r in registros if r.ruta not in hechos]
+    mostrar(f"{len(registros)} registros, {len(registros) - len(pendientes)} "
+            f"ya procesados, {len(pendientes)} pendientes")
+    if not pendientes:
+        return 0
+
+    nuevo = not (reanudar and os.path.exists(ruta_salida))
+    with open(ruta_salida, 'w' if nuevo else 'a', encoding='utf-8') as f:
+        if nuevo:
+            f.write('# ' + '\t'.join(COLUMNAS) + '\n')
+        with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+            tareas = {pool.submit(estadisticos_registro, r.ruta, r.cabecera,
+                                  segundos, inicio_s, ddof_forma,
+                                  solo_buenas): r
+                      for r in pendientes}
+            for k, tarea in enumerate(as_completed(tareas), 1):
+                r = tareas[tarea]
+                try:
+                    filas = tarea.result()
+                except Exception as e:      # un registro dañado no detiene el lote
+                    mostrar(f"  ✗ {r.ruta}: {e}")
+                    continue
+                escribir_filas(f, filas)
+                mostrar(f"  [{k}/{len(pendientes)}] {r.nombre}")
+    return len(pendientes)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.lote',
+        description='Estadísticos de la Parte A para muchos registros WFDB.')
+    p.add_argument('registros', nargs='+',
+                   help='registros, carpetas o patrones glob (p. ej. "datos/*.hea")')
+    p.add_argument('-o', '--salida', default='resultados_lote.tsv',
+                   help='archivo de resultados (se reanuda si ya existe)')
+    p.add_argument('--segundos', type=float, default=None,
+                   help='longitud de la ventana (por defecto, registro completo)')
+    p.add_argument('--inicio', type=float, default=0,
+                   help='inicio de la ventana en segundos')
+    p.add_argument('--ddof-forma', type=int, default=1, choices=(0, 1),
+                   help='1 = fórmulas de sin_funciones, 0 = convención de SciPy')
+    p.add_argument('-j', '--trabajadores', type=int, default=None,
+                   help='número de procesos (por defecto, uno por núcleo)')
+    p.add_argument('--sin-cache', action='store_true',
+                   help='no usar la caché de cabeceras')
+    p.add_argument('--desde-cero', action='store_true',
+                   help='ignorar resultados anteriores y empezar de nuevo')
+    p.add_argument('--solo-buenas', action='store_true',
+                   help='saltar las ventanas malas (saturadas, planas, sin '
+                        'picos R; ver senales.calidad)')
+    args = p.parse_args(argv)
+
+    origen = [h for r in args.registros for h in buscar_registros(r)]
+
+    procesar_lote(origen, args.salida, args.segundos, args.inicio,
+                  args.ddof_forma, args.trabajadores,
+                  cache=not args.sin_cache, reanudar=not args.desde_cero,
+                  solo_buenas=args.solo_buenas)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+MOMENTOS EN UNA SOLA PASADA
+
+En sin_funciones.py cada estadístico recorre la lista completa y además
+llama a los otros: curtosis() llama a media() y a desv_estandar(), que
+llama a varianza(), que vuelve a llamar a media()... Para los seis
+estadísticos eso son unas 15 pasadas con bucles for.
+
+Aquí se recorre la señal UNA sola vez y se actualizan al mismo tiempo:
+
+    n      número de muestras
+    media  M1 (media acumulada, método de Welford)
+    M2     Σ (xᵢ - μ)²
+    M3     Σ (xᵢ - μ)³
+    M4     Σ (xᵢ - μ)⁴
+
+con las fórmulas de actualización de Welford / Pébay (numéricamente
+estables: no se restan sumas grandes). Con esas cinco cantidades salen
+media, varianza, desviación, CV, asimetría y curtosis.
+
+Hay dos versiones que dan el mismo resultado (hasta el redondeo):
+  - Momentos             → Python puro, muestra por muestra (desde cero)
+  - momentos_numpy(x)    → vectorizada con NumPy
+
+MOMENTOS PARCIALES: un objeto Momentos calculado sobre un bloque se puede
+combinar exactamente con el de otro bloque (fórmulas de Chan / Pébay).
+Así los estadísticos del registro completo (933 s) o de muchos registros
+se arman por pedazos, leídos del disco uno a la vez o calculados en
+procesos distintos, sin tener toda la señal en memoria.
+=============================================================================
+"""
+
+import math
+
+import numpy as np
+
+
+class Momentos:
+    """
+    ACUMULADOR DE MOMENTOS – se alimenta muestra por muestra.
+
+        m = Momentos()
+        for xi in x:
+            m.agregar(xi)
+        m.estadisticos()   → diccionario con los seis estadísticos
+    """
+
+    CAMPOS = ('n', 'media', 'M2', 'M3', 'M4', 'minimo', 'maximo')
+
+    def __init__(self, n=0, media=0.0, M2=0.0, M3=0.0, M4=0.0,
+                 minimo=math.inf, maximo=-math.inf):
+        self.n      = n
+        self.media  = media
+        self.M2     = M2
+        self.M3     = M3
+        self.M4     = M4
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def agregar(self, xi):
+        """Actualiza los momentos con una muestra nueva (Welford / Pébay)."""
+        n1 = self.n
+        self.n = n = n1 + 1
+        delta   = xi - self.media
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        termino = delta * delta_n * n1
+
+        self.media += delta_n
+        # El orden importa: M4 usa M3 y M2 viejos, M3 usa M2 viejo
+        self.M4 += (termino * delta_n2 * (n * n - 3 * n + 3)
+                    + 6 * delta_n2 * self.M2 - 4 * delta_n * self.M3)
+        self.M3 += termino * delta_n * (n - 2) - 3 * delta_n * self.M2
+        self.M2 += termino
+        if xi < self.minimo:
+            self.minimo = xi
+        if xi > self.maximo:
+            self.maximo = xi
+
+    def actualizar(self, x):
+        """Agrega todas las muestras de x (lista, array o generador)."""
+        for xi in x:
+            self.agregar(xi)
+        return self
+
+    @classmethod
+    def desde_array(cls, x):
+        """Momentos parciales de un bloque, calculados con NumPy."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if x.size == 0:
+            return cls()
+        mu = x.mean()
+        d  = x - mu
+        d2 = d * d
+        return cls(int(x.size), float(mu), float(d2.sum()),
+                   float((d2 * d).sum()), float((d2 * d2).sum()),
+                   float(x.min()), float(x.max()))
+
+    def combinar(self, otro):
+        """
+        COMBINAR – momentos de la unión de dos bloques (Chan / Pébay).
+
+        Con δ = μb - μa y N = Na + Nb:
+          μ  = μa + δ·Nb/N
+          M2 = M2a + M2b + δ²·Na·Nb/N
+          M3 = M3a + M3b + δ³·Na·Nb·(Na-Nb)/N² + 3δ·(Na·M2b - Nb·M2a)/N
+          M4 = M4a + M4b + δ⁴·Na·Nb·(Na²-Na·Nb+Nb²)/N³
+               + 6δ²·(Na²·M2b + Nb²·M2a)/N² + 4δ·(Na·M3b - Nb·M3a)/N
+        Devuelve un objeto nuevo; no modifica ninguno de los dos.
+        """
+        na, nb = self.n, otro.n
+        if na == 0:
+            return otro.copia()
+        if nb == 0:
+            return self.copia()
+        n  = na + nb
+        d  = otro.media - self.media
+        d2 = d * d
+        nanb = na * nb
+
+        media = self.media + d * nb / n
+        M2 = self.M2 + otro.M2 + d2 * nanb / n
+        M3 = (self.M3 + otro.M3 + d2 * d * nanb * (na - nb) / (n * n)
+              + 3 * d * (na * otro.M2 - nb * self.M2) / n)
+        M4 = (self.M4 + otro.M4
+              + d2 * d2 * nanb * (na * na - nanb + nb * nb) / (n * n * n)
+              + 6 * d2 * (na * na * otro.M2 + nb * nb * self.M2) / (n * n)
+              + 4 * d * (na * otro.M3 - nb * self.M3) / n)
+        return Momentos(n, media, M2, M3, M4,
+                        min(self.minimo, otro.minimo),
+                        max(self.maximo, otro.maximo))
+
+    __add__ = combinar
+
+    def copia(self):
+        return Momentos(*(getattr(self, c) for c in self.CAMPOS))
+
+    def a_dict(self):
+        """Diccionario simple (se puede guardar en JSON o mandar a otro proceso)."""
+        return {c: getattr(self, c) for c in self.CAMPOS}
+
+    @classmethod
+    def desde_dict(cls, d):
+        return cls(*(d[c] for c in cls.CAMPOS))
+
+    def estadisticos(self, ddof_forma=1):
+        """Ver estadisticos_desde_momentos(). Agrega también mínimo y máximo."""
+        est = estadisticos_desde_momentos(self.n, self.media, self.M2,
+                                          self.M3, self.M4, ddof_forma)
+        est['minimo'] = self.minimo
+        est['maximo'] = self.maximo
+        return est
+
+    def __repr__(self):
+        return (f"Momentos(n={self.n}, media={self.media:.6g}, "
+                f"M2={self.M2:.6g}, M3={self.M3:.6g}, M4={self.M4:.6g})")
+
+
+def estadisticos_desde_momentos(n, media, M2, M3, M4, ddof_forma=1):
+    """
+    ESTADÍSTICOS A PARTIR DE LOS MOMENTOS CENTRALES.
+
+      varianza  s² = M2 / (N-1)
+      asimetría g₁ = (M3/N) / σ³
+      curtosis  g₂ = (M4/N) / σ⁴ - 3
+
+    ddof_forma elige la σ de asimetría y curtosis:
+      1 → σ = s muestral (igual que asimetria()/curtosis() de sin_funciones)
+      0 → σ poblacional  (igual que stats.skew()/stats.kurtosis() de SciPy)
+    """
+    varianza = M2 / (n - 1) if n > 1 else float('nan')
+    s = math.sqrt(varianza)
+    cv = (s / abs(media)) * 100.0 if media != 0 else float('inf')
+
+    var_forma = M2 / (n - ddof_forma) if n > ddof_forma else float('nan')
+    if var_forma > 0:
+        g1 = (M3 / n) / var_forma ** 1.5
+        g2 = (M4 / n) / var_forma ** 2 - 3
+    else:
+        g1 = g2 = float('nan')
+
+    return {
+        'n'             : n,
+        'media'         : media,
+        'desv_estandar' : s,
+        'varianza'      : varianza,
+        'coef_variacion': cv,
+        'asimetria'     : g1,
+        'curtosis'      : g2,
+    }
+
+
+def momentos_una_pasada(x, ddof_forma=1):
+    """Los seis estadísticos de x recorriéndola una sola vez (Python puro)."""
+    return Momentos().actualizar(x).estadisticos(ddof_forma)
+
+
+def momentos_numpy(x, ddof_forma=1):
+    """
+    Versión vectorizada: mismos estadísticos que momentos_una_pasada(),
+    pero las sumas las hace NumPy sobre el array completo.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    mu = x.mean()
+    d  = x - mu
+    d2 = d * d
+    M2 = d2.sum()
+    M3 = (d2 * d).sum()
+    M4 = (d2 * d2).sum()
+    est = estadisticos_desde_momentos(x.size, float(mu), float(M2),
+                                      float(M3), float(M4), ddof_forma)
+    # mismas llaves que Momentos.estadisticos() (±inf sin muestras)
+    est['minimo'] = float(x.min()) if x.size else math.inf
+    est['maximo'] = float(x.max()) if x.size else -math.inf
+    return est
+
+
+# =============================================================================
+# POR BLOQUES
+# =============================================================================
+
+TAM_BLOQUE = 1 << 16    # 65536 muestras por bloque (~0.5 MB en float64)
+
+
+def combinar_momentos(partes):
+    """Combina una lista (o generador) de Momentos parciales en uno solo."""
+    total = Momentos()
+    for p in partes:
+        total = total.combinar(p)
+    return total
+
+
+def momentos_por_bloques(x, inicio=0, fin=None, tam_bloque=TAM_BLOQUE):
+    """
+    Momentos de x[inicio:fin] leyendo de a tam_bloque muestras.
+
+    x puede ser un array, un np.memmap o una VistaCanal de
+    senales.lectura: solo hay un bloque en memoria a la vez.
+    """
+    fin = len(x) if fin is None else min(fin, len(x))
+    return combinar_momentos(Momentos.desde_array(x[i:min(i + tam_bloque, fin)])
+                             for i in range(inicio, fin, tam_bloque))
+
+
+# =============================================================================
+# VARIOS CANALES A LA VEZ
+# =============================================================================
+
+class MomentosCanales:
+    """
+    MOMENTOS DE VARIOS CANALES que avanzan juntos (captura multicanal).
+
+    Misma idea que Momentos, pero media, M2, M3, M4, mínimo y máximo son
+    arrays con una posición por canal, y cada bloque (n_canales × B) se
+    agrega con operaciones de NumPy a lo largo del eje de muestras: no hay
+    bucle por canal. n es un solo número (todos los canales tienen las
+    mismas muestras).
+
+        m = MomentosCanales(2)
+        m.agregar_bloque(bloque)      # (2 × B)
+        m.estadisticos()              # una lista con un diccionario por canal
+        m[0]                          # Momentos del canal 0
+    """
+
+    def __init__(self, n_canales):
+        self.n_canales = int(n_canales)
+        self.n      = 0
+        self.media  = np.zeros(self.n_canales)
+        self.M2     = np.zeros(self.n_canales)
+        self.M3     = np.zeros(self.n_canales)
+        self.M4     = np.zeros(self.n_canales)
+        self.minimo = np.full(self.n_canales, math.inf)
+        self.maximo = np.full(self.n_canales, -math.inf)
+
+    def agregar_bloque(self, bloque):
+        """Combina (Chan / Pébay, ver Momentos.combinar) un bloque (n_canales × B)."""
+        x = np.asarray(bloque, dtype=np.float64).reshape(self.n_canales, -1)
+        nb = x.shape[1]
+        if nb == 0:
+            return self
+        mu_b = x.mean(axis=1)
+        d = x - mu_b[:, None]
+        d2 = d * d
+        M2b = d2.sum(axis=1)
+        M3b = (d2 * d).sum(axis=1)
+        M4b = (d2 * d2).sum(axis=1)
+
+        na = self.n
+        n = na + nb
+        delta = mu_b - self.media
+        delta2 = delta * delta
+        nanb = na * nb
+        self.M4 = (self.M4 + M4b
+                   + delta2 * delta2 * nanb * (na * na - nanb + nb * nb) / (n * n * n)
+                   + 6 * delta2 * (na * na * M2b + nb * nb * self.M2) / (n * n)
+                   + 4 * delta * (na * M3b - nb * self.M3) / n)
+        self.M3 = (self.M3 + M3b + delta2 * delta * nanb * (na - nb) / (n * n)
+                   + 3 * delta * (na * M2b - nb * self.M2) / n)
+        self.M2 = self.M2 + M2b + delta2 * nanb / n
+        self.media = self.media + delta * nb / n
+        self.n = n
+        np.minimum(self.minimo, x.min(axis=1), out=self.minimo)
+        np.maximum(self.maximo, x.max(axis=1), out=self.maximo)
+        return self
+
+    def __getitem__(self, canal):
+        return Momentos(self.n, float(self.media[canal]), float(self.M2[canal]),
+                        float(self.M3[canal]), float(self.M4[canal]),
+                        float(self.minimo[canal]), float(self.maximo[canal]))
+
+    def __len__(self):
+        return self.n_canales
+
+    def estadisticos(self, ddof_forma=1):
+        """Lista con los estadísticos de cada canal (ver Momentos.estadisticos)."""
+        return [self[c].estadisticos(ddof_forma) for c in range(self.n_canales)]
+
+    def __repr__(self):
+        return f"MomentosCanales(n_canales={self.n_canales}, n={self.n})"
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+PRESIÓN LATIDO A LATIDO (canal NIBP) por bloques
+
+Los scripts de la Parte A resumen el NIBP con media, desviación,
+asimetría y curtosis de 10 s. Aquí la onda de pulso se parte en latidos y
+de cada uno sale:
+
+    sistólica  = máximo de la presión en el latido            [mmHg]
+    diastólica = mínimo de la presión en el latido            [mmHg]
+    media (PAM)= promedio de la presión en todo el ciclo      [mmHg]
+    pulso      = sistólica - diastólica
+
+¿Dónde empieza cada latido?
+  - con ondas R del ECG (senales.latidos): de una R a la siguiente, así
+    cada latido de presión queda alineado con su QRS;
+  - sin ECG: en el pie de la onda de pulso, detectado con la función
+    suma de pendientes (SSF, Zong et al. 2003):
+        SSF[n] = Σ max(Δp, 0) en los últimos 128 ms
+    un latido empieza cuando SSF cruza el umbral (60 % de la mediana de
+    los últimos picos de SSF); el pie es el mínimo de la presión en los
+    300 ms anteriores.
+
+Por bloques y con memoria acotada: solo se guardan las muestras desde el
+inicio del latido abierto (como mucho max_latido_s) y unos pocos números
+de estado. Cada latido sale en cuanto llega el inicio del siguiente.
+=============================================================================
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from .momentos import TAM_BLOQUE
+
+
+CAMPOS = ('inicio', 't', 'duracion', 'sistolica', 'diastolica', 'media',
+          'pulso', 't_sistolica', 't_diastolica')
+
+
+class SegmentadorPulso:
+    """
+    SEGMENTADOR DE LA ONDA DE PULSO por bloques.
+
+        seg = SegmentadorPulso(fs)
+        lat = seg.procesar(bloque)                 # pies detectados con SSF
+        lat = seg.procesar(bloque, marcas=r)       # o latidos de R a R
+
+    'marcas' son índices absolutos de muestra (p. ej. detector.procesar(
+    bloque_ecg)['muestra']); pueden llegar con retraso respecto a la
+    presión, las muestras se guardan hasta que llegue la marca siguiente.
+    """
+
+    def __init__(self, fs, aprendizaje_s=5.0, refractario_s=0.3,
+                 ventana_ssf_s=0.128, pie_s=0.3, max_latido_s=3.0,
+                 fc_pasa_bajas=16.0):
+        from scipy.signal import butter
+
+        self.fs = fs
+        self.sos = butter(2, fc_pasa_bajas, 'lowpass', fs=fs, output='sos')
+        self.w = max(1, int(round(ventana_ssf_s * fs)))
+        self.refractario = int(round(refractario_s * fs))
+        self.aprendizaje = int(round(aprendizaje_s * fs))
+        self.pie = int(round(pie_s * fs))
+        self.max_latido = int(round(max_latido_s * fs))
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.n = 0
+        self._x = np.empty(0)           # presión desde la muestra _base
+        self._base = 0
+        self._marca = None              # inicio del latido abierto
+        self._pendientes = []           # marcas que aún no tienen presión
+        self._modo_marcas = False
+        # SSF
+        self._zi = None
+        self._ultima = None             # última muestra filtrada (Δp)
+        self._pendiente_ssf = np.zeros(self.w)
+        self._ssf_previo = None
+        self._iniciado = False
+        self._ssf_ap = []
+        self.umbral = np.inf
+        self._picos = deque(maxlen=5)
+        self._pico = None               # (cruce, máximo parcial de SSF)
+        self._ultimo_cruce = 0
+
+    # -------------------------------------------------------------------------
+    # Pies de la onda de pulso (sin ECG)
+    # -------------------------------------------------------------------------
+    def _ssf(self, x):
+        from scipy.signal import sosfilt, sosfilt_zi
+
+        if self._zi is None:
+            self._zi = sosfilt_zi(self.sos) * x[0]
+            self._ultima = x[0]
+        f, self._zi = sosfilt(self.sos, x, zi=self._zi)
+        dp = np.diff(np.concatenate(([self._ultima], f)))
+        self._ultima = f[-1]
+        c = np.concatenate((self._pendiente_ssf, np.maximum(dp, 0.0)))
+        s = np.cumsum(c)
+        self._pendiente_ssf = c[-self.w:]
+        return s[self.w:] - s[:len(dp)]
+
+    def _cruces(self, s, n0):
+        """Cruces de SSF hacia arriba del umbral, con periodo refractario."""
+        cruces = []
+        previo = s[0] if self._ssf_previo is None else self._ssf_previo
+        ext = np.concatenate(([previo], s))     # ext[k + 1] = s[k]
+        k = 0
+        while True:
+            if self._pico is not None:
+                # máximo de SSF en el refractario del último cruce → umbral
+                c0, m = self._pico
+                a = max(c0 - n0, 0)
+                b = min(c0 + self.refractario - n0, len(s))
+                if b > a:
+                    m = max(m, float(s[a:b].max()))
+                if c0 + self.refractario - n0 > len(s):
+                    self._pico = (c0, m)
+                    break
+                self._picos.append(m)
+                self.umbral = 0.6 * float(np.median(self._picos))
+                self._pico = None
+                k = max(k, c0 + self.refractario - n0)
+            j = np.flatnonzero((ext[k + 1:] >= self.umbral)
+                               & (ext[k:-1] < self.umbral))
+            if j.size == 0:
+                break
+            c = n0 + k + int(j[0])
+            cruces.append(c)
+            self._ultimo_cruce = c
+            self._pico = (c, -np.inf)
+        self._ssf_previo = s[-1]
+        # sin latidos por mucho tiempo (artefacto grande, calibración del
+        # equipo): el umbral baja a la mitad cada max_latido_s
+        if self._pico is None and n0 + len(s) - self._ultimo_cruce > self.max_latido:
+            self.umbral *= 0.5
+            self._ultimo_cruce = n0 + len(s)
+        return cruces
+
+    def _pies(self, x, n0):
+        s = self._ssf(x)
+        if not self._iniciado:
+            self._ssf_ap.append(s)
+            if self.n < self.aprendizaje:
+                return []
+            s = np.concatenate(self._ssf_ap)
+            self._ssf_ap = []
+            n0 = self.n - len(s)
+            self.umbral = 0.6 * 3 * float(s.mean())
+            self._iniciado = True
+        pies = []
+        for c in self._cruces(s, n0):
+            a = max(c - self.pie, self._base)
+            ventana = self._x[a - self._base:c + 1 - self._base]
+            if ventana.size:
+                pies.append(a + int(np.argmin(ventana)))
+        return pies
+
+    # -------------------------------------------------------------------------
+    # Latidos
+    # -------------------------------------------------------------------------
+    def _cerrar(self, marcas):
+        """Latidos entre marcas consecutivas (reduceat sobre el buffer)."""
+        marcas = [m for m in marcas if self._marca is None or m > self._marca]
+        if self._marca is not None:
+            marcas = [self._marca] + marcas
+        marcas = [m for m in marcas if m >= self._base]
+        if len(marcas) < 2:
+            if marcas:
+                self._marca = marcas[-1]
+            return _vacio(self.fs)
+        m = np.asarray(marcas, dtype=np.int64)
+        dur = np.diff(m)
+        validos = dur <= self.max_latido
+        i = m - self._base
+        seg = self._x[i[0]:i[-1]]
+        rel = i[:-1] - i[0]
+        sis = np.maximum.reduceat(seg, rel)
+        dia = np.minimum.reduceat(seg, rel)
+        pam = np.add.reduceat(seg, rel) / dur
+        # posición del máximo y del mínimo de cada latido
+        k_sis = np.array([np.argmax(seg[a:a + d]) for a, d in zip(rel, dur)])
+        k_dia = np.array([np.argmin(seg[a:a + d]) for a, d in zip(rel, dur)])
+        self._marca = int(m[-1])
+        inicio = m[:-1][validos]
+        return {
+            'inicio'      : inicio,
+            't'           : inicio / self.fs,
+            'duracion'    : dur[validos] / self.fs,
+            'sistolica'   : sis[validos],
+            'diastolica'  : dia[validos],
+            'media'       : pam[validos],
+            'pulso'       : (sis - dia)[validos],
+            't_sistolica' : (m[:-1] + k_sis)[validos] / self.fs,
+            't_diastolica': (m[:-1] + k_dia)[validos] / self.fs,
+        }
+
+    def _recortar(self):
+        """Descarta la presión que ya no puede pertenecer a ningún latido."""
+        if not self._iniciado and not self._modo_marcas:
+            return                       # los pies del aprendizaje aún no salen
+        desde = self.n - self.max_latido - self.pie
+        if self._marca is not None and self._marca > desde:
+            desde = self._marca
+        if desde > self._base:
+            self._x = self._x[desde - self._base:]
+            self._base = desde
+            if self._marca is not None and self._marca < desde:
+                self._marca = None       # latido demasiado largo: se descarta
+
+    def procesar(self, bloque, marcas=None):
+        """
+        Procesa un bloque de presión y devuelve los latidos que se
+        cerraron (diccionario de arrays, ver CAMPOS).
+        """
+        x = np.asarray(bloque, dtype=np.float64).ravel()
+        n0 = self.n
+        self._modo_marcas = marcas is not None
+        if x.size:
+            self._x = np.concatenate((self._x, x))
+            self.n += x.size
+        if marcas is None:
+            nuevas = self._pies(x, n0) if x.size else []
+        else:
+            # las marcas que caen más allá de la presión recibida esperan
+            todas = sorted(self._pendientes + [int(m) for m in np.ravel(marcas)])
+            nuevas = [m for m in todas if m < self.n]
+            self._pendientes = [m for m in todas if m >= self.n]
+        lat = self._cerrar(nuevas)
+        self._recortar()
+        return lat
+
+    def terminar(self):
+        """El latido abierto no tiene fin: no se entrega."""
+        self.reiniciar()
+        return _vacio(self.fs)
+
+
+def _vacio(fs):
+    return {c: np.empty(0, dtype=np.int64 if c == 'inicio' else np.float64)
+            for c in CAMPOS}
+
+
+def latidos_presion(presion, fs, ecg=None, inicio=0, fin=None,
+                    tam_bloque=TAM_BLOQUE, **opciones):
+    """
+    PRESIÓN LATIDO A LATIDO de presion[inicio:fin] (array, memmap o
+    VistaCanal), por bloques.
+
+    ecg: canal de ECG del mismo registro → latidos de R a R (detector de
+    senales.latidos corriendo sobre los mismos bloques); None → pies de
+    la onda de pulso. Devuelve las columnas de CAMPOS ('inicio' relativo
+    a 'inicio') y 'muestras_s'.
+    """
+    from .latidos import DetectorR
+
+    fin = len(presion) if fin is None else min(fin, len(presion))
+    seg = SegmentadorPulso(fs, **opciones)
+    detector = None if ecg is None else DetectorR(fs)
+    partes = []
+    t0 = time.perf_counter()
+    for i in range(inicio, fin, tam_bloque):
+        j = min(i + tam_bloque, fin)
+        marcas = None
+        if detector is not None:
+            marcas = detector.procesar(ecg[i:j])['muestra']
+        partes.append(seg.procesar(presion[i:j], marcas))
+    if detector is not None:
+        partes.append(seg.procesar(np.empty(0), detector.terminar()['muestra']))
+    segundos = time.perf_counter() - t0
+    tabla = {c: np.concatenate([p[c] for p in partes]) for c in CAMPOS}
+    tabla['muestras_s'] = (fin - inicio) / segundos if segundos > 0 else np.inf
+    return tabla
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+COMPARATIVA DE RENDIMIENTO – desde cero vs NumPy/SciPy por tamaño de ventana
+
+Mide, para ventanas de 1 s hasta el registro completo (933 s de 0743):
+
+    tiempo_s         mejor tiempo de 'repeticiones' corridas (perf_counter)
+    memoria_pico_mb  memoria extra máxima durante el cálculo (tracemalloc,
+                     en una corrida aparte para no inflar el tiempo)
+    error_rel        máximo error relativo de media, varianza, asimetría y
+                     curtosis contra una referencia en doble pasada con
+                     np.longdouble (para el histograma: máxima diferencia
+                     de frecuencia relativa contra np.histogram / N)
+
+de cada implementación:
+
+  momentos
+    sin_funciones → media(), varianza(), asimetria(), curtosis() de
+                    sin_funciones.py (bucles for, ~15 pasadas)
+    una_pasada    → momentos_una_pasada() (bucle for, una pasada)
+    con_funciones → np.mean, np.var, stats.skew, stats.kurtosis (PASO 3 de
+                    con_funciones.py)
+    por_bloques   → momentos_por_bloques() (NumPy, bloques de 65536)
+  histograma
+    sin_funciones → histograma_manual()
+    con_funciones → np.histogram(density=True)
+    por_bloques   → histograma_por_bloques()
+
+Las funciones de sin_funciones.py se toman de su código fuente (solo las
+definiciones 'def'), sin ejecutar el resto del script: se mide exactamente
+lo que usa la guía.
+
+Cada corrida AGREGA filas a un archivo separado por tabulaciones, con
+fecha, máquina y versiones, para seguir el rendimiento en el tiempo:
+
+    python -m senales.rendimiento 0743 -o rendimiento.tsv
+    python -m senales.rendimiento 0743 --segundos 1 10 60 --repeticiones 5
+=============================================================================
+"""
+
+import argparse
+import ast
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from .histograma import histograma_por_bloques
+from .lectura import abrir_registro
+from .lote import formato_celda
+from .momentos import (estadisticos_desde_momentos, momentos_por_bloques,
+                       momentos_una_pasada)
+
+
+COLUMNAS = ('fecha', 'maquina', 'python', 'numpy', 'registro', 'canal',
+            'segundos', 'n', 'operacion', 'implementacion', 'ddof_forma',
+            'tiempo_s', 'muestras_s', 'memoria_pico_mb', 'error_rel')
+
+SEGUNDOS = (1, 10, 60, 300, None)           # None = registro completo
+ESTADISTICOS = ('media', 'varianza', 'asimetria', 'curtosis')
+N_BINS = 60
+
+SCRIPT_SIN_FUNCIONES = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'sin_funciones.py')
+
+
+def funciones_de_script(ruta, nombres=None):
+    """
+    Funciones definidas en un script, sin ejecutar su código de nivel
+    superior (lectura, gráficas, prints). Devuelve un diccionario
+    nombre → función.
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        arbol = ast.parse(f.read(), ruta)
+    defs = [n for n in arbol.body if isinstance(n, ast.FunctionDef)]
+    espacio = {}
+    exec(compile(ast.Module(body=defs, type_ignores=[]), ruta, 'exec'), espacio)
+    nombres = [n.name for n in defs] if nombres is None else nombres
+    return {n: espacio[n] for n in nombres}
+
+
+# =============================================================================
+# IMPLEMENTACIONES (misma entrada: la ventana como array de NumPy)
+# =============================================================================
+
+def implementaciones(ruta_script=SCRIPT_SIN_FUNCIONES):
+    """
+    {(operacion, implementacion): (funcion, ddof_forma)}. Cada función
+    recibe la ventana y devuelve un diccionario con ESTADISTICOS o la
+    tupla (centros, frec_rel) del histograma.
+    """
+    from scipy import stats
+
+    sf = funciones_de_script(ruta_script, ('media', 'varianza', 'asimetria',
+                                           'curtosis', 'histograma_manual'))
+
+    def sin_funciones(x):
+        lista = x.tolist()                     # como en el PASO 3 del script
+        return {'media': sf['media'](lista), 'varianza': sf['varianza'](lista),
+                'asimetria': sf['asimetria'](lista),
+                'curtosis': sf['curtosis'](lista)}
+
+    def una_pasada(x):
+        return momentos_una_pasada(x.tolist())
+
+    def con_funciones(x):
+        return {'media': np.mean(x), 'varianza': np.var(x, ddof=1),
+                'asimetria': stats.skew(x), 'curtosis': stats.kurtosis(x)}
+
+    def por_bloques(x):
+        return momentos_por_bloques(x).estadisticos(ddof_forma=1)
+
+    def hist_sin_funciones(x):
+        return sf['histograma_manual'](x.tolist(), N_BINS)
+
+    def hist_con_funciones(x):
+        densidad, bordes = np.histogram(x, bins=N_BINS, density=True)
+        return (bordes[:-1] + bordes[1:]) / 2, densidad * (bordes[1] - bordes[0])
+
+    def hist_por_bloques(x):
+        return histograma_por_bloques(x, n_bins=N_BINS).resultado()
+
+    return {
+        ('momentos', 'sin_funciones')  : (sin_funciones, 1),
+        ('momentos', 'una_pasada')     : (una_pasada, 1),
+        ('momentos', 'con_funciones')  : (con_funciones, 0),
+        ('momentos', 'por_bloques')    : (por_bloques, 1),
+        ('histograma', 'sin_funciones'): (hist_sin_funciones, None),
+        ('histograma', 'con_funciones'): (hist_con_funciones, None),
+        ('histograma', 'por_bloques')  : (hist_por_bloques, None),
+    }
+
+
+# =============================================================================
+# REFERENCIA Y ERRORES
+# =============================================================================
+
+def referencia_momentos(x, ddof_forma):
+    """Doble pasada en precisión extendida (np.longdouble)."""
+    xl = np.asarray(x, dtype=np.longdouble)
+    mu = xl.mean()
+    d = xl - mu
+    d2 = d * d
+    return estadisticos_desde_momentos(x.size, float(mu), float(d2.sum()),
+                                       float((d2 * d).sum()),
+                                       float((d2 * d2).sum()), ddof_forma)
+
+
+def referencia_histograma(x):
+    conteos, _ = np.histogram(x, bins=N_BINS)
+    return conteos / x.size
+
+
+def error_momentos(resultado, referencia):
+    return max(abs(float(resultado[c]) - referencia[c]) / abs(referencia[c])
+               for c in ESTADISTICOS)
+
+
+def error_histograma(resultado, referencia):
+    return float(np.max(np.abs(np.asarray(resultado[1]) - referencia)))
+
+
+# =============================================================================
+# MEDICIÓN
+# =============================================================================
+
+def medir(funcion, x, repeticiones=3, memoria=True):
+    """(resultado, mejor tiempo en s, pico de memoria extra en MB o nan)."""
+    mejor = np.inf
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion(x)
+        mejor = min(mejor, time.perf_counter() - t0)
+    pico = float('nan')
+    if memoria:
+        tracemalloc.start()
+        try:
+            funcion(x)
+            pico = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return resultado, mejor, pico
+
+
+def comparar(registro, canal='ECG', segundos=SEGUNDOS, repeticiones=3,
+             memoria=True, limite_python=None, ruta_script=SCRIPT_SIN_FUNCIONES,
+             mostrar=print):
+    """
+    Corre todas las implementaciones sobre las ventanas [0, segundos) del
+    canal. Devuelve una lista de filas (dict, ver COLUMNAS).
+
+    limite_python: segundos máximos de ventana para las implementaciones
+    en Python puro (sin_funciones, una_pasada); None = sin límite.
+    """
+    vista = registro.canal(canal)
+    fs = registro.fs
+    comunes = {'fecha': datetime.now().isoformat(timespec='seconds'),
+               'maquina': platform.node(),
+               'python': platform.python_version(), 'numpy': np.__version__,
+               'registro': registro.ruta, 'canal': vista.nombre}
+    impl = implementaciones(ruta_script)
+
+    filas = []
+    for seg in segundos:
+        n = len(vista) if seg is None else min(int(round(seg * fs)), len(vista))
+        x = np.asarray(vista[:n], dtype=np.float64)
+        duracion = n / fs
+        ref = {0: referencia_momentos(x, 0), 1: referencia_momentos(x, 1),
+               None: referencia_histograma(x)}
+        for (operacion, nombre), (funcion, ddof) in impl.items():
+            if limite_python is not None and duracion > limite_python \
+                    and nombre in ('sin_funciones', 'una_pasada'):
+                continue
+            r, t, pico = medir(funcion, x, repeticiones, memoria)
+            error = error_momentos(r, ref[ddof]) if operacion == 'momentos' \
+                else error_histograma(r, ref[None])
+            filas.append(dict(comunes, segundos=duracion, n=n,
+                              operacion=operacion, implementacion=nombre,
+                              ddof_forma='' if ddof is None else ddof,
+                              tiempo_s=t, muestras_s=n / t if t > 0 else np.inf,
+                              memoria_pico_mb=pico, error_rel=error))
+            mostrar(f"  {duracion:7.0f} s  {operacion:<10} {nombre:<14} "
+                    f"{t:10.4f} s  {pico:9.2f} MB  error={error:.2e}")
+    return filas
+
+
+def guardar_resultados(filas, ruta_salida):
+    """Agrega las filas al archivo (lo crea con encabezado si no existe)."""
+    nuevo = not os.path.exists(ruta_salida)
+    with open(ruta_salida, 'a', encoding='utf-8') as f:
+        if nuevo:
+            f.write('# ' + '\t'.join(COLUMNAS) + '\n')
+        f.write(''.join('\t'.join(formato_celda(fila[c]) for c in COLUMNAS) + '\n'
+                        for fila in filas))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.rendimiento',
+        description='Tiempo, memoria y exactitud: sin_funciones vs con_funciones.')
+    p.add_argument('registro', nargs='?', default='0743')
+    p.add_argument('-o', '--salida', default='rendimiento.tsv',
+                   help='archivo de resultados (se agregan filas)')
+    p.add_argument('--canal', default='ECG')
+    p.add_argument('--segundos', type=float, nargs='+', default=None,
+                   help='ventanas en segundos (0 = registro completo); '
+                        'por defecto 1 10 60 300 y el registro completo')
+    p.add_argument('--repeticiones', type=int, default=3)
+    p.add_argument('--limite-python', type=float, default=None,
+                   help='ventana máxima (s) para las versiones en Python puro')
+    p.add_argument('--sin-memoria', action='store_true',
+                   help='no medir la memoria (tracemalloc es lento con bucles for)')
+    p.add_argument('--script', default=SCRIPT_SIN_FUNCIONES,
+                   help='ruta de sin_funciones.py')
+    args = p.parse_args(argv)
+
+    segundos = SEGUNDOS if args.segundos is None \
+        else tuple(s or None for s in args.segundos)
+    filas = comparar(abrir_registro(args.registro), args.canal, segundos,
+                     args.repeticiones, not args.sin_memoria,
+                     args.limite_python, args.script)
+    guardar_resultados(filas, args.salida)
+    print(f"Resultados: {os.path.abspath(args.salida)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
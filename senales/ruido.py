@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+RUIDO Y SNR (Parte C) – generación vectorizada por lotes
+
+    SNR = 10 · log10( P_señal / P_ruido )   [dB]
+
+    P_señal = (1/N) · Σ (xᵢ - μ)²     (potencia de la señal sin su media)
+    P_ruido = (1/N) · Σ rᵢ²
+
+Con esas definiciones salen los valores de parteC_resultados_snr_*.txt
+(captura de la Parte B, 10 s):
+    gaussiano  σ = √(P_señal / 10^(20/10))          → SNR ≈ 20 dB
+    impulso    2 % de muestras con ±5σ_señal          → SNR ≈ 3.01 dB
+    artefacto  0.5σ_señal · sen(2π·0.3·t) + deriva    → SNR ≈ 8.6 dB
+
+En vez de generar una realización a la vez con un bucle, cada función
+devuelve una matriz R × N: una fila por cada combinación (SNR objetivo,
+realización). Todo sale de UNA llamada al generador aleatorio y la SNR
+lograda de cada fila se calcula también de una vez (snr_db).
+
+Tipos de ruido: 'gaussiano', 'impulso', 'artefacto'.
+=============================================================================
+"""
+
+import numpy as np
+
+
+TIPOS = ('gaussiano', 'impulso', 'artefacto')
+
+
+def potencia_senal(x, axis=-1):
+    """P = (1/N) · Σ (xᵢ - μ)²  (la media no cuenta como señal)."""
+    x = np.asarray(x, dtype=np.float64)
+    return x.var(axis=axis)
+
+
+def potencia_ruido(r, axis=-1):
+    """P = (1/N) · Σ rᵢ²"""
+    r = np.asarray(r, dtype=np.float64)
+    return np.mean(r * r, axis=axis)
+
+
+def snr_db(senal, ruido, axis=-1):
+    """
+    SNR en dB de cada fila. senal puede ser (N,) o (R × N); ruido (R × N).
+    """
+    p_senal = np.expand_dims(potencia_senal(senal, axis), axis)
+    p_ruido = np.expand_dims(potencia_ruido(ruido, axis), axis)
+    with np.errstate(divide='ignore'):
+        return np.squeeze(10 * np.log10(p_senal / p_ruido), axis)
+
+
+def snr_desde_contaminada(limpia, contaminada, axis=-1):
+    """SNR cuando solo se tiene la señal contaminada: ruido = contaminada - limpia."""
+    return snr_db(limpia, np.asarray(contaminada) - limpia, axis)
+
+
+def _objetivos(snr_objetivo, n_realizaciones):
+    """Vector de SNR objetivo de cada fila: cada SNR se repite n_realizaciones veces."""
+    snr = np.atleast_1d(np.asarray(snr_objetivo, dtype=np.float64))
+    return np.repeat(snr, n_realizaciones)
+
+
+# =============================================================================
+# FORMAS DE RUIDO (potencia esperada = 1)
+# =============================================================================
+
+def _forma_gaussiano(rng, R, N, fs, exacto=False):
+    return rng.standard_normal((R, N))
+
+
+def _forma_impulso(rng, R, N, fs, exacto=False, probabilidad=0.02):
+    """
+    Impulsos ±1/√p en una fracción p de muestras al azar (potencia media 1).
+    exacto=True → exactamente round(p·N) impulsos por fila (200 de 10 000,
+    como en la Parte C) en vez de un número al azar alrededor de p·N.
+    """
+    if exacto:
+        k = max(1, int(round(probabilidad * N)))
+        posiciones = np.argpartition(rng.random((R, N)), k - 1, axis=1)[:, :k]
+        mascara = np.zeros((R, N), dtype=bool)
+        np.put_along_axis(mascara, posiciones, True, axis=1)
+    else:
+        mascara = rng.random((R, N)) < probabilidad
+    signo = np.where(rng.random((R, N)) < 0.5, -1.0, 1.0)
+    return mascara * signo / np.sqrt(probabilidad)
+
+
+def _forma_artefacto(rng, R, N, fs, exacto=False, frecuencia=0.3, deriva=0.0):
+    """
+    Senoidal de 'frecuencia' Hz (fase al azar por fila) más una deriva
+    lineal de línea base que va de 0 a deriva·amplitud a lo largo de la
+    ventana. Se normaliza a potencia media 1.
+    """
+    t = np.arange(N) / fs
+    fase = rng.uniform(0, 2 * np.pi, (R, 1))
+    forma = np.sqrt(2) * np.sin(2 * np.pi * frecuencia * t + fase)
+    if deriva:
+        forma = forma + np.sqrt(2) * deriva * (t / t[-1] if N > 1 else t)
+    # potencia esperada sobre la ventana (sin + rampa) → 1
+    return forma / np.sqrt(np.mean(forma * forma, axis=1, keepdims=True))
+
+
+FORMAS = {
+    'gaussiano': _forma_gaussiano,
+    'impulso'  : _forma_impulso,
+    'artefacto': _forma_artefacto,
+}
+
+
+def generar_ruido(senal, tipo, snr_objetivo, n_realizaciones=1, fs=1000,
+                  rng=None, exacto=False, **parametros):
+    """
+    GENERAR RUIDO – matriz R × N de ruido para contaminar 'senal'.
+
+    senal          : array (N,) limpio (p. ej. ecg de la Parte A)
+    tipo           : 'gaussiano' | 'impulso' | 'artefacto'
+    snr_objetivo   : número o lista de SNR en dB
+    n_realizaciones: realizaciones por cada SNR → R = len(snr) · n_realizaciones
+    rng            : np.random.Generator (o semilla); fija el resultado
+    exacto         : False → la potencia del ruido es la esperada (la SNR
+                     lograda varía un poco, como 20.03 dB en la Parte C);
+                     True → cada fila se escala para dar la SNR exacta
+                     (y el impulso tiene exactamente round(p·N) picos).
+    parametros     : probabilidad (impulso), frecuencia y deriva (artefacto)
+
+    Devuelve (ruido, snr_fila): ruido R × N y la SNR objetivo de cada fila.
+    La señal contaminada es senal + ruido (broadcasting).
+    """
+    if tipo not in FORMAS:
+        raise ValueError(f"Tipo de ruido desconocido: {tipo!r} (use {TIPOS})")
+    rng = np.random.default_rng(rng)
+    senal = np.asarray(senal, dtype=np.float64)
+    N = senal.shape[-1]
+    snr_fila = _objetivos(snr_objetivo, n_realizaciones)
+    R = snr_fila.size
+
+    forma = FORMAS[tipo](rng, R, N, fs, exacto, **parametros)
+    if exacto:
+        forma /= np.sqrt(potencia_ruido(forma))[:, None]
+    p_ruido = potencia_senal(senal) / 10 ** (snr_fila / 10)
+    forma *= np.sqrt(p_ruido)[:, None]
+    return forma, snr_fila
+
+
+def contaminar(senal, tipo, snr_objetivo, n_realizaciones=1, fs=1000,
+               rng=None, exacto=False, **parametros):
+    """
+    CONTAMINAR – señales contaminadas y su SNR lograda, todo de una vez.
+
+    Devuelve un diccionario:
+      'contaminada'  R × N
+      'ruido'        R × N
+      'snr_objetivo' (R,)
+      'snr'          (R,)   SNR lograda de cada fila
+    """
+    senal = np.asarray(senal, dtype=np.float64)
+    ruido, snr_fila = generar_ruido(senal, tipo, snr_objetivo, n_realizaciones,
+                                    fs, rng, exacto, **parametros)
+    return {
+        'contaminada' : senal + ruido,
+        'ruido'       : ruido,
+        'snr_objetivo': snr_fila,
+        'snr'         : snr_db(senal, ruido),
+    }
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+TABLERO EN VIVO – estadísticos, histograma y señal mientras se captura
+
+captura_DAQ.py calcula mu, s, v, cv, g1 y g2 y dibuja las gráficas solo
+cuando termina la captura: para saber si el generador está bien conectado
+hay que esperar los 10 s y las tres figuras. El tablero muestra, mientras
+la captura sigue, una fila por canal con:
+
+    señal      últimos 'ventana_s' segundos, envolvente mín/máx por
+               columna de píxeles (como senales.graficas)
+    histograma conteos acumulados de TODA la captura (senales.histograma)
+    texto      n, media, s, CV, asimetría y curtosis de toda la captura
+               (los momentos que CapturaContinua ya actualiza por bloques)
+
+Cada bloque cuesta O(bloque), no O(muestras capturadas):
+  - el histograma suma los conteos del bloque;
+  - la envolvente guarda un anillo de n_pixeles columnas (mín y máx de k
+    muestras cada una); un bloque llena sus columnas y el resto (< k
+    muestras) espera al siguiente;
+  - los momentos no se recalculan: se leen de captura.momentos.
+
+Los bloques llegan en el hilo escritor de CapturaContinua; ahí solo se
+actualiza el estado. El dibujo va en el hilo principal (el único donde
+las ventanas de matplotlib funcionan bien), a lo sumo fps_max veces por
+segundo y con blitting: los ejes, la rejilla y las etiquetas se dibujan
+una vez y se guardan como fondo; en cada cuadro solo se redibujan las
+líneas, las barras y el texto. Si la señal sale de los límites del eje
+se amplían y se redibuja todo una vez.
+
+    tablero = TableroEnVivo(fs, n_canales, nombres=['ECG'], rango=(-5, 5))
+    captura = CapturaContinua(fuente, escritor, al_bloque=tablero)
+    tablero.ejecutar(captura, duracion=60)     # en vez de captura.ejecutar()
+=============================================================================
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .graficas import COLORES, es_interactivo, guardar_figura, pyplot
+from .histograma import Histograma
+
+
+class TableroEnVivo:
+    """
+    TABLERO EN VIVO para CapturaContinua (se pasa como al_bloque).
+
+    rango      : (v_min, v_max) de los bins del histograma, uno para todos
+                 los canales o una lista con uno por canal; lo que quede
+                 fuera se cuenta aparte y se muestra en el texto
+    ventana_s  : segundos de señal visibles (el eje va de -ventana_s a 0)
+    n_pixeles  : columnas de la envolvente (≈ ancho del eje en píxeles)
+    fps_max    : cuadros por segundo como máximo
+    """
+
+    def __init__(self, fs, n_canales=1, nombres=None, rango=(-5, 5), n_bins=60,
+                 ventana_s=10.0, n_pixeles=1000, fps_max=10.0, ddof_forma=0):
+        self.fs = float(fs)
+        self.C = int(n_canales)
+        self.nombres = list(nombres) if nombres else \
+            [f'Canal {k}' for k in range(self.C)]
+        rangos = [rango] * self.C if np.ndim(rango) == 1 else list(rango)
+        self.histogramas = [Histograma(n_bins, *r) for r in rangos]
+        self.k = max(1, -(-int(round(ventana_s * self.fs)) // int(n_pixeles)))
+        self.n_columnas = int(n_pixeles)
+        self.ventana_s = self.n_columnas * self.k / self.fs
+        self.fps_max = float(fps_max)
+        self.ddof_forma = ddof_forma
+        # anillo de la envolvente: columna j → muestras [j·k, (j+1)·k)
+        self._min = np.full((self.C, self.n_columnas), np.nan)
+        self._max = np.full((self.C, self.n_columnas), np.nan)
+        self._columnas = 0                    # columnas completas vistas
+        self._resto = np.empty((self.C, 0))
+        self._estadisticos = None
+        self.n = 0
+        self._nuevos = False
+        self._cerrojo = threading.Lock()
+        self.fig = None
+
+    # -------------------------------------------------------------------------
+    # Hilo escritor: O(bloque)
+    # -------------------------------------------------------------------------
+    def __call__(self, bloque, captura=None):
+        self.al_bloque(bloque, captura)
+
+    def al_bloque(self, bloque, captura=None):
+        """Agrega un bloque (n_canales × B) al histograma y a la envolvente."""
+        x = np.atleast_2d(np.asarray(bloque, dtype=np.float64))
+        with self._cerrojo:
+            for h, fila in zip(self.histogramas, x):
+                h.agregar(fila)
+            if self._resto.shape[1]:
+                x = np.concatenate((self._resto, x), axis=1)
+            m = x.shape[1] // self.k
+            if m:
+                c = x[:, :m * self.k].reshape(self.C, m, self.k)
+                if m > self.n_columnas:           # bloque más largo que la ventana
+                    self._columnas += m - self.n_columnas
+                    c = c[:, -self.n_columnas:]
+                    m = self.n_columnas
+                pos = (self._columnas + np.arange(m)) % self.n_columnas
+                self._min[:, pos] = c.min(axis=2)
+                self._max[:, pos] = c.max(axis=2)
+                self._columnas += m
+            self._resto = x[:, m * self.k:].copy()
+            if captura is not None:
+                self._estadisticos = captura.momentos.estadisticos(self.ddof_forma)
+                self.n = captura.n_guardadas
+            else:
+                self.n += np.shape(bloque)[-1]
+            self._nuevos = True
+
+    def _instantanea(self):
+        """Copia del estado (O(n_pixeles + n_bins)) para dibujar sin cerrojo."""
+        with self._cerrojo:
+            orden = (self._columnas + np.arange(self.n_columnas)) % self.n_columnas
+            y = np.stack((self._min[:, orden], self._max[:, orden]), axis=2)
+            frec = [h.resultado()[1] for h in self.histogramas]
+            fuera = [(h.debajo, h.encima) for h in self.histogramas]
+            self._nuevos = False
+            return y.reshape(self.C, -1), frec, fuera, self._estadisticos, self.n
+
+    # -------------------------------------------------------------------------
+    # Hilo principal: dibujo
+    # -------------------------------------------------------------------------
+    def preparar(self, sin_pantalla=None):
+        """Crea la figura con los artistas 'animated' (fuera del fondo)."""
+        plt = pyplot(sin_pantalla)
+        fig, ejes = plt.subplots(self.C, 2, figsize=(13, 1.5 + 2.8 * self.C),
+                                 squeeze=False, gridspec_kw={'width_ratios': (3, 1)})
+        fig.suptitle("Captura en vivo", fontsize=13, fontweight='bold')
+        t = (np.arange(self.n_columnas) - self.n_columnas + 1) * self.k / self.fs
+        self._t = np.repeat(t, 2)
+        self.lineas, self.medias, self.barras, self.textos = [], [], [], []
+        for k, (ax, ax_h) in enumerate(ejes):
+            h = self.histogramas[k]
+            color = COLORES[k % len(COLORES)]
+            self.lineas += ax.plot(self._t, np.full(self._t.size, np.nan),
+                                   color=color, lw=0.8, animated=True)
+            self.medias.append(ax.axhline(np.nan, color='black', ls='--', lw=1.2,
+                                          animated=True))
+            self.textos.append(ax.text(0.01, 0.97, '', transform=ax.transAxes,
+                                       va='top', fontsize=9, family='monospace',
+                                       animated=True,
+                                       bbox=dict(fc='white', alpha=0.8, lw=0)))
+            ax.set_xlim(self._t[0], 0)
+            ax.set_ylim(h.x_min, h.x_max)
+            ax.set_ylabel(self.nombres[k], fontsize=11)
+            ax.grid(True, alpha=0.3)
+            self.barras.append(ax_h.stairs(np.zeros(h.n_bins), h.bordes, fill=True,
+                                           color=color, alpha=0.85, animated=True))
+            ax_h.set_xlim(h.x_min, h.x_max)
+            ax_h.set_ylim(0, 0.1)
+            ax_h.set_ylabel("Frec. relativa", fontsize=10)
+            ax_h.grid(True, alpha=0.3)
+        ejes[-1, 0].set_xlabel("Tiempo antes del último bloque (s)", fontsize=11)
+        ejes[-1, 1].set_xlabel("Amplitud", fontsize=11)
+        fig.tight_layout()
+        self.fig, self.ejes = fig, ejes
+        self._artistas = self.lineas + self.medias + self.barras + self.textos
+        self._fondo = None
+        fig.canvas.mpl_connect('draw_event', self._al_redibujar)
+        if _es_ventana(fig):
+            plt.show(block=False)
+        fig.canvas.draw()
+        return fig
+
+    def _al_redibujar(self, evento=None):
+        """Después de un dibujo completo (inicio, límites nuevos, ventana
+        redimensionada): se guarda el fondo y se pintan los artistas."""
+        canvas = self.fig.canvas
+        if getattr(canvas, 'supports_blit', False):
+            self._fondo = canvas.copy_from_bbox(self.fig.bbox)
+        for a in self._artistas:
+            self.fig.draw_artist(a)
+
+    def _ajustar_limites(self, y, frec):
+        """Amplía los ejes que se quedaron cortos; True si hay que redibujar todo."""
+        cambio = False
+        for k, (ax, ax_h) in enumerate(self.ejes):
+            if np.isfinite(y[k]).any():
+                a, b = np.nanmin(y[k]), np.nanmax(y[k])
+                y0, y1 = ax.get_ylim()
+                if a < y0 or b > y1:
+                    margen = 0.1 * (max(b, y1) - min(a, y0))
+                    ax.set_ylim(min(a, y0) - margen, max(b, y1) + margen)
+                    cambio = True
+            tope = float(frec[k].max()) if frec[k].size else 0.0
+            if tope > ax_h.get_ylim()[1]:
+                ax_h.set_ylim(0, 1.25 * tope)
+                cambio = True
+        return cambio
+
+    def dibujar(self):
+        """Un cuadro: actualiza los artistas y los pinta sobre el fondo."""
+        y, frec, fuera, est, n = self._instantanea()
+        for k in range(self.C):
+            self.lineas[k].set_ydata(y[k])
+            self.barras[k].set_data(frec[k])
+            texto = f"t = {n / self.fs:7.1f} s   n = {n}"
+            if est is not None:
+                e = est[k]
+                self.medias[k].set_ydata([e['media']] * 2)
+                texto += (f"\nμ = {e['media']:.5f}   s = {e['desv_estandar']:.5f}"
+                          f"   CV = {e['coef_variacion']:.2f} %"
+                          f"\ng1 = {e['asimetria']:.4f}   g2 = {e['curtosis']:.4f}")
+            if sum(fuera[k]):
+                texto += f"\nfuera del histograma: {fuera[k][0]} ↓ {fuera[k][1]} ↑"
+            self.textos[k].set_text(texto)
+
+        canvas = self.fig.canvas
+        if self._ajustar_limites(y, frec) or self._fondo is None:
+            canvas.draw()                        # _al_redibujar guarda el fondo
+        else:
+            canvas.restore_region(self._fondo)
+            for a in self._artistas:
+                self.fig.draw_artist(a)
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def ejecutar(self, captura, duracion=None, sin_pantalla=None):
+        """
+        Corre captura.ejecutar(duracion) en otro hilo y dibuja en este
+        hasta que termina (duración, fin de la fuente, Ctrl+C o ventana
+        cerrada). Devuelve la captura.
+        """
+        if self.fig is None:
+            self.preparar(sin_pantalla)
+        errores = []
+
+        def capturar():
+            try:
+                captura.ejecutar(duracion)
+            except Exception as e:     # se reporta en el hilo principal
+                errores.append(e)
+
+        hilo = threading.Thread(target=capturar, daemon=True)
+        hilo.start()
+        periodo = 1.0 / self.fps_max
+        try:
+            while hilo.is_alive():
+                t0 = time.perf_counter()
+                if self._nuevos:
+                    self.dibujar()
+                if _es_ventana(self.fig) and not _abierta(self.fig):
+                    captura.detener()
+                espera = max(periodo - (time.perf_counter() - t0), 1e-3)
+                if _es_ventana(self.fig):
+                    self.fig.canvas.start_event_loop(espera)
+                else:
+                    hilo.join(espera)
+        except KeyboardInterrupt:
+            captura.detener()
+        finally:
+            hilo.join()
+        self.dibujar()                           # último cuadro, con todo
+        if errores:
+            raise errores[0]
+        return captura
+
+    def guardar(self, ruta, mostrar=False):
+        """Guarda el último cuadro como imagen (y cierra la figura)."""
+        for a in self._artistas:
+            a.set_animated(False)                # savefig omite los 'animated'
+        return guardar_figura(self.fig, ruta, mostrar=mostrar)
+
+
+def _es_ventana(fig):
+    return es_interactivo() and fig.canvas.manager is not None
+
+
+def _abierta(fig):
+    import matplotlib.pyplot as plt
+    return plt.fignum_exists(fig.number)
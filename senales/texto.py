@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+CAPTURAS EN TEXTO (senal_capturada_*.txt) – lectura rápida y conversión
+
+Formato que escribía captura_DAQ.py con np.savetxt:
+
+    # Captura DAQ - 20260219_112925
+    # Fs=1000 Hz, Duracion=10 s, Dispositivo=Dev3/ai0
+    # Tiempo[s]	Amplitud[V]
+    0.000000	-0.378429
+    ...
+
+Aquí:
+  - las líneas '# ' se convierten en metadatos (fecha, Fs, Duracion,
+    Dispositivo, nombres de columnas);
+  - el cuerpo numérico se convierte de texto a float de a bloques grandes
+    con np.fromstring (sin interpretar línea por línea), y la columna de
+    tiempo se puede descartar porque t = n / Fs;
+  - convertir_carpeta() pasa todas las capturas de una carpeta al formato
+    binario WFDB (senales.formato) una sola vez; después los análisis
+    abren el .dat con memmap y no vuelven a leer texto.
+
+Uso como programa:
+    python -m senales.texto carpeta_de_capturas/
+=============================================================================
+"""
+
+import glob
+import os
+import re
+import sys
+
+import numpy as np
+
+
+BYTES_POR_BLOQUE = 1 << 22        # ~4 MB de texto por bloque
+
+
+def leer_metadatos_txt(ruta):
+    """
+    Metadatos de la cabecera '# ' de una captura:
+      {'fecha', 'fs', 'duracion', 'dispositivo', 'columnas', 'lineas_cabecera'}
+    'duracion' es None si la captura fue continua.
+    """
+    meta = {'fecha': '', 'fs': None, 'duracion': None, 'dispositivo': '',
+            'columnas': [], 'lineas_cabecera': 0}
+    with open(ruta, 'r', encoding='utf-8', errors='replace') as f:
+        for linea in f:
+            if not linea.startswith('#'):
+                break
+            meta['lineas_cabecera'] += 1
+            texto = linea[1:].strip()
+            if texto.startswith('Captura DAQ'):
+                meta['fecha'] = texto.split('-', 1)[-1].strip()
+            elif '=' in texto:
+                # cada valor llega hasta la siguiente ', Clave=' o al final de
+                # la línea: 'Dispositivo=Dev4/ai0, Dev4/ai1' (varios canales)
+                # no se corta en la coma
+                for clave, valor in re.findall(r'(\w+)=(.+?)(?=,\s*\w+=|$)', texto):
+                    valor = valor.strip()
+                    if clave == 'Fs':
+                        meta['fs'] = float(valor.split()[0])
+                    elif clave == 'Duracion':
+                        numero = valor.split()[0]
+                        meta['duracion'] = None if numero == 'continua' \
+                            else float(numero)
+                    elif clave == 'Dispositivo':
+                        meta['dispositivo'] = valor
+            elif texto:
+                meta['columnas'] = texto.split('\t')
+
+    if meta['fs'] is not None and meta['fs'].is_integer():
+        meta['fs'] = int(meta['fs'])
+    return meta
+
+
+def bloques_txt(ruta, n_columnas=None, con_tiempo=False,
+                bytes_por_bloque=BYTES_POR_BLOQUE):
+    """
+    Genera bloques (n_canales × filas) del cuerpo numérico de la captura.
+
+    Cada bloque se lee como un pedazo grande de texto que termina en un
+    salto de línea completo y se convierte de una vez con np.fromstring.
+    con_tiempo=False descarta la primera columna (tiempo).
+    """
+    if n_columnas is None:
+        meta = leer_metadatos_txt(ruta)
+        n_columnas = len(meta['columnas']) or 2
+    with open(ruta, 'rb') as f:
+        resto = b''
+        while True:
+            trozo = f.read(bytes_por_bloque)
+            if not trozo and not resto:
+                break
+            texto = resto + trozo
+            if trozo:
+                corte = texto.rfind(b'\n') + 1
+                texto, resto = texto[:corte], texto[corte:]
+            else:
+                resto = b''
+            # se quitan las líneas de comentario (solo aparecen al inicio)
+            while texto.startswith(b'#'):
+                texto = texto[texto.find(b'\n') + 1:] if b'\n' in texto else b''
+            if not texto.strip():
+                continue
+            valores = np.fromstring(texto.decode('ascii'), dtype=np.float64,
+                                    sep=' ')
+            filas = valores.reshape(-1, n_columnas)
+            yield filas.T if con_tiempo else filas[:, 1:].T
+
+
+def leer_captura_txt(ruta, con_tiempo=False, bytes_por_bloque=BYTES_POR_BLOQUE):
+    """
+    LEER CAPTURA .txt – devuelve (datos, metadatos).
+
+    datos: array (n_canales × n_muestras); con con_tiempo=True la fila 0
+    es el tiempo. Si la cabecera no trae Fs, se calcula del tiempo.
+    """
+    meta = leer_metadatos_txt(ruta)
+    n_columnas = len(meta['columnas']) or 2
+    bloques = list(bloques_txt(ruta, n_columnas, True, bytes_por_bloque))
+    todo = np.concatenate(bloques, axis=1) if bloques \
+        else np.zeros((n_columnas, 0))
+    if meta['fs'] is None and todo.shape[1] > 1:
+        meta['fs'] = int(round(1.0 / np.median(np.diff(todo[0]))))
+    meta['n_muestras'] = todo.shape[1]
+    return (todo if con_tiempo else todo[1:]), meta
+
+
+# =============================================================================
+# CONVERSIÓN A BINARIO
+# =============================================================================
+
+def convertir_txt_a_wfdb(ruta_txt, destino=None, rango=(-5, 5)):
+    """
+    Convierte una captura .txt en un par .dat/.hea (mismo nombre).
+
+    rango: rango de la DAQ (V_MIN, V_MAX) para la ganancia de 16 bits; si
+    la señal se sale de él, se amplía para que ninguna muestra se sature.
+    Devuelve la ruta del registro (sin extensión).
+    """
+    from .formato import guardar_wfdb
+
+    datos, meta = leer_captura_txt(ruta_txt)
+    v_min, v_max = rango
+    if datos.size:
+        v_min = min(v_min, float(datos.min()))
+        v_max = max(v_max, float(datos.max()))
+    base = os.path.splitext(os.path.basename(ruta_txt))[0]
+    ruta = os.path.join(destino or os.path.dirname(ruta_txt), base)
+    nombres = [c.split('[')[0] for c in meta['columnas'][1:]] or None
+    return guardar_wfdb(ruta, datos, meta['fs'], v_min=v_min, v_max=v_max,
+                        dispositivo=meta['dispositivo'],
+                        marca_tiempo=meta['fecha'],
+                        nombres=nombres if nombres and
+                        len(nombres) == datos.shape[0] else None)
+
+
+def convertir_carpeta(carpeta, patron='senal_capturada_*.txt', destino=None,
+                      rango=(-5, 5), forzar=False, mostrar=print):
+    """
+    CONVERTIR CARPETA – pasa todas las capturas .txt a binario WFDB.
+
+    Solo convierte las que no tienen .hea o cuyo .txt es más nuevo que el
+    .hea (forzar=True las convierte todas). Devuelve la lista de registros
+    convertidos.
+    """
+    hechos = []
+    for ruta_txt in sorted(glob.glob(os.path.join(carpeta, patron))):
+        base = os.path.splitext(os.path.basename(ruta_txt))[0]
+        hea = os.path.join(destino or carpeta, base + '.hea')
+        if not forzar and os.path.exists(hea) and \
+                os.path.getmtime(hea) >= os.path.getmtime(ruta_txt):
+            continue
+        hechos.append(convertir_txt_a_wfdb(ruta_txt, destino, rango))
+        mostrar(f"  ✓ {ruta_txt} → {hechos[-1]}.dat/.hea")
+    return hechos
+
+
+def main(argv=None):
+    import argparse
+
+    p = argparse.ArgumentParser(
+        prog='python -m senales.texto',
+        description='Convierte capturas senal_capturada_*.txt a binario WFDB.')
+    p.add_argument('carpeta', nargs='?', default='.')
+    p.add_argument('--patron', default='senal_capturada_*.txt')
+    p.add_argument('--destino', default=None,
+                   help='carpeta de salida (por defecto, la misma)')
+    p.add_argument('--v-min', type=float, default=-5)
+    p.add_argument('--v-max', type=float, default=5)
+    p.add_argument('--forzar', action='store_true',
+                   help='convertir aunque el .hea ya exista')
+    args = p.parse_args(argv)
+    hechos = convertir_carpeta(args.carpeta, args.patron, args.destino,
+                               (args.v_min, args.v_max), args.forzar)
+    print(f"{len(hechos)} capturas convertidas")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+ESTADÍSTICOS POR VENTANAS DESLIZANTES
+
+Los scripts de la Parte A usan SEGUNDOS = 10 y analizan solo la primera
+ventana; los otros ~923 s del registro se ignoran. Aquí se calculan los
+estadísticos de TODAS las ventanas de longitud W que avanzan de a H
+muestras (W = ventana, H = salto).
+
+Calcular cada ventana desde cero cuesta O(N·W). En cambio, cuando la
+ventana avanza basta con SUMAR las muestras que entran y RESTAR las que
+salen. Con sumas acumuladas (cumsum) eso se hace para todas las ventanas
+a la vez:
+
+    Sₚ(ventana j) = Cₚ[fin_j] - Cₚ[inicio_j]      con Cₚ = cumsum((x - c)ᵖ)
+
+para p = 1..4, y de S1..S4 salen los momentos centrales M2, M3, M4. El
+costo total es O(N). La señal se resta de un valor de referencia c (la
+media de la primera ventana) para que las potencias no pierdan precisión.
+
+La señal se lee por bloques, así que sirve sobre un np.memmap o una
+VistaCanal sin cargar el registro completo.
+
+Resultado: una tabla por columnas (diccionario de arrays de NumPy), una
+fila por ventana.
+=============================================================================
+"""
+
+import math
+
+import numpy as np
+
+from .momentos import TAM_BLOQUE
+
+
+COLUMNAS = ('inicio', 't', 'n', 'media', 'desv_estandar', 'varianza',
+            'coef_variacion', 'asimetria', 'curtosis')
+
+
+def _sumas_por_bloque(x, g, n_bloques, c, tam_bloque):
+    """
+    Sumas de (x - c)¹, (x - c)², (x - c)³ y (x - c)⁴ en bloques de g muestras.
+    Se lee x de a ~tam_bloque muestras (múltiplo de g).
+    """
+    S = np.empty((4, n_bloques))
+    paso = max(1, tam_bloque // g) * g
+    total = n_bloques * g
+    for i in range(0, total, paso):
+        d = np.asarray(x[i:min(i + paso, total)], dtype=np.float64) - c
+        d = d.reshape(-1, g)
+        d2 = d * d
+        j = i // g
+        k = j + d.shape[0]
+        S[0, j:k] = d.sum(axis=1)
+        S[1, j:k] = d2.sum(axis=1)
+        S[2, j:k] = (d2 * d).sum(axis=1)
+        S[3, j:k] = (d2 * d2).sum(axis=1)
+    return S
+
+
+def estadisticos_vectorizados(n, media, M2, M3, M4, ddof_forma=1):
+    """
+    Igual que momentos.estadisticos_desde_momentos(), pero cada argumento
+    puede ser un array (una posición por ventana).
+    """
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        varianza = np.where(n > 1, M2 / (n - 1), np.nan)
+        s = np.sqrt(varianza)
+        cv = np.where(media != 0, s / np.abs(media) * 100.0, np.inf)
+        var_forma = np.where(n > ddof_forma, M2 / (n - ddof_forma), np.nan)
+        var_forma = np.where(var_forma > 0, var_forma, np.nan)
+        g1 = (M3 / n) / var_forma ** 1.5
+        g2 = (M4 / n) / var_forma ** 2 - 3
+    return {
+        'n'             : n.astype(np.int64),
+        'media'         : media,
+        'desv_estandar' : s,
+        'varianza'      : varianza,
+        'coef_variacion': cv,
+        'asimetria'     : g1,
+        'curtosis'      : g2,
+    }
+
+
+def estadisticos_ventanas(x, fs, ventana_s=10, salto_s=1, inicio=0, fin=None,
+                          ddof_forma=1, tam_bloque=TAM_BLOQUE):
+    """
+    ESTADÍSTICOS POR VENTANA – media, desviación, varianza, CV, asimetría
+    y curtosis de cada ventana de 'ventana_s' segundos que avanza de a
+    'salto_s' segundos sobre x[inicio:fin].
+
+    x puede ser un array, un np.memmap o una VistaCanal.
+    ddof_forma = 1 → mismas fórmulas que sin_funciones.py
+    ddof_forma = 0 → misma convención que stats.skew()/stats.kurtosis()
+
+    Devuelve un diccionario de columnas (ver COLUMNAS); 'inicio' es la
+    primera muestra de cada ventana y 't' su tiempo en segundos.
+    """
+    W = int(round(ventana_s * fs))
+    H = int(round(salto_s * fs))
+    if W < 1 or H < 1:
+        raise ValueError("La ventana y el salto deben ser de al menos 1 muestra")
+    fin = len(x) if fin is None else min(fin, len(x))
+    N = fin - inicio
+    n_ventanas = (N - W) // H + 1 if N >= W else 0
+
+    if n_ventanas == 0:
+        vacia = np.empty(0)
+        tabla = estadisticos_vectorizados(vacia, vacia, vacia, vacia, vacia)
+        tabla['inicio'] = np.empty(0, dtype=np.int64)
+        tabla['t'] = vacia
+        return {c: tabla[c] for c in COLUMNAS}
+
+    # Bloques de g muestras: g divide a W y a H, así cada ventana es un
+    # número entero de bloques
+    g = math.gcd(W, H)
+    k = W // g                      # bloques por ventana
+    h = H // g                      # bloques por salto
+    n_bloques = ((n_ventanas - 1) * H + W) // g
+
+    vista = _Desplazada(x, inicio)
+    c = float(np.mean(vista[0:W]))
+    S = _sumas_por_bloque(vista, g, n_bloques, c, tam_bloque)
+
+    C = np.zeros((4, n_bloques + 1))
+    np.cumsum(S, axis=1, out=C[:, 1:])
+    # fin - inicio de cada ventana, con rebanadas (sin arrays de índices)
+    S1, S2, S3, S4 = (C[:, k::h][:, :n_ventanas]
+                      - C[:, 0::h][:, :n_ventanas])
+
+    # De sumas de potencias (alrededor de c) a momentos centrales
+    m = S1 / W                               # media de (x - c)
+    M2 = S2 - W * m * m
+    M3 = S3 - 3 * m * S2 + 2 * W * m ** 3
+    M4 = S4 - 4 * m * S3 + 6 * m * m * S2 - 3 * W * m ** 4
+    M2 = np.maximum(M2, 0.0)                 # evita -0.000…1 por redondeo
+
+    tabla = estadisticos_vectorizados(np.full(n_ventanas, W), m + c,
+                                      M2, M3, M4, ddof_forma)
+    tabla['inicio'] = inicio + np.arange(n_ventanas) * H
+    tabla['t'] = tabla['inicio'] / fs
+    return {col: tabla[col] for col in COLUMNAS}
+
+
+class _Desplazada:
+    """x[inicio + i] sin copiar (para recortar VistaCanal y memmap por bloques)."""
+
+    def __init__(self, x, inicio):
+        self.x = x
+        self.inicio = inicio
+
+    def __getitem__(self, rebanada):
+        return self.x[self.inicio + rebanada.start:self.inicio + rebanada.stop]
+
+
+def guardar_tabla(tabla, ruta):
+    """
+    Guarda una tabla por columnas.
+      .npz → binario comprimido de NumPy (np.load(ruta) devuelve las columnas)
+      otro → texto separado por tabulaciones, con encabezado '# '
+    """
+    if str(ruta).endswith('.npz'):
+        np.savez_compressed(ruta, **tabla)
+        return
+    columnas = list(tabla)
+    datos = np.column_stack([np.asarray(tabla[c], dtype=np.float64)
+                             for c in columnas])
+    np.savetxt(ruta, datos, fmt='%.6g', delimiter='\t',
+               header='\t'.join(columnas), comments='# ')
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+=============================================================================
+VARIABILIDAD DE LA FRECUENCIA CARDIACA (VFC / HRV)
+
+A partir de los latidos de senales.latidos se calculan, para el registro
+completo o para ventanas deslizantes (p. ej. 5 min cada 30 s):
+
+  dominio del tiempo
+    SDNN   = desviación estándar de los intervalos NN              [ms]
+    RMSSD  = √( promedio de (NNᵢ - NNᵢ₋₁)² )                      [ms]
+    pNN50  = % de diferencias sucesivas mayores a 50 ms            [%]
+
+  dominio de la frecuencia (serie NN remuestreada a 4 Hz, PSD de Welch)
+    LF     = potencia en 0.04–0.15 Hz                              [ms²]
+    HF     = potencia en 0.15–0.40 Hz                              [ms²]
+    LF/HF
+
+Todas las ventanas se calculan a la vez: las del tiempo con sumas
+acumuladas por latido (igual que senales.ventanas) y las de frecuencia
+con una sola PSD por lotes (senales.espectro, con el plan guardado).
+
+Para muchos registros (la base completa de 1121 sujetos):
+
+    python -m senales.vfc "autonomic-aging/*.hea" -o vfc.tsv --ventana 300 --paso 60
+
+Cada registro va a un proceso, como en senales.lote.
+=============================================================================
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .espectro import plan_welch, potencia_banda
+from .latidos import detectar_r
+from .lectura import RegistroWFDB, abrir_registros, buscar_registros
+from .lote import formato_celda
+
+
+COLUMNAS = ('t', 'n_latidos', 'rr_medio', 'fc_media', 'sdnn', 'rmssd',
+            'pnn50', 'lf', 'hf', 'lf_hf')
+
+BANDA_LF = (0.04, 0.15)
+BANDA_HF = (0.15, 0.40)
+
+
+def limpiar_rr(rr, minimo=0.3, maximo=2.0, cambio=0.2):
+    """
+    Máscara de intervalos NN válidos: entre 'minimo' y 'maximo' segundos
+    y sin saltar más de 'cambio' (20 %) respecto al intervalo anterior
+    (latidos ectópicos o R mal detectadas).
+    """
+    rr = np.asarray(rr, dtype=np.float64)
+    valido = np.isfinite(rr) & (rr >= minimo) & (rr <= maximo)
+    salto = np.zeros(rr.size, dtype=bool)
+    salto[1:] = np.abs(np.diff(rr)) > cambio * rr[:-1]
+    return valido & ~salto
+
+
+def _acumulada(v):
+    c = np.zeros(v.size + 1)
+    np.cumsum(v, out=c[1:])
+    return c
+
+
+def vfc_ventanas(t_latidos, ventana_s=300, paso_s=None, duracion_s=None,
+                 fs_interp=4.0, nperseg=256):
+    """
+    VFC POR VENTANAS a partir de los tiempos de las ondas R (en s).
+
+    ventana_s = None → una sola ventana con todo el registro
+    paso_s    = None → ventanas sin solapamiento (paso = ventana)
+    Si el registro es más corto que ventana_s (una captura de 10 s con la
+    ventana de 300 s), se usa una sola ventana con todo el registro.
+    Devuelve un diccionario de columnas (ver COLUMNAS); 't' es el inicio
+    de cada ventana.
+    """
+    t = np.asarray(t_latidos, dtype=np.float64)
+    duracion_s = (t[-1] if t.size else 0.0) if duracion_s is None else duracion_s
+    if ventana_s is None:
+        # una ventana que incluye el último latido
+        ventana_s, inicios = np.nextafter(duracion_s, np.inf), np.zeros(1)
+    else:
+        paso_s = ventana_s if paso_s is None else paso_s
+        inicios = np.arange(0.0, duracion_s - ventana_s + 1e-9, paso_s)
+        if inicios.size == 0:           # ninguna ventana completa
+            ventana_s, inicios = np.nextafter(duracion_s, np.inf), np.zeros(1)
+
+    # Intervalo de cada latido respecto al anterior (se asigna al latido)
+    rr = np.full(t.size, np.nan)
+    rr[1:] = np.diff(t)
+    nn = limpiar_rr(rr)
+    rr_ms = np.where(nn, rr * 1000.0, 0.0)
+    ref = rr_ms[nn].mean() if nn.any() else 0.0    # resta para precisión
+    c = np.where(nn, rr_ms - ref, 0.0)
+
+    par = np.zeros(t.size, dtype=bool)               # diferencia NNᵢ - NNᵢ₋₁
+    par[1:] = nn[1:] & nn[:-1]
+    d = np.zeros(t.size)
+    d[1:] = np.diff(rr_ms)
+    d = np.where(par, d, 0.0)
+
+    C_n, C_1, C_2 = _acumulada(nn), _acumulada(c), _acumulada(c * c)
+    C_p, C_d2, C_50 = _acumulada(par), _acumulada(d * d), \
+        _acumulada(par & (np.abs(d) > 50.0))
+
+    a = np.searchsorted(t, inicios, side='left')
+    b = np.searchsorted(t, inicios + ventana_s, side='left')
+    # el intervalo del primer latido de la ventana empieza fuera de ella,
+    # y la primera diferencia sucesiva válida es la del tercer latido
+    a1 = np.minimum(a + 1, b)
+    a2 = np.minimum(a + 2, b)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n = C_n[b] - C_n[a1]
+        s1 = C_1[b] - C_1[a1]
+        s2 = C_2[b] - C_2[a1]
+        media = s1 / n + ref
+        sdnn = np.sqrt(np.maximum(s2 - s1 * s1 / n, 0.0) / (n - 1))
+        n_d = C_p[b] - C_p[a2]
+        rmssd = np.sqrt((C_d2[b] - C_d2[a2]) / n_d)
+        pnn50 = (C_50[b] - C_50[a2]) / n_d * 100.0
+
+    lf, hf = _potencias_lf_hf(t, rr_ms, nn, inicios, ventana_s, fs_interp,
+                              nperseg)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tabla = {
+            't'        : inicios,
+            'n_latidos': (b - a).astype(np.int64),
+            'rr_medio' : media,
+            'fc_media' : 60000.0 / media,
+            'sdnn'     : sdnn,
+            'rmssd'    : rmssd,
+            'pnn50'    : pnn50,
+            'lf'       : lf,
+            'hf'       : hf,
+            'lf_hf'    : lf / hf,
+        }
+    return tabla
+
+
+def _potencias_lf_hf(t, rr_ms, nn, inicios, ventana_s, fs_interp, nperseg):
+    """
+    LF y HF de todas las ventanas: la serie NN se remuestrea una vez a
+    fs_interp Hz (interpolación lineal) y cada ventana es una fila de una
+    matriz (sin copiar) para una sola PSD por lotes.
+    """
+    lf = np.full(inicios.size, np.nan)
+    hf = np.full(inicios.size, np.nan)
+    if np.count_nonzero(nn) < 4 or inicios.size == 0:
+        return lf, hf
+    rejilla = np.arange(0.0, inicios[-1] + ventana_s, 1.0 / fs_interp)
+    serie = np.interp(rejilla, t[nn], rr_ms[nn])
+    M = int(round(ventana_s * fs_interp))
+    if M < 8 or serie.size < M:
+        return lf, hf
+    plan = plan_welch(M, fs_interp, min(nperseg, M))
+    filas = np.minimum(np.round(inicios * fs_interp).astype(np.int64),
+                       serie.size - M)
+    P = plan.psd(sliding_window_view(serie, M)[filas])
+    # fuera del primer/último latido la interpolación es constante: se
+    # acepta hasta un 10 % de la ventana sin latidos en los bordes
+    margen = 0.1 * ventana_s
+    cubierta = (inicios >= t[nn][0] - margen) & \
+        (inicios + ventana_s <= t[nn][-1] + margen)
+    lf[cubierta] = potencia_banda(plan.f, P, BANDA_LF)[cubierta]
+    hf[cubierta] = potencia_banda(plan.f, P, BANDA_HF)[cubierta]
+    return lf, hf
+
+
+def vfc(t_latidos, **opciones):
+    """VFC de toda la serie de latidos: diccionario de números."""
+    tabla = vfc_ventanas(t_latidos, ventana_s=None, **opciones)
+    return {c: tabla[c][0].item() for c in COLUMNAS}
+
+
+# =============================================================================
+# MUCHOS REGISTROS
+# =============================================================================
+
+COLUMNAS_LOTE = ('registro',) + COLUMNAS
+
+
+def vfc_registro(ruta, cabecera=None, canal='ECG', ventana_s=300, paso_s=None):
+    """
+    Detecta las R del canal y calcula la VFC por ventanas. Es la función
+    que corre en cada proceso; devuelve una lista de filas (dict).
+    """
+    registro = RegistroWFDB(ruta, cabecera)
+    lat = detectar_r(registro.canal(canal), registro.fs)
+    tabla = vfc_ventanas(lat['t'], ventana_s, paso_s,
+                         registro.n_muestras / registro.fs)
+    return [dict({'registro': ruta}, **{c: tabla[c][i].item() for c in COLUMNAS})
+            for i in range(len(tabla['t']))]
+
+
+def procesar_vfc(origen, ruta_salida, canal='ECG', ventana_s=300, paso_s=None,
+                 trabajadores=None, cache=True, mostrar=print):
+    """
+    VFC de todos los registros de 'origen' (carpeta, glob o lista) en
+    paralelo. Escribe una fila por registro y ventana en ruta_salida
+    (texto separado por tabulaciones) a medida que terminan.
+    """
+    registros = abrir_registros(origen, cache=cache)
+    mostrar(f"{len(registros)} registros")
+    with open(ruta_salida, 'w', encoding='utf-8') as f, \
+            ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        f.write('# ' + '\t'.join(COLUMNAS_LOTE) + '\n')
+        tareas = {pool.submit(vfc_registro, r.ruta, r.cabecera, canal,
+                              ventana_s, paso_s): r for r in registros}
+        for k, tarea in enumerate(as_completed(tareas), 1):
+            r = tareas[tarea]
+            try:
+                filas = tarea.result()
+            except Exception as e:      # un registro dañado no detiene el lote
+                mostrar(f"  ✗ {r.ruta}: {e}")
+                continue
+            f.write(''.join('\t'.join(formato_celda(fila[c]) for c in COLUMNAS_LOTE)
+                            + '\n' for fila in filas))
+            f.flush()
+            mostrar(f"  [{k}/{len(registros)}] {r.nombre}")
+    return len(registros)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        prog='python -m senales.vfc',
+        description='Variabilidad de la frecuencia cardiaca de muchos registros WFDB.')
+    p.add_argument('registros', nargs='+',
+                   help='registros, carpetas o patrones glob (p. ej. "datos/*.hea")')
+    p.add_argument('-o', '--salida', default='vfc.tsv')
+    p.add_argument('--canal', default='ECG')
+    p.add_argument('--ventana', type=float, default=300,
+                   help='ventana en segundos (0 = registro completo)')
+    p.add_argument('--paso', type=float, default=None,
+                   help='paso entre ventanas (por defecto, igual a la ventana)')
+    p.add_argument('-j', '--trabajadores', type=int, default=None)
+    p.add_argument('--sin-cache', action='store_true',
+                   help='no usar la caché de cabeceras')
+    args = p.parse_args(argv)
+
+    origen = [h for r in args.registros for h in buscar_registros(r)]
+    procesar_vfc(origen, args.salida, args.canal, args.ventana or None,
+                 args.paso, args.trabajadores, cache=not args.sin_cache)
+    print(f"Resultados: {os.path.abspath(args.salida)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
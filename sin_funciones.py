@@ -11,56 +11,15 @@
 # =============================================================================
 
 import numpy as np
-import matplotlib.pyplot as plt
-
-# =============================================================================
-# PASO 1 – LEER LA SEÑAL
-# =============================================================================
-# El archivo .dat tiene los dos canales (ECG y NIBP) mezclados y guardados
-# como números enteros de 16 bits. numpy los lee con fromfile().
-# reshape(-1, 2) los separa en 2 columnas: columna 0 = ECG, columna 1 = NIBP
-# astype(float64) los convierte a decimales para poder hacer las operaciones
-
-FS        = 1000    # frecuencia de muestreo: 1000 muestras por segundo
-N_TOTAL   = 933820  # total de muestras en el archivo
-
-# Parámetros de conversión (del archivo .hea):
-# valor_físico = (valor_digital - baseline) / gain
-GAIN_ECG  = 19288.4144;  BASE_ECG  = -22050   # resultado en mV
-GAIN_NIBP = 594.1943;    BASE_NIBP = -53203   # resultado en mmHg
-
-raw  = np.fromfile("0743.dat", dtype=np.int16).reshape(-1, 2).astype(np.float64)
-ecg_completo  = (raw[:, 0] - BASE_ECG)  / GAIN_ECG
-nibp_completo = (raw[:, 1] - BASE_NIBP) / GAIN_NIBP
-
-print(f"Señal completa cargada: {N_TOTAL} muestras = {N_TOTAL/FS:.0f} segundos")
 
+from senales.cache import CacheResultados, huella
+from senales.graficas import figura_en_cache, graficar_senal, guardar_figura
+from senales.lectura import abrir_registro
+from senales.histograma import histograma_por_bloques
+from senales.momentos import momentos_una_pasada
 
 # =============================================================================
-# PASO 2 – RECORTAR A 10 SEGUNDOS
-# =============================================================================
-# La señal tiene ~933 segundos, pero para graficar y analizar usamos solo
-# los primeros 10 segundos.
-#
-# 10 segundos × 1000 muestras/segundo = 10000 muestras
-#
-# En Python, ecg[:10000] significa: "dame desde la muestra 0 hasta la 9999"
-# Es como decirle a Excel: muéstrame solo las primeras 10000 filas
-
-SEGUNDOS  = 10               # ← aquí puedes cambiar cuántos segundos quieres
-N_VENTANA = SEGUNDOS * FS    # = 10000 muestras
-
-ecg  = ecg_completo[:N_VENTANA]    # recorte de 10 s del ECG
-nibp = nibp_completo[:N_VENTANA]   # recorte de 10 s del NIBP
-t    = np.arange(N_VENTANA) / FS   # vector de tiempo: 0, 0.001, 0.002 ... 9.999
-
-print(f"Ventana de análisis   : {N_VENTANA} muestras = {SEGUNDOS} segundos")
-print(f"ECG  →  min={ecg.min():.3f} mV    max={ecg.max():.3f} mV")
-print(f"NIBP →  min={nibp.min():.1f} mmHg  max={nibp.max():.1f} mmHg")
-
-
-# =============================================================================
-# PASO 3 – FUNCIONES ESTADÍSTICAS DESDE CERO
+# FUNCIONES ESTADÍSTICAS DESDE CERO (se usan en el PASO 3)
 # =============================================================================
 # Cada función recibe la señal como lista y calcula el estadístico
 # usando solo operaciones básicas: suma, resta, multiplicación, división
@@ -200,121 +159,220 @@ def histograma_manual(x, n_bins=60):
 
 
 # =============================================================================
-# PASO 4 – CALCULAR LOS ESTADÍSTICOS
+# Lo que sigue corre solo al ejecutar el script (F5 en Spyder o
+# 'python sin_funciones.py'); 'import sin_funciones' desde otro código no lee
+# datos ni grafica: solo trae media(), varianza(), ... histograma_manual().
 # =============================================================================
-# Convertimos los arrays de numpy a listas de Python para usar
-# las funciones de arriba (que trabajan con bucles for)
-
-ecg_lista  = ecg.tolist()
-nibp_lista = nibp.tolist()
-
-# ECG
-mu_ecg  = media(ecg_lista)
-s_ecg   = desv_estandar(ecg_lista)
-v_ecg   = varianza(ecg_lista)
-cv_ecg  = coef_variacion(ecg_lista)
-g1_ecg  = asimetria(ecg_lista)
-g2_ecg  = curtosis(ecg_lista)
-
-# NIBP
-mu_nibp  = media(nibp_lista)
-s_nibp   = desv_estandar(nibp_lista)
-v_nibp   = varianza(nibp_lista)
-cv_nibp  = coef_variacion(nibp_lista)
-g1_nibp  = asimetria(nibp_lista)
-g2_nibp  = curtosis(nibp_lista)
-
-# Imprimir resultados
-print("\n" + "="*58)
-print(f"  ESTADÍSTICOS – DESDE CERO  |  Ventana: {SEGUNDOS} s")
-print("="*58)
-
-print(f"\n  ECG (mV) — {N_VENTANA} muestras")
-print(f"    Media            : {mu_ecg:>12.6f} mV")
-print(f"    Desv. estándar   : {s_ecg:>12.6f} mV")
-print(f"    Varianza         : {v_ecg:>12.6f} mV²")
-print(f"    Coef. variación  : {cv_ecg:>12.4f} %")
-print(f"    Asimetría        : {g1_ecg:>12.6f}")
-print(f"    Curtosis         : {g2_ecg:>12.6f}")
-
-print(f"\n  NIBP (mmHg) — {N_VENTANA} muestras")
-print(f"    Media            : {mu_nibp:>12.4f} mmHg")
-print(f"    Desv. estándar   : {s_nibp:>12.4f} mmHg")
-print(f"    Varianza         : {v_nibp:>12.4f} mmHg²")
-print(f"    Coef. variación  : {cv_nibp:>12.4f} %")
-print(f"    Asimetría        : {g1_nibp:>12.6f}")
-print(f"    Curtosis         : {g2_nibp:>12.6f}")
-
-
-# =============================================================================
-# PASO 5 – GRÁFICAS
-# =============================================================================
-
-# ── Gráfica 1: señales en el tiempo ─────────────────────────────────────────
-fig1, (ax1, ax2) = plt.subplots(2, 1, figsize=(13, 6), sharex=True)
-fig1.suptitle(f"Señal 0743 – PhysioNet  |  Ventana de {SEGUNDOS} s  (Fs={FS} Hz)",
-              fontsize=13, fontweight='bold')
-
-ax1.plot(t, ecg, color='#C62828', lw=0.8, label='ECG')
-ax1.axhline(mu_ecg,          color='black',   ls='--', lw=1.4,
-            label=f'Media = {mu_ecg:.5f} mV')
-ax1.axhline(mu_ecg + s_ecg,  color='#2E7D32', ls=':',  lw=1.2,
-            label=f'μ+σ = {mu_ecg+s_ecg:.4f}')
-ax1.axhline(mu_ecg - s_ecg,  color='#2E7D32', ls=':',  lw=1.2,
-            label=f'μ-σ = {mu_ecg-s_ecg:.4f}')
-ax1.set_ylabel("ECG (mV)", fontsize=11)
-ax1.legend(fontsize=8, loc='upper right')
-ax1.grid(True, alpha=0.3)
-
-ax2.plot(t, nibp, color='#1565C0', lw=0.8, label='NIBP')
-ax2.axhline(mu_nibp,           color='black',   ls='--', lw=1.4,
-            label=f'Media = {mu_nibp:.2f} mmHg')
-ax2.axhline(mu_nibp + s_nibp,  color='#2E7D32', ls=':',  lw=1.2,
-            label=f'μ+σ = {mu_nibp+s_nibp:.2f}')
-ax2.axhline(mu_nibp - s_nibp,  color='#2E7D32', ls=':',  lw=1.2,
-            label=f'μ-σ = {mu_nibp-s_nibp:.2f}')
-ax2.set_xlabel("Tiempo (s)", fontsize=11)
-ax2.set_ylabel("NIBP (mmHg)", fontsize=11)
-ax2.legend(fontsize=8, loc='upper right')
-ax2.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig("grafica1_senales_cero.png", dpi=150, bbox_inches='tight')
-plt.show()
-
-# ── Gráfica 2: histogramas desde cero ───────────────────────────────────────
-c_ecg,  f_ecg  = histograma_manual(ecg_lista,  n_bins=60)
-c_nibp, f_nibp = histograma_manual(nibp_lista, n_bins=60)
-
-w_ecg  = c_ecg[1]  - c_ecg[0]
-w_nibp = c_nibp[1] - c_nibp[0]
-
-fig2, (ax3, ax4) = plt.subplots(1, 2, figsize=(13, 5))
-fig2.suptitle(f"Histogramas – Desde cero  |  Ventana {SEGUNDOS} s",
-              fontsize=13, fontweight='bold')
-
-ax3.bar(c_ecg, f_ecg, width=w_ecg*0.9, color='#EF5350', alpha=0.85)
-ax3.axvline(mu_ecg, color='black', lw=2, ls='--',
-            label=f'Media = {mu_ecg:.5f}')
-ax3.set_xlabel("Amplitud (mV)", fontsize=11)
-ax3.set_ylabel("Frecuencia relativa", fontsize=11)
-ax3.set_title(f"ECG  |  Asimetría={g1_ecg:.3f}  Curtosis={g2_ecg:.3f}",
-              fontsize=10)
-ax3.legend(fontsize=9)
-ax3.grid(True, alpha=0.3)
-
-ax4.bar(c_nibp, f_nibp, width=w_nibp*0.9, color='#42A5F5', alpha=0.85)
-ax4.axvline(mu_nibp, color='black', lw=2, ls='--',
-            label=f'Media = {mu_nibp:.2f}')
-ax4.set_xlabel("Amplitud (mmHg)", fontsize=11)
-ax4.set_ylabel("Frecuencia relativa", fontsize=11)
-ax4.set_title(f"NIBP  |  Asimetría={g1_nibp:.3f}  Curtosis={g2_nibp:.3f}",
-              fontsize=10)
-ax4.legend(fontsize=9)
-ax4.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig("grafica2_histogramas_cero.png", dpi=150, bbox_inches='tight')
-plt.show()
-
-print("\n✓ Listo. Revisa las gráficas en el panel de Spyder (o como archivos .png)")
\ No newline at end of file
+if __name__ == '__main__':
+
+    # ==========================================================================
+    # PASO 1 – LEER LA SEÑAL
+    # ==========================================================================
+    # El archivo .dat tiene los dos canales (ECG y NIBP) mezclados y guardados
+    # como números enteros de 16 bits. En vez de leerlo todo con np.fromfile(),
+    # abrir_registro() lo "mapea" en memoria (np.memmap): no se lee nada del
+    # disco hasta que pedimos un pedazo de la señal.
+    #
+    # La frecuencia de muestreo, el número de muestras y los parámetros de
+    # conversión se leen del archivo 0743.hea:
+    # valor_físico = (valor_digital - baseline) / gain
+    #   ECG  → resultado en mV
+    #   NIBP → resultado en mmHg
+
+    REGISTRO = "0743"   # ← nombre del registro (sin extensión) a analizar
+    registro = abrir_registro(REGISTRO)
+
+    FS        = registro.fs          # frecuencia de muestreo: 1000 muestras por segundo
+    N_TOTAL   = registro.n_muestras  # total de muestras en el archivo
+
+    # ecg_completo y nibp_completo se recortan igual que un array, pero solo
+    # convierten a unidades físicas las muestras que se recortan
+    ecg_completo  = registro.canal('ECG')
+    nibp_completo = registro.canal('NIBP')
+
+    print(f"Señal completa cargada: {N_TOTAL} muestras = {N_TOTAL/FS:.0f} segundos")
+
+
+    # ==========================================================================
+    # PASO 2 – RECORTAR A 10 SEGUNDOS
+    # ==========================================================================
+    # La señal tiene ~933 segundos, pero para graficar y analizar usamos solo
+    # los primeros 10 segundos.
+    #
+    # 10 segundos × 1000 muestras/segundo = 10000 muestras
+    #
+    # En Python, ecg[:10000] significa: "dame desde la muestra 0 hasta la 9999"
+    # Es como decirle a Excel: muéstrame solo las primeras 10000 filas
+
+    SEGUNDOS  = 10               # ← aquí puedes cambiar cuántos segundos quieres
+    N_VENTANA = SEGUNDOS * FS    # = 10000 muestras
+
+    # Gráficas: False → solo se guardan los .png, sin abrir ventanas (corridas
+    # largas o por lotes; plt.show() detiene el script hasta cerrar cada una)
+    MOSTRAR_GRAFICAS = True
+
+    # Caché de resultados (senales.cache): si el recorte, los parámetros y
+    # el código del script no cambiaron, los estadísticos y los .png se
+    # toman de la corrida anterior en vez de recalcularse (las gráficas que
+    # se van a mostrar en ventana se dibujan siempre). False → todo de nuevo
+    USAR_CACHE = True
+    cache = CacheResultados(activa=USAR_CACHE)
+
+    ecg  = ecg_completo[:N_VENTANA]    # recorte de 10 s del ECG
+    nibp = nibp_completo[:N_VENTANA]   # recorte de 10 s del NIBP
+    t    = np.arange(N_VENTANA) / FS   # vector de tiempo: 0, 0.001, 0.002 ... 9.999
+
+    print(f"Ventana de análisis   : {N_VENTANA} muestras = {SEGUNDOS} segundos")
+    print(f"ECG  →  min={ecg.min():.3f} mV    max={ecg.max():.3f} mV")
+    print(f"NIBP →  min={nibp.min():.1f} mmHg  max={nibp.max():.1f} mmHg")
+
+
+    # ==========================================================================
+    # PASO 3 – CALCULAR LOS ESTADÍSTICOS
+    # ==========================================================================
+    # Convertimos los arrays de numpy a listas de Python para usar
+    # funciones que trabajan con bucles for.
+    #
+    # Si llamáramos media(), desv_estandar(), varianza()... una por una, cada
+    # función volvería a recorrer la lista (y a calcular la media otra vez):
+    # ~15 pasadas por señal. momentos_una_pasada() hace lo mismo desde cero,
+    # con un solo bucle for que acumula n, μ, M2, M3 y M4 (Welford / Pébay).
+    # Da los mismos valores que las funciones de arriba.
+    #
+    # cache.calcular(llave, funcion, ...) llama a la función solo si no hay
+    # un resultado guardado con esa llave (muestras + código de la función)
+
+    ecg_lista  = ecg.tolist()
+    nibp_lista = nibp.tolist()
+
+    # ECG
+    est_ecg = cache.calcular(huella(ecg, momentos_una_pasada),
+                             momentos_una_pasada, ecg_lista)
+    mu_ecg  = est_ecg['media']
+    s_ecg   = est_ecg['desv_estandar']
+    v_ecg   = est_ecg['varianza']
+    cv_ecg  = est_ecg['coef_variacion']
+    g1_ecg  = est_ecg['asimetria']
+    g2_ecg  = est_ecg['curtosis']
+
+    # NIBP
+    est_nibp = cache.calcular(huella(nibp, momentos_una_pasada),
+                              momentos_una_pasada, nibp_lista)
+    mu_nibp  = est_nibp['media']
+    s_nibp   = est_nibp['desv_estandar']
+    v_nibp   = est_nibp['varianza']
+    cv_nibp  = est_nibp['coef_variacion']
+    g1_nibp  = est_nibp['asimetria']
+    g2_nibp  = est_nibp['curtosis']
+
+    # Imprimir resultados
+    print("\n" + "="*58)
+    print(f"  ESTADÍSTICOS – DESDE CERO  |  Ventana: {SEGUNDOS} s")
+    print("="*58)
+
+    print(f"\n  ECG (mV) — {N_VENTANA} muestras")
+    print(f"    Media            : {mu_ecg:>12.6f} mV")
+    print(f"    Desv. estándar   : {s_ecg:>12.6f} mV")
+    print(f"    Varianza         : {v_ecg:>12.6f} mV²")
+    print(f"    Coef. variación  : {cv_ecg:>12.4f} %")
+    print(f"    Asimetría        : {g1_ecg:>12.6f}")
+    print(f"    Curtosis         : {g2_ecg:>12.6f}")
+
+    print(f"\n  NIBP (mmHg) — {N_VENTANA} muestras")
+    print(f"    Media            : {mu_nibp:>12.4f} mmHg")
+    print(f"    Desv. estándar   : {s_nibp:>12.4f} mmHg")
+    print(f"    Varianza         : {v_nibp:>12.4f} mmHg²")
+    print(f"    Coef. variación  : {cv_nibp:>12.4f} %")
+    print(f"    Asimetría        : {g1_nibp:>12.6f}")
+    print(f"    Curtosis         : {g2_nibp:>12.6f}")
+
+
+    # ==========================================================================
+    # PASO 4 – GRÁFICAS
+    # ==========================================================================
+    import matplotlib.pyplot as plt   # solo se carga para graficar
+
+    # Llave de cada gráfica: muestras de la ventana + parámetros + este script
+    # (si se edita el código de las gráficas, se vuelven a dibujar)
+    def llave_grafica(numero):
+        return huella(ecg, nibp, __file__, graficar_senal, grafica=numero,
+                      registro=registro.nombre, fs=FS, segundos=SEGUNDOS)
+
+
+    # ── Gráfica 1: señales en el tiempo ───────────────────────────────────────
+    llave1 = llave_grafica(1)
+    if not figura_en_cache(cache, llave1, "grafica1_senales_cero.png", MOSTRAR_GRAFICAS):
+        fig1, (ax1, ax2) = plt.subplots(2, 1, figsize=(13, 6), sharex=True)
+        fig1.suptitle(f"Señal {registro.nombre} – PhysioNet  |  Ventana de {SEGUNDOS} s  (Fs={FS} Hz)",
+                      fontsize=13, fontweight='bold')
+
+        # graficar_senal() = ax.plot(t, ecg) pero con 2 puntos (mín y máx) por
+        # píxel: con SEGUNDOS grandes (registro completo) no dibuja cada muestra
+        graficar_senal(ax1, ecg, FS, color='#C62828', lw=0.8, label='ECG')
+        ax1.axhline(mu_ecg,          color='black',   ls='--', lw=1.4,
+                    label=f'Media = {mu_ecg:.5f} mV')
+        ax1.axhline(mu_ecg + s_ecg,  color='#2E7D32', ls=':',  lw=1.2,
+                    label=f'μ+σ = {mu_ecg+s_ecg:.4f}')
+        ax1.axhline(mu_ecg - s_ecg,  color='#2E7D32', ls=':',  lw=1.2,
+                    label=f'μ-σ = {mu_ecg-s_ecg:.4f}')
+        ax1.set_ylabel("ECG (mV)", fontsize=11)
+        ax1.legend(fontsize=8, loc='upper right')
+        ax1.grid(True, alpha=0.3)
+
+        graficar_senal(ax2, nibp, FS, color='#1565C0', lw=0.8, label='NIBP')
+        ax2.axhline(mu_nibp,           color='black',   ls='--', lw=1.4,
+                    label=f'Media = {mu_nibp:.2f} mmHg')
+        ax2.axhline(mu_nibp + s_nibp,  color='#2E7D32', ls=':',  lw=1.2,
+                    label=f'μ+σ = {mu_nibp+s_nibp:.2f}')
+        ax2.axhline(mu_nibp - s_nibp,  color='#2E7D32', ls=':',  lw=1.2,
+                    label=f'μ-σ = {mu_nibp-s_nibp:.2f}')
+        ax2.set_xlabel("Tiempo (s)", fontsize=11)
+        ax2.set_ylabel("NIBP (mmHg)", fontsize=11)
+        ax2.legend(fontsize=8, loc='upper right')
+        ax2.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+        guardar_figura(fig1, "grafica1_senales_cero.png", mostrar=MOSTRAR_GRAFICAS,
+                       cache=cache, llave=llave1)
+
+    # ── Gráfica 2: histogramas desde cero ─────────────────────────────────────
+    llave2 = llave_grafica(2)
+    if not figura_en_cache(cache, llave2, "grafica2_histogramas_cero.png", MOSTRAR_GRAFICAS):
+        # histograma_por_bloques() usa las mismas reglas que histograma_manual()
+        # (mismos bins, mismo manejo del máximo en el borde) y da las mismas
+        # frecuencias relativas, pero cuenta con NumPy en vez de un bucle for
+        c_ecg,  f_ecg  = histograma_por_bloques(ecg,  n_bins=60).resultado()
+        c_nibp, f_nibp = histograma_por_bloques(nibp, n_bins=60).resultado()
+
+        w_ecg  = c_ecg[1]  - c_ecg[0]
+        w_nibp = c_nibp[1] - c_nibp[0]
+
+        fig2, (ax3, ax4) = plt.subplots(1, 2, figsize=(13, 5))
+        fig2.suptitle(f"Histogramas – Desde cero  |  Ventana {SEGUNDOS} s",
+                      fontsize=13, fontweight='bold')
+
+        ax3.bar(c_ecg, f_ecg, width=w_ecg*0.9, color='#EF5350', alpha=0.85)
+        ax3.axvline(mu_ecg, color='black', lw=2, ls='--',
+                    label=f'Media = {mu_ecg:.5f}')
+        ax3.set_xlabel("Amplitud (mV)", fontsize=11)
+        ax3.set_ylabel("Frecuencia relativa", fontsize=11)
+        ax3.set_title(f"ECG  |  Asimetría={g1_ecg:.3f}  Curtosis={g2_ecg:.3f}",
+                      fontsize=10)
+        ax3.legend(fontsize=9)
+        ax3.grid(True, alpha=0.3)
+
+        ax4.bar(c_nibp, f_nibp, width=w_nibp*0.9, color='#42A5F5', alpha=0.85)
+        ax4.axvline(mu_nibp, color='black', lw=2, ls='--',
+                    label=f'Media = {mu_nibp:.2f}')
+        ax4.set_xlabel("Amplitud (mmHg)", fontsize=11)
+        ax4.set_ylabel("Frecuencia relativa", fontsize=11)
+        ax4.set_title(f"NIBP  |  Asimetría={g1_nibp:.3f}  Curtosis={g2_nibp:.3f}",
+                      fontsize=10)
+        ax4.legend(fontsize=9)
+        ax4.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+        guardar_figura(fig2, "grafica2_histogramas_cero.png", mostrar=MOSTRAR_GRAFICAS,
+                       cache=cache, llave=llave2)
+
+    print("\n✓ Listo. Revisa las gráficas en el panel de Spyder (o como archivos .png)")
\ No newline at end of file
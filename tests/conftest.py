@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Datos compartidos por las pruebas: el registro 0743 de la Parte A y las
+funciones "desde cero" de sin_funciones.py (referencia de la guía).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from senales.lectura import abrir_registro
+from senales.rendimiento import SCRIPT_SIN_FUNCIONES, funciones_de_script
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REGISTRO = os.path.join(RAIZ, '0743')
+FS = 1000
+
+
+@pytest.fixture(scope='session')
+def registro():
+    return abrir_registro(REGISTRO)
+
+
+@pytest.fixture(scope='session')
+def ecg(registro):
+    """Primeros 10 s del ECG (mV), como la ventana de la Parte A."""
+    return np.asarray(registro.canal('ECG')[:10 * FS])
+
+
+@pytest.fixture(scope='session')
+def nibp(registro):
+    return np.asarray(registro.canal('NIBP')[:10 * FS])
+
+
+@pytest.fixture(scope='session')
+def sf():
+    """media, varianza, asimetria, curtosis, histograma_manual, ... de sin_funciones.py"""
+    return funciones_de_script(SCRIPT_SIN_FUNCIONES)
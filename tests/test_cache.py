@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Llaves de la caché por contenido y desalojo LRU."""
+
+import os
+
+import numpy as np
+
+from senales.cache import CacheResultados, huella
+
+
+def _funcion(x):
+    return float(np.sum(x))
+
+
+def test_huella_depende_solo_del_contenido(registro, tmp_path):
+    x = np.arange(1000, dtype=np.int16)
+    ruta = tmp_path / 'x.npy'
+    np.save(ruta, x)
+    copia = np.load(ruta, mmap_mode='r')
+    assert huella(x, a=1, b=2) == huella(copia, b=2, a=1)
+    assert huella(x) != huella(x[:-1])
+    assert huella(x) != huella(x.astype(np.int32))
+    assert huella(x, a=1) != huella(x, a=2)
+    # una VistaCanal usa los enteros del .dat, no depende del objeto
+    assert huella(registro.canal('ECG')) == huella(registro.canal(0))
+
+
+def test_huella_de_listas():
+    a, b = np.arange(3), np.arange(5)
+    assert huella([a, b]) != huella([b, a])
+    assert huella([1, 2.5]) == huella((1, 2.5))
+    assert huella({'x': [a, b], 'y': 1}) == huella({'y': 1, 'x': [a, b]})
+
+
+def test_huella_estable_entre_versiones_del_codigo():
+    # la llave es texto: no cambia de una corrida a otra
+    assert huella(np.arange(4, dtype='<i2'), _funcion, n=3) == \
+        huella(np.arange(4, dtype='<i2'), _funcion, n=3)
+    assert len(huella()) == 40
+
+
+def test_calcular_guarda_y_reutiliza(tmp_path):
+    cache = CacheResultados(str(tmp_path))
+    llamadas = []
+
+    def costosa(x):
+        llamadas.append(x)
+        return {'suma': x * 2}
+
+    llave = huella(21, costosa)
+    assert cache.calcular(llave, costosa, 21) == {'suma': 42}
+    assert cache.calcular(llave, costosa, 21) == {'suma': 42}
+    assert llamadas == [21]
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+
+
+def test_inactiva_no_guarda(tmp_path):
+    cache = CacheResultados(str(tmp_path / 'c'), activa=False)
+    cache.guardar('ab' * 20, 1)
+    assert cache.leer('ab' * 20) is None
+    assert not os.path.exists(cache.directorio)
+
+
+def test_recorta_los_menos_usados(tmp_path):
+    cache = CacheResultados(str(tmp_path), limite_mb=14 / 1024)   # caben 4 de ~3 kB
+    llaves = [huella(i) for i in range(4)]
+    for i, llave in enumerate(llaves):
+        cache.guardar(llave, bytes(3000))
+        os.utime(cache.ruta(llave), (1000 + i, 1000 + i))
+    cache.leer(llaves[0])                    # el más viejo pasa a reciente
+    cache.guardar(huella('nuevo'), bytes(3000))
+    presentes = [os.path.exists(cache.ruta(k)) for k in llaves]
+    assert presentes == [True, False, True, True]
+    assert cache.tamano() <= cache.limite
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Filtros por bloques: estado zi de los IIR y ventanas de mediana/Hampel."""
+
+import numpy as np
+import pytest
+from scipy.signal import sosfilt, sosfilt_zi
+
+from senales.filtros import (BancoFiltros, FiltroHampel, FiltroMediana,
+                             filtrar_por_bloques, pasa_altas, pasa_bajas)
+
+
+@pytest.fixture
+def ruidosa(ecg):
+    rng = np.random.default_rng(0)
+    x = ecg + rng.normal(0, 0.05, ecg.size)
+    x[rng.integers(0, ecg.size, 50)] += 3.0
+    return x
+
+
+@pytest.mark.parametrize('tam_bloque', [1, 64, 1000, 9999])
+def test_iir_por_bloques_igual_a_sosfilt(ruidosa, tam_bloque):
+    filtro = pasa_altas(1000)
+    zi = sosfilt_zi(filtro.sos) * ruidosa[0]
+    ref, _ = sosfilt(filtro.sos, ruidosa, zi=zi)
+    y = filtrar_por_bloques(ruidosa, BancoFiltros([filtro]), tam_bloque=tam_bloque)
+    np.testing.assert_allclose(y, ref, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('filtro', [FiltroMediana(5), FiltroHampel(11)])
+@pytest.mark.parametrize('tam_bloque', [1, 3, 500])
+def test_ventana_por_bloques_igual_a_filtrar(ruidosa, filtro, tam_bloque):
+    ref = filtro.filtrar(ruidosa)
+    y = filtrar_por_bloques(ruidosa, BancoFiltros([filtro]), tam_bloque=tam_bloque)
+    np.testing.assert_array_equal(y, ref)
+
+
+def test_mediana_como_referencia():
+    x = np.array([1.0, 9.0, 2.0, 3.0, 8.0, 4.0])
+    # bordes: se repiten la primera y la última muestra
+    assert FiltroMediana(3).filtrar(x).tolist() == [1, 2, 3, 3, 4, 4]
+
+
+def test_banco_multicanal_igual_que_por_canal(ruidosa):
+    datos = np.vstack([ruidosa, ruidosa[::-1]])
+    banco = BancoFiltros([FiltroHampel(11), pasa_bajas(1000), FiltroMediana(5)])
+    y = np.concatenate([banco.procesar(datos[:, i:i + 250])
+                        for i in range(0, datos.shape[1], 250)]
+                       + [banco.terminar()], axis=-1)
+    assert y.shape == datos.shape
+    for k in range(2):
+        np.testing.assert_allclose(y[k], filtrar_por_bloques(datos[k], banco,
+                                                             tam_bloque=250))
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Lectura con memmap y escritura WFDB, contra la librería wfdb."""
+
+import numpy as np
+import pytest
+
+wfdb = pytest.importorskip('wfdb')
+
+from senales.formato import EscritorWFDB, guardar_wfdb
+from senales.lectura import abrir_registro
+
+from .conftest import REGISTRO
+
+
+def test_lectura_igual_a_rdrecord(registro):
+    ref = wfdb.rdrecord(REGISTRO, sampto=50_000)
+    for k in range(registro.n_senales):
+        np.testing.assert_allclose(registro.canal(k)[:50_000],
+                                   ref.p_signal[:, k], rtol=1e-12, atol=1e-12)
+    assert registro.fs == ref.fs
+    assert registro.n_muestras == wfdb.rdheader(REGISTRO).sig_len
+
+
+def test_ida_y_vuelta(tmp_path):
+    rng = np.random.default_rng(0)
+    datos = np.vstack([np.sin(np.arange(3000) / 50), rng.uniform(-4, 4, 3000)])
+    ruta = guardar_wfdb(str(tmp_path / 'captura'), datos, 1000, v_min=-5,
+                        v_max=5, nombres=['ECG', 'GEN'])
+    propio = abrir_registro(ruta)
+    ref = wfdb.rdrecord(ruta)                # también valida los checksums
+    assert ref.sig_name == ['ECG', 'GEN']
+    paso = 10 / 65535                        # un nivel del ADC de 16 bits
+    for k in range(2):
+        np.testing.assert_allclose(propio.canal(k)[:], ref.p_signal[:, k],
+                                   atol=1e-9)
+        np.testing.assert_allclose(propio.canal(k)[:], datos[k], atol=paso)
+
+
+def test_escritor_por_bloques_igual_a_una_vez(tmp_path):
+    datos = np.random.default_rng(1).uniform(-5, 5, (2, 2500))
+    w = EscritorWFDB(str(tmp_path / 'bloques'), 1000, n_canales=2)
+    for i in range(0, 2500, 300):
+        w.escribir(datos[:, i:i + 300])
+    w.cerrar()
+    guardar_wfdb(str(tmp_path / 'junto'), datos, 1000)
+    assert (tmp_path / 'bloques.dat').read_bytes() == \
+        (tmp_path / 'junto.dat').read_bytes()
+    assert wfdb.rdrecord(str(tmp_path / 'bloques')).sig_len == 2500
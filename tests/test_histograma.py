@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Histograma por bloques contra histograma_manual() y np.histogram."""
+
+import numpy as np
+import pytest
+
+from senales.histograma import Histograma, histograma_por_bloques
+
+
+def test_igual_a_histograma_manual(ecg, nibp, sf):
+    for x in (ecg, nibp):
+        centros, frec = sf['histograma_manual'](x.tolist(), 60)
+        c, f = histograma_por_bloques(x, n_bins=60, tam_bloque=999).resultado()
+        np.testing.assert_allclose(c, centros, rtol=1e-12)
+        np.testing.assert_array_equal(f, frec)
+
+
+def test_maximo_en_el_ultimo_bin():
+    # regla idx == n_bins → n_bins - 1 de histograma_manual()
+    h = Histograma(4, 0.0, 1.0).agregar([0.0, 0.25, 1.0, 1.0])
+    assert h.conteos.tolist() == [1, 1, 0, 2]
+    assert (h.debajo, h.encima) == (0, 0)
+
+
+def test_fuera_de_rango():
+    h = Histograma(2, 0.0, 1.0).agregar([-1.0, 0.5, 2.0, 3.0])
+    assert (h.debajo, h.encima, h.n) == (1, 2, 4)
+    assert h.resultado()[1].sum() == pytest.approx(0.25)
+
+
+def test_conteos_como_np_histogram(ecg):
+    h = histograma_por_bloques(ecg, n_bins=60, tam_bloque=1234)
+    conteos, bordes = np.histogram(ecg, bins=60)
+    np.testing.assert_allclose(h.bordes, bordes, rtol=1e-12)
+    # np.histogram usa los bordes (no int((x - x_min) / ancho)): pueden
+    # diferir en alguna muestra que cae justo en un borde
+    assert np.abs(h.conteos - conteos).sum() <= 2
+    assert h.conteos.sum() == ecg.size
+
+
+def test_combinar_igual_a_todo_junto(ecg):
+    a = Histograma(60, -1, 3).agregar(ecg[:4000])
+    b = Histograma(60, -1, 3).agregar(ecg[4000:])
+    todo = Histograma(60, -1, 3).agregar(ecg)
+    c = a.combinar(b)
+    np.testing.assert_array_equal(c.conteos, todo.conteos)
+    assert (c.debajo, c.encima) == (todo.debajo, todo.encima)
+    with pytest.raises(ValueError):
+        a.combinar(Histograma(30, -1, 3))
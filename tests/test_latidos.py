@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Detector de ondas R: el resultado no depende del tamaño de bloque."""
+
+import numpy as np
+import pytest
+
+from senales.latidos import detectar_r
+
+
+@pytest.fixture(scope='module')
+def referencia(registro):
+    return detectar_r(registro.canal('ECG'), 1000, 0, 120_000, tam_bloque=1 << 16)
+
+
+@pytest.mark.parametrize('tam_bloque', [100, 1000, 7777])
+def test_no_depende_del_bloque(registro, referencia, tam_bloque):
+    r = detectar_r(registro.canal('ECG'), 1000, 0, 120_000, tam_bloque=tam_bloque)
+    np.testing.assert_array_equal(r['muestra'], referencia['muestra'])
+    np.testing.assert_allclose(r['rr'], referencia['rr'], equal_nan=True)
+
+
+def test_frecuencia_cardiaca_plausible(referencia):
+    fc = referencia['fc'][np.isfinite(referencia['fc'])]
+    # 2 minutos en reposo: entre 40 y 150 latidos por minuto
+    assert 80 <= len(referencia['muestra']) <= 300
+    assert 40 < np.median(fc) < 150
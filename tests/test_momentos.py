@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Momentos en una pasada, por bloques y combinados (Welford / Pébay)."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from senales.momentos import (Momentos, MomentosCanales, combinar_momentos,
+                              momentos_numpy, momentos_por_bloques,
+                              momentos_una_pasada)
+
+ESTADISTICOS = ('media', 'varianza', 'asimetria', 'curtosis')
+
+
+def _cerca(a, b, rtol=1e-9):
+    for c in ESTADISTICOS:
+        assert a[c] == pytest.approx(b[c], rel=rtol), c
+
+
+def test_una_pasada_igual_a_sin_funciones(ecg, nibp, sf):
+    for x in (ecg, nibp):
+        lista = x.tolist()
+        _cerca(momentos_una_pasada(lista),
+               {c: sf[c](lista) for c in ESTADISTICOS})
+
+
+def test_ddof_forma_0_igual_a_scipy(ecg):
+    e = momentos_por_bloques(ecg).estadisticos(ddof_forma=0)
+    assert e['asimetria'] == pytest.approx(stats.skew(ecg), rel=1e-9)
+    assert e['curtosis'] == pytest.approx(stats.kurtosis(ecg), rel=1e-9)
+    assert e['varianza'] == pytest.approx(np.var(ecg, ddof=1), rel=1e-9)
+
+
+def test_numpy_mismas_llaves_y_valores(ecg):
+    a, b = momentos_numpy(ecg), momentos_una_pasada(ecg.tolist())
+    assert a.keys() == b.keys()
+    _cerca(a, b)
+    assert (a['minimo'], a['maximo']) == (b['minimo'], b['maximo'])
+
+
+def test_combinar_es_asociativa():
+    x = np.random.default_rng(0).lognormal(size=3000)
+    a, b, c = (Momentos.desde_array(p) for p in (x[:700], x[700:2100], x[2100:]))
+    izquierda = a.combinar(b).combinar(c)
+    derecha = a.combinar(b.combinar(c))
+    total = Momentos.desde_array(x)
+    for m in (izquierda, derecha):
+        assert m.n == total.n
+        for campo in ('media', 'M2', 'M3', 'M4'):
+            assert getattr(m, campo) == pytest.approx(getattr(total, campo),
+                                                      rel=1e-10)
+        assert (m.minimo, m.maximo) == (total.minimo, total.maximo)
+
+
+def test_combinar_con_vacio():
+    m = Momentos.desde_array(np.arange(10.0))
+    for r in (Momentos().combinar(m), m.combinar(Momentos())):
+        assert r.a_dict() == pytest.approx(m.a_dict())
+
+
+@pytest.mark.parametrize('tam_bloque', [1, 7, 1000, 4096, 1 << 16])
+def test_por_bloques_no_depende_del_bloque(registro, tam_bloque):
+    vista = registro.canal('ECG')
+    fin = 20_000
+    ref = momentos_numpy(np.asarray(vista[:fin]))
+    e = momentos_por_bloques(vista, 0, fin, tam_bloque).estadisticos()
+    _cerca(e, ref, rtol=1e-8)
+
+
+def test_registro_completo_por_partes(registro):
+    vista = registro.canal('NIBP')
+    n = len(vista)
+    partes = [momentos_por_bloques(vista, a, min(a + 100_003, n))
+              for a in range(0, n, 100_003)]
+    _cerca(combinar_momentos(partes).estadisticos(),
+           momentos_numpy(np.asarray(vista[:])), rtol=1e-8)
+
+
+def test_canales_igual_que_uno_por_uno(ecg, nibp):
+    datos = np.vstack([ecg, nibp])
+    m = MomentosCanales(2)
+    for i in range(0, datos.shape[1], 333):
+        m.agregar_bloque(datos[:, i:i + 333])
+    for k, e in enumerate(m.estadisticos()):
+        _cerca(e, momentos_numpy(datos[k]), rtol=1e-8)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Estadísticos por ventana deslizante con sumas acumuladas."""
+
+import numpy as np
+import pytest
+
+from senales.momentos import momentos_numpy
+from senales.ventanas import estadisticos_ventanas
+
+
+@pytest.mark.parametrize('ventana_s, salto_s', [(2, 1), (3, 0.7), (1, 1)])
+def test_cada_ventana_igual_a_calculo_directo(registro, ventana_s, salto_s):
+    vista = registro.canal('ECG')
+    tabla = estadisticos_ventanas(vista, 1000, ventana_s, salto_s, 0, 15_000)
+    W = int(ventana_s * 1000)
+    assert len(tabla['inicio']) == (15_000 - W) // int(salto_s * 1000) + 1
+    x = np.asarray(vista[:15_000])
+    for i, a in enumerate(tabla['inicio']):
+        ref = momentos_numpy(x[a:a + W])
+        for c in ('media', 'varianza', 'asimetria', 'curtosis'):
+            assert tabla[c][i] == pytest.approx(ref[c], rel=1e-7, abs=1e-12), (c, a)
+
+
+def test_no_depende_del_bloque(registro):
+    vista = registro.canal('NIBP')
+    a = estadisticos_ventanas(vista, 1000, 10, 1, 0, 60_000, tam_bloque=1 << 16)
+    b = estadisticos_ventanas(vista, 1000, 10, 1, 0, 60_000, tam_bloque=1000)
+    for c in a:
+        np.testing.assert_allclose(a[c], b[c], rtol=1e-10)
+
+
+def test_sin_ventanas_completas(ecg):
+    tabla = estadisticos_ventanas(ecg[:500], 1000, 1, 1)
+    assert all(len(v) == 0 for v in tabla.values())